@@ -0,0 +1,110 @@
+import os
+import csv
+import glob
+import time
+import argparse
+import tempfile
+import tracemalloc
+from typing import Callable
+
+from famapy.metamodels.fm_metamodel.transformations.featureide_reader import FeatureIDEReader
+from famapy.metamodels.pysat_metamodel.transformations.fm_to_pysat import FmToPysat
+
+from montecarlo_framework.models.feature_model import FMCache, StreamingFeatureIDEReader
+from montecarlo_framework.utils import utils
+from montecarlo_framework.utils.algorithm_logger import RESULTS
+
+
+PRECISION = 4
+
+MODELS = sorted(glob.glob(os.path.join('models', '*.xml')), key=os.path.getsize)
+
+MODEL_STR = 'Model'
+SIZE_STR = 'Size (KB)'
+LOADER_STR = 'Loader'
+FEATURES_STR = 'Features'
+CLAUSES_STR = 'Clauses'
+TIME_STR = 'Time (s)'
+MEMORY_STR = 'Peak memory (MB)'
+HEADER = [MODEL_STR, SIZE_STR, LOADER_STR, FEATURES_STR, CLAUSES_STR, TIME_STR, MEMORY_STR]
+
+
+def load_dom(input_model: str, cache: FMCache) -> tuple[int, int]:
+    """FeatureIDEReader (full DOM) and FmToPysat."""
+    feature_model = FeatureIDEReader(input_model).transform()
+    sat_model = FmToPysat(feature_model).transform()
+    return len(feature_model.get_features()), len(sat_model.get_all_clauses())
+
+
+def load_streaming(input_model: str, cache: FMCache) -> tuple[int, int]:
+    """StreamingFeatureIDEReader (feature tree and SAT model in a single pass)."""
+    feature_model, sat_model = StreamingFeatureIDEReader(input_model).transform()
+    return len(feature_model.get_features()), len(sat_model.get_all_clauses())
+
+
+def load_cached(input_model: str, cache: FMCache) -> tuple[int, int]:
+    """Warm load of the compiled model from the cache."""
+    fm = cache.load(input_model)
+    return len(fm.features), len(fm.sat_model.get_all_clauses())
+
+
+LOADERS = {'FeatureIDEReader': load_dom,
+           'Streaming': load_streaming,
+           'Cache': load_cached}
+
+
+def benchmark(runs: int, input_model: str, loader: Callable[[str, FMCache], tuple[int, int]], cache: FMCache) -> dict[str, float]:
+    """Load the model with the loader and return the median of its load time and its peak memory.
+
+    The peak memory is measured in an additional load, because tracing the allocations slows down the loads.
+    """
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        nof_features, nof_clauses = loader(input_model, cache)
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    loader(input_model, cache)
+    peak_memory = tracemalloc.get_traced_memory()[1] / 1e6
+    tracemalloc.stop()
+    return {FEATURES_STR: nof_features,
+            CLAUSES_STR: nof_clauses,
+            TIME_STR: utils.get_summary_stastistics(times, PRECISION)[utils.MEDIAN],
+            MEMORY_STR: round(peak_memory, PRECISION)}
+
+
+def main(runs: int, models: list[str], loaders: list[str]):
+    rows = []
+    print(', '.join(HEADER))
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = FMCache(cache_dir)
+        for model in models:
+            input_model = model if model.endswith('.xml') else os.path.join('models', model + '.xml')
+            cache.load(input_model)  # warm up the cache
+            for loader_name in loaders:
+                row = {MODEL_STR: os.path.splitext(os.path.basename(input_model))[0],
+                       SIZE_STR: round(os.path.getsize(input_model) / 1e3, 1),
+                       LOADER_STR: loader_name}
+                row.update(benchmark(runs, input_model, LOADERS[loader_name], cache))
+                rows.append(row)
+                print(', '.join(str(row[h]) for h in HEADER))
+
+    filepath = os.path.join(RESULTS, 'model_loading_benchmark.csv')
+    with open(filepath, 'w', encoding='utf8', newline='') as file:
+        writer = csv.writer(file, delimiter=',')
+        writer.writerow(HEADER)
+        for row in rows:
+            writer.writerow([row[h] for h in HEADER])
+    print(f'Results saved in "{filepath}".')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark: load time and peak memory of the feature models (full DOM reader vs streaming reader vs compiled-model cache).')
+    parser.add_argument('-r', '--runs', dest='runs', type=int, required=False, default=3, help='Number of loads per model and loader (default 3).')
+    parser.add_argument('-fm', '--featuremodels', dest='feature_models', type=str, nargs='*', required=False, default=MODELS, help='Feature models in the "models" folder (or paths to FeatureIDE files) (default: all the models in the "models" folder).')
+    parser.add_argument('-l', '--loaders', dest='loaders', type=str, nargs='*', required=False, default=list(LOADERS), choices=list(LOADERS), help=f'Loaders to be compared (default: all of them).')
+    args = parser.parse_args()
+
+    main(runs=args.runs,
+         models=args.feature_models,
+         loaders=args.loaders)
@@ -0,0 +1,122 @@
+import os
+import csv
+import sys
+import random
+import argparse
+import tracemalloc
+
+from montecarlo_framework.models import Node
+from montecarlo_framework.models.feature_model import FM, FMCache, FMConfiguration
+from montecarlo_framework.problems.configuration_based_analyses import ValidConfigurationState
+from montecarlo_framework.utils.algorithm_logger import RESULTS
+
+
+PRECISION = 1
+
+MODELS = ['pizzas', 'busybox-1.18.0', 'linux-2.6.33.3']
+
+MODEL_STR = 'Model'
+FEATURES_STR = 'Features'
+NODES_STR = 'Nodes'
+BYTES_STR = 'Bytes/node'
+NODE_STR = 'Node (B)'
+STATE_STR = 'State (B)'
+CONFIGURATION_STR = 'Configuration (B)'
+ACTION_STR = 'Action (B)'
+HEADER = [MODEL_STR, FEATURES_STR, NODES_STR, BYTES_STR, NODE_STR, STATE_STR, CONFIGURATION_STR, ACTION_STR]
+
+
+def random_tree(fm: FM, nof_nodes: int, max_depth: int) -> list[tuple[int, int, int]]:
+    """Random search tree given as a list of (position of the parent node, bitmask, index of the selected feature).
+
+    The tree grows by random walks from the root (of random depth) that select features whose parent
+    is selected (top-down). The walks are not checked with the solver, because only the memory of the nodes is measured.
+    """
+    index = fm.index
+    tree = [(-1, 0, -1)]
+    while len(tree) < nof_nodes:
+        parent, bitmask, frontier = 0, 0, [index.ROOT]
+        for _ in range(random.randint(1, max_depth)):
+            if not frontier or len(tree) >= nof_nodes:
+                break
+            i = frontier.pop(random.randrange(len(frontier)))
+            frontier.extend(range(index.children_start[i], index.children_end[i]))
+            bitmask |= 1 << i
+            tree.append((parent, bitmask, i))
+            parent = len(tree) - 1
+    return tree
+
+
+def shallow_size(obj: object) -> int:
+    """Size of the object and of its attributes dictionary (if it has attributes in it), without the objects it refers to."""
+    size = sys.getsizeof(obj)
+    if getattr(obj, '__dict__', None):
+        size += sys.getsizeof(obj.__dict__)
+    return size
+
+
+def benchmark(fm: FM, nof_nodes: int, max_depth: int) -> dict[str, float]:
+    """Build the nodes of a random search tree and return the memory they take per node.
+
+    The nodes (with their states, configurations and actions) are built from the payloads of the tree
+    and hashed (as when they are stored in the search tree), while tracing the allocations.
+    """
+    tree = random_tree(fm, nof_nodes, max_depth)
+    initial_state = ValidConfigurationState(FMConfiguration(fm))
+    nodes = []
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for parent, bitmask, i in tree:
+        state = initial_state.from_payload(bitmask)
+        if parent < 0:
+            node = Node(state)
+        else:
+            node = Node(state, nodes[parent], initial_state.action_from_payload(fm.index.names[i]))
+        hash(node)
+        nodes.append(node)
+    memory = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    node = nodes[-1]
+    return {NODES_STR: len(nodes),
+            BYTES_STR: round(memory / len(nodes), PRECISION),
+            NODE_STR: shallow_size(node),
+            STATE_STR: shallow_size(node.state),
+            CONFIGURATION_STR: shallow_size(node.state.configuration),
+            ACTION_STR: shallow_size(node.action)}
+
+
+def main(models: list[str], nof_nodes: int, max_depth: int):
+    rows = []
+    print(', '.join(HEADER))
+    for model in models:
+        input_model = model if model.endswith('.xml') else os.path.join('models', model + '.xml')
+        fm = FMCache().load(input_model)
+        row = {MODEL_STR: os.path.splitext(os.path.basename(input_model))[0],
+               FEATURES_STR: len(fm.features)}
+        row.update(benchmark(fm, nof_nodes, max_depth))
+        rows.append(row)
+        print(', '.join(str(row[h]) for h in HEADER))
+
+    filepath = os.path.join(RESULTS, 'node_memory_benchmark.csv')
+    with open(filepath, 'w', encoding='utf8', newline='') as file:
+        writer = csv.writer(file, delimiter=',')
+        writer.writerow(HEADER)
+        for row in rows:
+            writer.writerow([row[h] for h in HEADER])
+    print(f'Results saved in "{filepath}".')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark: memory per node of the search tree (node, state, configuration and action).')
+    parser.add_argument('-s', '--seed', dest='seed', type=int, required=False, default=None, help='Seed to initialize the random generator (default None), setup only for replication purposes.')
+    parser.add_argument('-fm', '--featuremodels', dest='feature_models', type=str, nargs='*', required=False, default=MODELS, help=f'Feature models in the "models" folder (or paths to FeatureIDE files) (default: {" ".join(MODELS)}).')
+    parser.add_argument('-n', '--nodes', dest='nodes', type=int, required=False, default=10000, help='Number of nodes of the search tree (default 10000).')
+    parser.add_argument('-d', '--depth', dest='depth', type=int, required=False, default=50, help='Maximum depth of the random walks that grow the search tree (default 50).')
+    args = parser.parse_args()
+
+    if args.seed is not None:
+        random.seed(args.seed)
+
+    main(models=args.feature_models,
+         nof_nodes=args.nodes,
+         max_depth=args.depth)
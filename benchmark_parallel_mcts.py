@@ -0,0 +1,105 @@
+import os
+import csv
+import time
+import argparse
+import random
+
+from montecarlo_framework.algorithms.stopping_conditions import IterationsStoppingCondition, NoneStoppingCondition
+from montecarlo_framework.models.feature_model import FMCache, FMConfiguration
+from montecarlo_framework.algorithms import Algorithm, AlgorithmFactory
+from montecarlo_framework.problems.configuration_based_analyses import ValidConfigurationState, CompletionPartialConfigProblem
+from montecarlo_framework.utils import utils
+from montecarlo_framework.utils.algorithm_logger import RESULTS
+
+
+PRECISION = 4
+
+MODELS = ['pizzas', 'GPL', 'wget', 'jHipster', 'tankwar', 'mobilemedia2', 'WeaFQAs', 'aafms_framework-namesAdapted', 'busybox-1.18.0']
+
+MODEL_STR = 'Model'
+ALGORITHM_STR = 'Algorithm'
+WORKERS_STR = 'Workers'
+TIME_STR = 'Time (s)'
+SIMULATIONS_STR = 'Total simulations'
+THROUGHPUT_STR = 'Simulations/s'
+TREESIZE_STR = 'Expanded nodes'  # in all the search trees of the run (see `get_tree_size`)
+VALID_STR = 'Valid solutions'
+HEADER = [MODEL_STR, ALGORITHM_STR, WORKERS_STR, TIME_STR, SIMULATIONS_STR, THROUGHPUT_STR, TREESIZE_STR, VALID_STR]
+
+
+def benchmark(runs: int, input_model: str, algorithm: Algorithm) -> dict[str, float]:
+    """Run the algorithm for the completion of an empty configuration and return the median of its measures."""
+    fm = FMCache().load(input_model)
+    feature_model = fm.fm_model
+    unselected_features = feature_model.get_features()
+    unselected_variables = [-fm.sat_model.variables[f.name] for f in unselected_features]
+    initial_config = FMConfiguration(fm, [], unselected_features, [], unselected_variables)
+    problem = CompletionPartialConfigProblem(ValidConfigurationState(initial_config))
+
+    times = []
+    simulations = []
+    tree_sizes = []
+    valid = 0
+    for _ in range(runs):
+        algorithm.initialize()
+        start = time.perf_counter()
+        solution = algorithm.run(problem)
+        times.append(time.perf_counter() - start)
+        simulations.append(algorithm.get_total_nof_simulations())
+        tree_sizes.append(algorithm.get_tree_size())
+        valid += solution is not None and solution.terminal_node.state.is_valid()
+
+    execution_time = utils.get_summary_stastistics(times, PRECISION)[utils.MEDIAN]
+    total_simulations = utils.get_summary_stastistics(simulations, PRECISION)[utils.MEDIAN]
+    return {TIME_STR: execution_time,
+            SIMULATIONS_STR: total_simulations,
+            THROUGHPUT_STR: round(total_simulations / execution_time, PRECISION) if execution_time > 0 else 0,
+            TREESIZE_STR: utils.get_summary_stastistics(tree_sizes, PRECISION)[utils.MEDIAN],
+            VALID_STR: f'{valid}/{runs}'}
+
+
+def main(runs: int, models: list[str], nof_workers: int, simulations: int, exploration_weight: float):
+    stopping_condition = NoneStoppingCondition()
+    mc_stopping_condition = IterationsStoppingCondition(iterations=simulations)
+    algorithms = {'RootParallelUCTMCTS': AlgorithmFactory.root_parallel_uct_mcts_maxchild(stopping_condition=stopping_condition, mc_stopping_condition=mc_stopping_condition, exploration_weight=exploration_weight, nof_workers=nof_workers),
+                  'TreeParallelUCTMCTS': AlgorithmFactory.tree_parallel_uct_mcts_maxchild(stopping_condition=stopping_condition, mc_stopping_condition=mc_stopping_condition, exploration_weight=exploration_weight, nof_workers=nof_workers)}
+
+    rows = []
+    print(', '.join(HEADER))
+    for model in models:
+        input_model = model if model.endswith('.xml') else os.path.join('models', model + '.xml')
+        for algorithm_name, algorithm in algorithms.items():
+            row = {MODEL_STR: model, ALGORITHM_STR: algorithm_name, WORKERS_STR: algorithm.nof_workers}
+            row.update(benchmark(runs, input_model, algorithm))
+            rows.append(row)
+            print(', '.join(str(row[h]) for h in HEADER))
+
+    filepath = os.path.join(RESULTS, f'parallel_mcts_benchmark_sims={simulations}_workers={nof_workers}.csv')
+    with open(filepath, 'w', encoding='utf8', newline='') as file:
+        writer = csv.writer(file, delimiter=',')
+        writer.writerow(HEADER)
+        for row in rows:
+            writer.writerow([row[h] for h in HEADER])
+    print(f'Results saved in "{filepath}".')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark: root parallelism vs tree parallelism (with virtual loss) for UCT MCTS.')
+    parser.add_argument('-s', '--seed', dest='seed', type=int, required=False, default=None, help='Seed to initialize the random generator (default None), setup only for replication purposes.')
+    parser.add_argument('-r', '--runs', dest='runs', type=int, required=False, default=3, help='Number of executions per model and algorithm (default 3).')
+    parser.add_argument('-fm', '--featuremodels', dest='feature_models', type=str, nargs='*', required=False, default=MODELS, help='Feature models in the "models" folder (or paths to FeatureIDE files) (default: the shipped models).')
+    parser.add_argument('-w', '--workers', dest='workers', type=int, required=False, default=os.cpu_count(), help='Number of worker processes (default: number of CPUs).')
+    parser.add_argument('-mc_sv', '--mc_stopping_value', dest='mc_stopping_value', type=int, required=False, default=100, help='Number of simulations per worker for each decision (default 100).')
+    parser.add_argument('-ew', '--exploration_weight', dest='exploration_weight', type=float, required=False, default=0.5, help='Exploration weight constant for UCT Algorithm (default 0.5).')
+    args = parser.parse_args()
+
+    if args.seed is not None:
+        # Initialize the random module
+        print(f'Initialized random module with seed {args.seed}')
+        random.seed(args.seed)
+
+    main(runs=args.runs,
+         models=args.feature_models,
+         nof_workers=args.workers,
+         simulations=args.mc_stopping_value,
+         exploration_weight=args.exploration_weight)
@@ -12,12 +12,13 @@ GREEDYMCTS="greedy_mcts"
 
 runs=30
 sim=100
+workers=$(nproc)
 
 for fm in "pizzas" "GPL" "wget" "jHipster" "tankwar" "mobilemedia2" "WeaFQAs" "aafms_framework-namesAdapted" "busybox-1.18.0"
 do
     finalresults="final_results/final_results_${fm}.txt"
     echo "====================${fm}====================" >> ${finalresults}
-    python main_complete_partial_config.py -fm models/${fm}.xml -r ${runs} -it ${sim}
+    python main_complete_partial_config.py -fm models/${fm}.xml -r ${runs} -it ${sim} -w ${workers}
     #echo "==========${ASTAR}==========" >> ${finalresults}
     #python montecarlo_framework/utils/csv_stats.py -f results/${ASTAR}_stats.csv >> ${finalresults}
     echo "==========${RANDOM}==========" >> ${finalresults}
@@ -4,16 +4,16 @@ import argparse
 import random
 from collections import defaultdict 
 
-from famapy.metamodels.fm_metamodel.transformations.featureide_reader import FeatureIDEReader
 from famapy.metamodels.bdd_metamodel.operations import BDDProductDistributionBF
 from montecarlo_framework.utils.attributes_csv_reader import AttributesCSVReader
 
 from montecarlo_framework.algorithms.montecarlo_algorithm import MonteCarloAlgorithm
 from montecarlo_framework.algorithms.stopping_conditions import IterationsStoppingCondition, TimeStoppingCondition, NoneStoppingCondition
-from montecarlo_framework.models.feature_model import FM, FMConfiguration
+from montecarlo_framework.models.feature_model import FMCache, FMConfiguration
 from montecarlo_framework.algorithms import Algorithm, AlgorithmFactory
-from montecarlo_framework.problems.configuration_based_analyses import OptimizeConfigurationState, FindingOptimumConfigProblem
+from montecarlo_framework.problems.configuration_based_analyses import ConfigurationState, OptimizeConfigurationState, FindingOptimumConfigProblem
 from montecarlo_framework.utils.algorithm_stats import AlgorithmStats
+from montecarlo_framework.utils import run_executor
 from montecarlo_framework.models.feature_model import fm_utils
 from montecarlo_framework.utils import utils
 from montecarlo_framework.utils.algorithm_logger import RESULTS
@@ -28,7 +28,9 @@ def main(runs: int,
          algorithm: Algorithm, 
          features_names: list[str], 
          use_core_features: bool,
-         stats_name: str):
+         stats_name: str,
+         nof_workers: int,
+         atomic_sets: bool):
     print(f'Loading {input_model} feature model...')
 
     # Load feature model
@@ -39,15 +41,14 @@ def main(runs: int,
     elif input_model == 'jhipster':
         input_fm = 'models/jHipster.xml'
 
-    feature_model = FeatureIDEReader(input_fm).transform()
+    # Load feature model and initialize metamodels (FM, SAT, BDD), compiled once and cached on disk
+    fm = FMCache().load(input_fm, atomic_sets=atomic_sets)  # FM is a helper class
+    feature_model = fm.fm_model
     attributes = AttributesCSVReader('models/aafm_framework_attributes.csv', feature_model).transform()
-    
-    # Initialize metamodels (FM, SAT, BDD)
-    fm = FM(feature_model)  # FM is a helper class
 
     # Initial state and problem
     if use_core_features:
-        core_features = fm_utils.get_core_features(feature_model)
+        core_features = fm.get_core_features()
     else:
         core_features = []
     configuration = fm_utils.initialize_configuration(feature_model, features_names)
@@ -64,14 +65,8 @@ def main(runs: int,
     print(f'Initial state: {initial_state}')
 
     # Run algorithm runs times
-    solutions = []
     print(f'Running {runs} executions of algorithm "{algorithm.get_name()}" with {stopping_condition} as stopping condition...')
-    print('  |run: ', end='', flush=True)
-    for r in range(runs):
-        algorithm.initialize()
-        print(f'{r+1} ', end='', flush=True)
-        solutions.append(algorithm.run(problem))  # Run the algorithm
-    print()
+    solutions = run_executor.execute_runs(algorithm, problem, runs, stats_name, nof_workers)  # Run the algorithm
     print('Search finished.')
 
     # Get valid solutions:
@@ -162,11 +157,14 @@ if __name__ == '__main__':
     parser.add_argument('-sc', '--stopping_condition', dest='stopping_condition', type=str, required=False, default=None, help='Stopping condition for the algorithm: "iter" for iterations, or "time". (default: the algorithm runs until a solution is found).')
     parser.add_argument('-sv', '--stopping_value', dest='stopping_value', type=int, required=False, default=None, help='Value for the stopping condition: number of iterations for "iter" or seconds for "time".')
     parser.add_argument('-mc_sc', '--mc_stopping_condition', dest='mc_stopping_condition', type=str, required=False, default='sim', help='Stopping condition for each decision in MonteCarlo algorithms: "sim" for simulations (default) or "time".')
-    parser.add_argument('-mc_sv', '--mc_stopping_value', dest='mc_stopping_value', type=int, required=False, default=None, help='Stopping value for each decision in Monte Carlo algorithms: number of simulations for "sim" (default 100) or seconds for "time" (default 1 s).')
+    parser.add_argument('-mc_sv', '--mc_stopping_value', dest='mc_stopping_value', type=int, required=False, default=None, help='Stopping value for each decision in Monte Carlo algorithms: number of simulations for "sim" (default 100) or seconds for "time" (default 1 s). With -p, it is the budget of each process of "mcts" (so a decision runs up to that number of processes times the simulations), and the budget shared by the processes of "flat".')
     parser.add_argument('-ew', '--exploration_weight', dest='exploration_weight', type=float, required=False, default=0.5, help='Exploration weight constant for UCT Algorithm (default 0.5).')
     parser.add_argument('-f', '--features', dest='features', type=str, nargs='*', required=False, help='Initial feature selections (initial configuration).')
     parser.add_argument('-c', '--core', dest='core_features', action='store_true', required=False, help='Use core features as initial configuration state.')
-    parser.add_argument('-p', '--parallel', dest='parallel', action='store_true', required=False, help='User parallel version of the algorithm if available (algorithm supported: "flat").')
+    parser.add_argument('-p', '--parallel', dest='parallel', action='store_true', required=False, help='User parallel version of the algorithm if available (algorithm supported: "flat", "mcts"). Each run uses the CPUs divided by the number of workers (-w) as processes. For "mcts" (root parallelization), each process runs its own search with the whole budget of the decision (-mc_sv).')
+    parser.add_argument('-w', '--workers', dest='workers', type=int, required=False, default=1, help='Number of worker processes to execute the runs in parallel (default 1).')
+    parser.add_argument('-as', '--atomic_sets', dest='atomic_sets', action='store_true', required=False, help='Select the atomic set of each feature with a single decision (core features are selected with the root).')
+    parser.add_argument('-rp', '--rollout_policy', dest='rollout_policy', type=str, required=False, default=ConfigurationState.RANDOM_WALK, choices=ConfigurationState.ROLLOUT_POLICIES, help='Policy to reach the terminal states of the simulations: "random_walk" selects random configurable features (default), "solver" completes the configuration with a single solver call with random phases, "solver_top_down" with a solver call per level of the tree, "bdd" uniformly at random using the BDD.')
     args = parser.parse_args()
 
     if args.seed is not None:
@@ -179,6 +177,11 @@ if __name__ == '__main__':
         parser.print_help()
         sys.exit()
 
+    if args.workers <= 0:
+        print(f"ERROR: the number of workers must be positive.")
+        parser.print_help()
+        sys.exit()
+
     if args.feature_model.lower() not in ['aafm-excerpt', 'aafm']:
         print(f"ERROR: Feature model not recognized. Use: 'aafm-excerpt', 'aafm', or 'jhipster'.")
         parser.print_help()
@@ -234,6 +237,8 @@ if __name__ == '__main__':
         parser.print_help()
         sys.exit()
 
+    nof_parallel_workers = run_executor.get_nof_parallel_workers(args.workers)
+
     algorithm_name = args.algorithm.lower()
     if algorithm_name == 'random':
         algorithm = AlgorithmFactory.random_strategy(stopping_condition=stopping_condition)
@@ -242,14 +247,18 @@ if __name__ == '__main__':
         algorithm = AlgorithmFactory.a_star_search(stopping_condition=stopping_condition)
         stats_name = 'AStarSearch'
     elif algorithm_name == 'mcts':
-        algorithm = AlgorithmFactory.uct_mcts_maxchild(stopping_condition=stopping_condition, mc_stopping_condition=mc_stopping_condition, exploration_weight=args.exploration_weight)
-        stats_name = 'UCTMCTS'
+        if args.parallel:
+            algorithm = AlgorithmFactory.root_parallel_uct_mcts_maxchild(stopping_condition=stopping_condition, mc_stopping_condition=mc_stopping_condition, exploration_weight=args.exploration_weight, nof_workers=nof_parallel_workers)
+            stats_name = 'RootParallelUCTMCTS'
+        else:
+            algorithm = AlgorithmFactory.uct_mcts_maxchild(stopping_condition=stopping_condition, mc_stopping_condition=mc_stopping_condition, exploration_weight=args.exploration_weight)
+            stats_name = 'UCTMCTS'
     elif algorithm_name == 'greedy':
         algorithm = AlgorithmFactory.greedy_mcts_maxchild(stopping_condition=stopping_condition, mc_stopping_condition=mc_stopping_condition)
         stats_name = 'GreedyMCTS'
     elif algorithm_name == 'flat':
         if args.parallel:
-            algorithm = AlgorithmFactory.parallel_flat_montecarlo_maxchild(stopping_condition=stopping_condition, mc_stopping_condition=mc_stopping_condition)
+            algorithm = AlgorithmFactory.parallel_flat_montecarlo_maxchild(stopping_condition=stopping_condition, mc_stopping_condition=mc_stopping_condition, nof_workers=nof_parallel_workers)
             stats_name = 'ParallelFlatMonteCarlo'
         else:
             algorithm = AlgorithmFactory.flat_montecarlo_maxchild(stopping_condition=stopping_condition, mc_stopping_condition=mc_stopping_condition)
@@ -264,9 +273,14 @@ if __name__ == '__main__':
     else:
         features = args.features
 
+    # Policy of the random simulations (rollouts)
+    ConfigurationState.set_rollout_policy(args.rollout_policy)
+
     main(runs=args.runs,
          input_model=args.feature_model.lower(), 
          algorithm=algorithm, 
          features_names=features,
          use_core_features=args.core_features,
-         stats_name=stats_name)
\ No newline at end of file
+         stats_name=stats_name,
+         nof_workers=args.workers,
+         atomic_sets=args.atomic_sets)
\ No newline at end of file
@@ -2,18 +2,16 @@ import sys
 import os
 import argparse
 import random
-from functools import reduce
 from pathlib import Path
 
 
-from famapy.metamodels.fm_metamodel.transformations.featureide_reader import FeatureIDEReader
 from famapy.metamodels.bdd_metamodel.operations import BDDProductDistributionBF
 from famapy.metamodels.fm_metamodel.transformations.uvl_writter import UVLWriter
 from famapy.metamodels.fm_metamodel.models import FeatureModel
 
 from montecarlo_framework.algorithms.montecarlo_algorithm import MonteCarloAlgorithm
 from montecarlo_framework.algorithms.stopping_conditions import IterationsStoppingCondition, TimeStoppingCondition, NoneStoppingCondition
-from montecarlo_framework.models.feature_model import FM, FMConfiguration
+from montecarlo_framework.models.feature_model import FM, FMCache, FMConfiguration
 from montecarlo_framework.algorithms import Algorithm, AlgorithmFactory
 from montecarlo_framework.problems.fm_based_analyses import FMState, ReverseEngineeringProblem
 from montecarlo_framework.utils.algorithm_stats import AlgorithmStats
@@ -30,14 +28,11 @@ def main(input_model: str,
          stats_name: str):
     print(f'Loading {input_model} feature model...')
 
-    # Load feature model
-    feature_model = FeatureIDEReader(input_model).transform()
-    
-    # Initialize metamodels (FM, SAT, BDD)
-    fm = FM(feature_model)  # FM is a helper class
+    # Load feature model and initialize metamodels (FM, SAT, BDD), compiled once and cached on disk
+    fm = FMCache().load(input_model)  # FM is a helper class
 
-    # Initial state and problem
-    configurations = fm.get_configurations()
+    # Initial state and problem (the input configurations are the products of the input feature model)
+    configurations = list(fm.iter_configurations())
     initial_state = FMState(FeatureModel(None), configurations)
     problem = ReverseEngineeringProblem(initial_state)
     
@@ -60,19 +55,24 @@ def main(input_model: str,
     uvl_writter = UVLWriter(path=path, source_model=state.feature_model)
     uvl_writter.transform()
 
-    # Get configurations
+    # Get configurations (enumerated one at a time and compared with the input configurations by their features)
     print("Generating configurations of the extracted feature model...")
     aafms_helper = FM(state.feature_model)
-    new_configurations = aafms_helper.get_configurations()
+    input_bitmasks = {c.get_bitmask() for c in configurations}
+    nof_new_configurations = 0
+    nof_captured_configurations = 0
+    for c in aafms_helper.iter_configurations():
+        nof_new_configurations += 1
+        nof_captured_configurations += fm.get_configuration_bitmask(c) in input_bitmasks
     
     print("Results:")
     print(f"#Features: {len(state.feature_model.get_features())}")
-    print(f"#Configurations: {len(new_configurations)}")
+    print(f"#Configurations: {nof_new_configurations}")
     print(f"#Expected configurations: {len(configurations)}")
 
-    relaxed_value = reduce(lambda count, c: count + (aafms_helper.is_valid_configuration(c)), configurations, 0)
-    deficit_value = reduce(lambda count, c: count + (c not in new_configurations), configurations, 0)
-    surplus_value = reduce(lambda count, c: count + (c not in configurations), new_configurations, 0)
+    relaxed_value = sum(aafms_helper.are_valid_configurations(configurations))
+    deficit_value = len(input_bitmasks) - nof_captured_configurations
+    surplus_value = nof_new_configurations - nof_captured_configurations
     print(f"Input configurations captured (Relaxed objective function): {relaxed_value}")
     print(f"Deficit of configurations: {deficit_value}")
     print(f"Irrelevant configurations: {surplus_value}")
@@ -4,6 +4,9 @@ from .flat_montecarlo import FlatMonteCarlo
 from .parallel_flat_montecarlo import ParallelFlatMonteCarlo
 from .montecarlo_tree_search import MonteCarloTreeSearch
 from .uct_mcts import UCTMCTS
+from .array_uct_mcts import ArrayUCTMCTS
+from .root_parallel_uct_mcts import RootParallelUCTMCTS
+from .tree_parallel_uct_mcts import TreeParallelUCTMCTS
 from .greedy_mcts import GreedyMCTS
 from .random_strategy import RandomStrategy
 from .a_star_search import AStarSearch
@@ -14,6 +17,9 @@ __all__ = [Algorithm,
            FlatMonteCarlo, 
            MonteCarloTreeSearch,
            UCTMCTS,
+           ArrayUCTMCTS,
+           RootParallelUCTMCTS,
+           TreeParallelUCTMCTS,
            GreedyMCTS,
            AStarSearch,
            RandomStrategy,
@@ -4,6 +4,9 @@ from montecarlo_framework.algorithms import (
     FlatMonteCarlo, 
     ParallelFlatMonteCarlo,
     UCTMCTS,
+    ArrayUCTMCTS,
+    RootParallelUCTMCTS,
+    TreeParallelUCTMCTS,
     GreedyMCTS
 )
 from montecarlo_framework.algorithms.stopping_conditions import (
@@ -33,23 +36,61 @@ class AlgorithmFactory:
                               decision_stopping_condition=mc_stopping_condition)
     
     @staticmethod
-    def parallel_flat_montecarlo_maxchild(stopping_condition: StoppingCondition, mc_stopping_condition: StoppingCondition) -> FlatMonteCarlo:
+    def parallel_flat_montecarlo_maxchild(stopping_condition: StoppingCondition, mc_stopping_condition: StoppingCondition, nof_workers: int = None, chunk_size: int = 10) -> FlatMonteCarlo:
         select_crit = MaxChild()
         return ParallelFlatMonteCarlo(stopping_condition=stopping_condition, 
                               selection_criteria=select_crit, 
-                              decision_stopping_condition=mc_stopping_condition)
+                              decision_stopping_condition=mc_stopping_condition,
+                              nof_workers=nof_workers,
+                              chunk_size=chunk_size)
     
     @staticmethod
-    def uct_mcts_maxchild(stopping_condition: StoppingCondition, mc_stopping_condition: StoppingCondition, exploration_weight: float) -> FlatMonteCarlo:
+    def uct_mcts_maxchild(stopping_condition: StoppingCondition, mc_stopping_condition: StoppingCondition, exploration_weight: float, subtree_reuse: bool = False, leaf_simulations: int = 1, nof_workers: int = None) -> FlatMonteCarlo:
         select_crit = MaxChild()
         return UCTMCTS(stopping_condition=stopping_condition, 
                        selection_criteria=select_crit, 
                        decision_stopping_condition=mc_stopping_condition,
-                       exploration_weight=exploration_weight)
+                       exploration_weight=exploration_weight,
+                       subtree_reuse=subtree_reuse,
+                       leaf_simulations=leaf_simulations,
+                       nof_workers=nof_workers)
+
+    @staticmethod
+    def array_uct_mcts_maxchild(stopping_condition: StoppingCondition, mc_stopping_condition: StoppingCondition, exploration_weight: float, subtree_reuse: bool = False, leaf_simulations: int = 1, nof_workers: int = None) -> ArrayUCTMCTS:
+        select_crit = MaxChild()
+        return ArrayUCTMCTS(stopping_condition=stopping_condition, 
+                            selection_criteria=select_crit, 
+                            decision_stopping_condition=mc_stopping_condition,
+                            exploration_weight=exploration_weight,
+                            subtree_reuse=subtree_reuse,
+                            leaf_simulations=leaf_simulations,
+                            nof_workers=nof_workers)
+
+    @staticmethod
+    def root_parallel_uct_mcts_maxchild(stopping_condition: StoppingCondition, mc_stopping_condition: StoppingCondition, exploration_weight: float, nof_workers: int = None) -> RootParallelUCTMCTS:
+        select_crit = MaxChild()
+        return RootParallelUCTMCTS(stopping_condition=stopping_condition, 
+                                   selection_criteria=select_crit, 
+                                   decision_stopping_condition=mc_stopping_condition,
+                                   exploration_weight=exploration_weight,
+                                   nof_workers=nof_workers)
+
+    @staticmethod
+    def tree_parallel_uct_mcts_maxchild(stopping_condition: StoppingCondition, mc_stopping_condition: StoppingCondition, exploration_weight: float, nof_workers: int = None, virtual_loss: int = 1) -> TreeParallelUCTMCTS:
+        select_crit = MaxChild()
+        return TreeParallelUCTMCTS(stopping_condition=stopping_condition, 
+                                   selection_criteria=select_crit, 
+                                   decision_stopping_condition=mc_stopping_condition,
+                                   exploration_weight=exploration_weight,
+                                   nof_workers=nof_workers,
+                                   virtual_loss=virtual_loss)
  
     @staticmethod
-    def greedy_mcts_maxchild(stopping_condition: StoppingCondition, mc_stopping_condition: StoppingCondition) -> FlatMonteCarlo:
+    def greedy_mcts_maxchild(stopping_condition: StoppingCondition, mc_stopping_condition: StoppingCondition, subtree_reuse: bool = False, leaf_simulations: int = 1, nof_workers: int = None) -> FlatMonteCarlo:
         select_crit = MaxChild()
         return GreedyMCTS(stopping_condition=stopping_condition, 
                           selection_criteria=select_crit, 
-                          decision_stopping_condition=mc_stopping_condition)
+                          decision_stopping_condition=mc_stopping_condition,
+                          subtree_reuse=subtree_reuse,
+                          leaf_simulations=leaf_simulations,
+                          nof_workers=nof_workers)
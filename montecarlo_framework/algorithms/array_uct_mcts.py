@@ -0,0 +1,117 @@
+from montecarlo_framework.models import Problem, State, Node, Solution
+from montecarlo_framework.models.array_search_tree import ArraySearchTree
+from montecarlo_framework.algorithms import MonteCarloTreeSearch
+from montecarlo_framework.algorithms.stopping_conditions import StoppingCondition
+from montecarlo_framework.algorithms.selection_criterias import SelectionCriteria
+
+from montecarlo_framework.utils.algorithm_stats import AlgorithmStats
+
+
+class ArrayUCTMCTS(MonteCarloTreeSearch):
+    """
+    Upper confidence bounds for trees (UCT) policy over an array-backed search tree.
+
+    Nodes are identified by integer ids and their statistics (visits, rewards, parent, children)
+    are stored in contiguous arrays (see ArraySearchTree), so the tree policy does not hash states
+    and the UCT values of all children of a node are computed in a single vectorized operation.
+    The accumulated rewards and visits are exposed as `Q` and `N` (arrays indexed by node id).
+    """
+
+    @staticmethod
+    def get_name() -> str:
+        return 'Array UCT MCTS'
+
+    def __init__(self,
+                 stopping_condition: StoppingCondition,
+                 selection_criteria: SelectionCriteria,
+                 decision_stopping_condition: StoppingCondition,
+                 exploration_weight: float = 0.5,
+                 subtree_reuse: bool = False,
+                 leaf_simulations: int = 1,
+                 nof_workers: int = None):
+        super().__init__(stopping_condition, selection_criteria, decision_stopping_condition, subtree_reuse, leaf_simulations, nof_workers)
+        self.exploration_weight = exploration_weight
+
+    def initialize(self) -> None:
+        self.tree: ArraySearchTree = ArraySearchTree()  # the MC tree with the statistics of each node
+        self.root: int = -1  # id of the node from which the current decision is made
+        self.terminal_states_evaluated: dict[State, float] = dict()  # terminal states -> reward
+        self.total_nof_simulations: int = 0
+        self.total_nof_positive_evaluations: int = 0
+        self.nof_terminal_states_evaluated_in_pool: int = 0
+
+    @property
+    def Q(self):
+        """Total reward of each node, indexed by node id."""
+        return self.tree.rewards
+
+    @property
+    def N(self):
+        """Total visit count of each node, indexed by node id."""
+        return self.tree.visits
+
+    def choose(self, node: Node) -> Node:
+        if self.root < 0 or self.tree.node(self.root) is not node:
+            self.tree = ArraySearchTree()
+            self.root = self.tree.add_root(node)
+
+        self.get_decision_stopping_condition().initialize()
+        while not self.get_decision_stopping_condition().reached():
+            self.do_rollout(self.root)
+            self.get_decision_stopping_condition().update()
+        # Selection criterias work on any mapping indexed by node, so the ids and arrays are given.
+        self.root = self.get_selection_criteria().best_child(self.root, self.tree.children(self.root), self.Q, self.N)
+        return self.tree.node(self.root)
+
+    @AlgorithmStats('ArrayUCTMCTS', logger=None)
+    def run(self, problem: Problem) -> Solution:
+        return super().run(problem)
+
+    def reuse_subtree(self, node: Node):
+        """Promote the current root (the chosen node) to the root of a compacted tree."""
+        self.tree = self.tree.subtree(self.root)
+        self.root = 0
+
+    def do_rollout(self, node_id: int):
+        """Make the search tree one layer better (train for one iteration)."""
+        leaf = self.select(node_id)
+        self.expand(leaf)
+        reward, visits = self.simulate_leaf(self.tree.node(leaf).state)
+        self.backpropagate(leaf, reward, visits)
+
+    def select(self, node_id: int) -> int:
+        """
+        Step 1: Selection.
+        Descend from the given node applying the tree policy until an unvisited or unexpanded node is reached.
+        Return the id of the leaf.
+        """
+        while self.tree.nof_children[node_id] > 0:
+            child = self.tree.unvisited_child(node_id)
+            if child >= 0:  # the node is not fully explored
+                return child
+            node_id = self.best_child(node_id)
+        return node_id
+
+    def best_child(self, node_id: int) -> int:
+        """Select the best child of the node, balancing exploration and exploitation."""
+        return self.tree.uct_child(node_id, self.exploration_weight)
+
+    def expand(self, node_id: int):
+        """
+        Step 2: Expansion.
+        Update the tree with the children of the node.
+        """
+        if not self.tree.is_expanded(node_id):
+            node = self.tree.node(node_id)
+            successors = node.state.all_successors()
+            self.tree.add_children(node_id, [Node(s, node, a) for s, a in successors])
+
+    def backpropagate(self, node_id: int, reward: float, visits: int = 1):
+        """
+        Step 4. Backpropagation.
+        Send the reward back up to the ancestors of the node in the tree.
+        """
+        self.tree.backpropagate(node_id, reward, visits)
+
+    def __str__(self) -> str:
+        return f"Array UCT Algorithm ({str(self.stopping_condition)}, ew={self.exploration_weight})"
@@ -24,8 +24,12 @@ class GreedyMCTS(UCTMCTS):
     def __init__(self, 
                  stopping_condition: StoppingCondition, 
                  selection_criteria: SelectionCriteria, 
-                 decision_stopping_condition: StoppingCondition):
-        super().__init__(stopping_condition, selection_criteria, decision_stopping_condition, exploration_weight=0.0)
+                 decision_stopping_condition: StoppingCondition,
+                 subtree_reuse: bool = False,
+                 leaf_simulations: int = 1,
+                 nof_workers: int = None):
+        super().__init__(stopping_condition, selection_criteria, decision_stopping_condition, exploration_weight=0.0, 
+                         subtree_reuse=subtree_reuse, leaf_simulations=leaf_simulations, nof_workers=nof_workers)
 
     def __str__(self) -> str:
         return f"Greedy MCTS ({str(self.stopping_condition)})"
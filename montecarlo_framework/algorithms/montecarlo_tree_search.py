@@ -5,6 +5,7 @@ from abc import abstractmethod
 from montecarlo_framework.algorithms import MonteCarloAlgorithm
 from montecarlo_framework.algorithms.stopping_conditions import StoppingCondition
 from montecarlo_framework.algorithms.selection_criterias import SelectionCriteria
+from montecarlo_framework.algorithms.simulation_pool import SimulationPool
 from montecarlo_framework.models import Problem, State, Node, Solution
 
 from montecarlo_framework.utils.heatmap import Heatmap
@@ -15,12 +16,28 @@ class MonteCarloTreeSearch(MonteCarloAlgorithm):
     A search tree is built in an incremental and assymetric manner.
     For each iteration of the algorithm, a tree policy is used to find the most urgent node of the current tree.
     It uses uniform random choices as the default policy for simulations.
+    With `subtree_reuse`, after each decision the chosen child becomes the new root of the tree:
+    its subtree and statistics are kept as a warm start for the next decision,
+    and the rest of the tree (the abandoned sibling branches) is freed.
+    With `leaf_simulations` > 1 (leaf parallelization), each rollout runs that number of simulations
+    from the selected leaf at once in a pool of `nof_workers` processes,
+    and backpropagates the summed reward with one visit per simulation.
     """
 
-    def __init__(self, stopping_condition: StoppingCondition, selection_criteria: SelectionCriteria, decision_stopping_condition: StoppingCondition):
+    def __init__(self, 
+                 stopping_condition: StoppingCondition, 
+                 selection_criteria: SelectionCriteria, 
+                 decision_stopping_condition: StoppingCondition,
+                 subtree_reuse: bool = False,
+                 leaf_simulations: int = 1,
+                 nof_workers: int = None):
         self.stopping_condition = stopping_condition
         self.selection_criteria = selection_criteria
         self.decision_stopping_condition = decision_stopping_condition
+        self.subtree_reuse = subtree_reuse
+        self.leaf_simulations = leaf_simulations
+        self.nof_workers = nof_workers
+        self.simulation_pool: SimulationPool = None
         self.initialize()
 
     def initialize(self) -> None:
@@ -30,6 +47,7 @@ class MonteCarloTreeSearch(MonteCarloAlgorithm):
         self.terminal_states_evaluated: dict[Node, float] = dict()  # terminal states -> reward
         self.total_nof_simulations: int = 0
         self.total_nof_positive_evaluations: int = 0
+        self.nof_terminal_states_evaluated_in_pool: int = 0
 
     @staticmethod
     def get_name() -> str:
@@ -54,20 +72,45 @@ class MonteCarloTreeSearch(MonteCarloAlgorithm):
     def run(self, problem: Problem) -> Solution:
         self.initialize()
         node = Node(problem.get_initial_state())
-        
+        if self.leaf_simulations > 1:
+            with SimulationPool(node.state, self.nof_workers) as self.simulation_pool:
+                node = self.search(node)
+            self.simulation_pool = None
+        else:
+            node = self.search(node)
+        return Solution(node) if node is not None else None
+
+    def search(self, node: Node) -> Node:
+        """Make decisions from the node until a terminal node or the stopping condition is reached."""
         self.get_stopping_condition().initialize()
         while not node.state.is_terminal() and not self.get_stopping_condition().reached():
             node = self.choose(node)
+            if self.subtree_reuse and node is not None:
+                self.reuse_subtree(node)
             self.get_stopping_condition().update()
-        return Solution(node) if node is not None else None
+        return node
+
+    def reuse_subtree(self, node: Node):
+        """Promote the node to the root of the tree, freeing all nodes outside its subtree."""
+        subtree = {}
+        pending = [node]
+        while pending:
+            n = pending.pop()
+            if n not in subtree and n in self.tree:
+                subtree[n] = self.tree[n]
+                pending.extend(subtree[n])
+        # Every visited node has been expanded, so the statistics to be kept are those of the subtree.
+        self.Q = defaultdict(int, {n: self.Q[n] for n in subtree})
+        self.N = defaultdict(int, {n: self.N[n] for n in subtree})
+        self.tree = subtree
 
     def do_rollout(self, node: Node):
         """Make the search tree one layer better (train for one iteration)."""
         path = self.select(node)
         leaf = path[-1]
         self.expand(leaf)
-        reward = self.simulate(leaf.state)
-        self.backpropagate(path, reward)
+        reward, visits = self.simulate_leaf(leaf.state)
+        self.backpropagate(path, reward, visits)
 
     def select(self, node: Node) -> list[Node]:
         """
@@ -123,20 +166,42 @@ class MonteCarloTreeSearch(MonteCarloAlgorithm):
                 self.total_nof_positive_evaluations += 1
         return reward
 
-    def backpropagate(self, path: list[Node], reward: float):
+    def simulate_leaf(self, state: State) -> tuple[float, int]:
+        """
+        Run the simulations from the selected leaf:
+        a single simulation, or a batch of `leaf_simulations` in the simulation pool (leaf parallelization).
+        Return the summed reward and the number of simulations.
+        """
+        if self.simulation_pool is None:
+            return (self.simulate(state), 1)
+
+        results = self.simulation_pool.simulate([(None, state)] * self.leaf_simulations)
+        self.total_nof_simulations += len(results)
+        for _, reward, evaluated in results:
+            if evaluated:
+                self.nof_terminal_states_evaluated_in_pool += 1
+                if reward > 0:
+                    self.total_nof_positive_evaluations += 1
+        return (sum(reward for _, reward, _ in results), len(results))
+
+    def backpropagate(self, path: list[Node], reward: float, visits: int = 1):
         """
         Step 4. Backpropagation.
         Send the reward back up to the visited nodes in the tree.
         """
         for node in reversed(path):
-            self.N[node] += 1
+            self.N[node] += visits
             self.Q[node] += reward
 
     def get_nof_terminal_states_evaluated(self) -> int:
-        return len(self.terminal_states_evaluated)
+        return len(self.terminal_states_evaluated) + self.nof_terminal_states_evaluated_in_pool
 
     def get_total_nof_simulations(self) -> int:
         return self.total_nof_simulations
 
+    def get_tree_size(self) -> int:
+        """Number of nodes expanded in the search tree."""
+        return len(self.tree)
+
     def get_total_nof_positive_evaluations(self) -> int:
         return self.total_nof_positive_evaluations
\ No newline at end of file
@@ -1,10 +1,11 @@
+import os
 from collections import defaultdict
-import multiprocessing
 
 from montecarlo_framework.algorithms import MonteCarloAlgorithm
 from montecarlo_framework.algorithms.stopping_conditions import StoppingCondition
 from montecarlo_framework.algorithms.selection_criterias import SelectionCriteria
-from montecarlo_framework.models import Problem, State, Node, Solution
+from montecarlo_framework.algorithms.simulation_pool import SimulationPool
+from montecarlo_framework.models import Problem, Node, Solution
 
 from montecarlo_framework.utils.montecarlo_stats import MonteCarloStats
 from montecarlo_framework.utils.algorithm_stats import AlgorithmStats
@@ -13,15 +14,26 @@ from montecarlo_framework.utils.algorithm_logger import get_logger
 
 class ParallelFlatMonteCarlo(MonteCarloAlgorithm):
     """
-    Basic implementation of the Monte Carlo strategy.
-    It performs a default policiy for simulations, where uniform random selection are made.
-    The chooses the best state according to a criteria.
+    Parallel implementation of the basic Monte Carlo strategy.
+    The simulations of each decision run in a persistent pool of worker processes (see SimulationPool),
+    created once per run: the workers inherit the problem (e.g., the FM with its SAT solver),
+    receive the sampled children as compact payloads in chunks of `chunk_size` simulations per worker,
+    and return the reward of each simulation with the key of its child.
+    Then it chooses the best state according to a criteria.
     """
 
-    def __init__(self, stopping_condition: StoppingCondition, selection_criteria: SelectionCriteria, decision_stopping_condition: StoppingCondition):
+    def __init__(self, 
+                 stopping_condition: StoppingCondition, 
+                 selection_criteria: SelectionCriteria, 
+                 decision_stopping_condition: StoppingCondition,
+                 nof_workers: int = None,
+                 chunk_size: int = 10):
         self.stopping_condition = stopping_condition
         self.selection_criteria = selection_criteria
         self.decision_stopping_condition = decision_stopping_condition
+        self.nof_workers = nof_workers if nof_workers else os.cpu_count()
+        self.chunk_size = chunk_size
+        self.simulation_pool: SimulationPool = None
         self.initialize()
 
     @staticmethod
@@ -54,34 +66,10 @@ class ParallelFlatMonteCarlo(MonteCarloAlgorithm):
             state, action = node.state.random_successor()
             return Node(state, node, action)
 
-        simulations = self.get_decision_stopping_condition().get_value()
-        results_queue = multiprocessing.Queue()
-        processes = {}
-
-        for _ in range(simulations):
-            child, action = node.state.random_successor()
-            child_node = Node(child, node, action)
-            p = multiprocessing.Process(target=self.simulate, args=(child, results_queue))
-            p.start()
-            processes[p] = child_node
-        
-        for process in processes.keys():
-            process.join()
-    
-        for process in processes.keys():
-            child_node = processes[process]
-            reward = results_queue.get()
-            self.Q[child_node] += reward
-            self.N[child_node] += 1
-            self.nof_terminal_states_evaluated += 1
-            if reward > 0:
-                self.total_nof_positive_evaluations += 1
-      
-        self.total_nof_simulations += simulations
-        # print('Q-Values')
-        # for n in self.Q.keys():
-        #     print(f'{n} -> {self.Q[n]} / {self.N[n]} = {self.Q[n] / self.N[n]}')
-        # print('--------')
+        children: list[Node] = []  # the key of each child is its index
+        self.get_decision_stopping_condition().initialize()
+        while not self.get_decision_stopping_condition().reached():
+            self.do_rollout(node, children)
         return self.get_selection_criteria().best_child(node, self.Q.keys(), self.Q, self.N)
 
     @AlgorithmStats('ParallelFlatMonteCarlo', logger=None)
@@ -89,26 +77,36 @@ class ParallelFlatMonteCarlo(MonteCarloAlgorithm):
         self.initialize()
         node = Node(problem.get_initial_state())
         
-        self.get_stopping_condition().initialize()
-        while not node.state.is_terminal() and not self.get_stopping_condition().reached():
-            node = self.choose(node)
+        with SimulationPool(node.state, self.nof_workers) as self.simulation_pool:
+            self.get_stopping_condition().initialize()
+            while not node.state.is_terminal() and not self.get_stopping_condition().reached():
+                node = self.choose(node)
+                self.get_stopping_condition().update()
+        self.simulation_pool = None
         return Solution(node) if node is not None else None
 
-    def do_rollout(self, node: Node, results_queue):
-        """Perform a simulation and store the statistics."""
-        child, action = node.state.random_successor()
-        reward = self.simulate(child)
-        result = (child, reward)
-        results_queue.put(result)
-
-    def simulate(self, state: State, results_queue: multiprocessing.Queue) -> float:
-        """A simulation is rolled out using uniform random choices.
-
-        Return the simulation's reward (i.e., reward of the terminal state).
-        """
-        z = state.get_random_terminal_state().reward()
-        results_queue.put(z)
-        return z
+    def do_rollout(self, node: Node, children: list[Node]):
+        """Perform a batch of simulations (up to `chunk_size` per worker) from random children and store the statistics."""
+        keys = {child.state: key for key, child in enumerate(children)}
+        tasks = []
+        batch_size = self.nof_workers * self.chunk_size
+        while len(tasks) < batch_size and not self.get_decision_stopping_condition().reached():
+            child, action = node.state.random_successor()
+            if child not in keys:
+                keys[child] = len(children)
+                children.append(Node(child, node, action))
+            tasks.append((keys[child], children[keys[child]].state))
+            self.get_decision_stopping_condition().update()
+
+        for key, reward, evaluated in self.simulation_pool.simulate(tasks):
+            child_node = children[key]
+            self.Q[child_node] += reward
+            self.N[child_node] += 1
+            if evaluated:
+                self.nof_terminal_states_evaluated += 1
+                if reward > 0:
+                    self.total_nof_positive_evaluations += 1
+        self.total_nof_simulations += len(tasks)
     
     def get_nof_terminal_states_evaluated(self) -> int:
         return self.nof_terminal_states_evaluated
@@ -0,0 +1,147 @@
+import os
+import random
+import multiprocessing
+
+from montecarlo_framework.models import Problem, Node, Solution
+from montecarlo_framework.algorithms import MonteCarloTreeSearch, UCTMCTS
+from montecarlo_framework.algorithms.stopping_conditions import StoppingCondition, NoneStoppingCondition
+from montecarlo_framework.algorithms.selection_criterias import SelectionCriteria
+
+from montecarlo_framework.utils.algorithm_stats import AlgorithmStats
+
+
+# State of each worker process (set once by the pool initializer).
+_worker_problem: Problem = None
+_worker_algorithm: UCTMCTS = None
+_worker_node: Node = None
+_worker_path: tuple[int, ...] = ()
+
+
+def _initialize_worker(problem: Problem, algorithm: UCTMCTS):
+    global _worker_problem, _worker_algorithm, _worker_node, _worker_path
+    _worker_problem = problem
+    _worker_algorithm = algorithm
+    _worker_node = Node(problem.get_initial_state())
+    _worker_path = ()
+
+
+def _get_node(path: tuple[int, ...]) -> Node:
+    """Node reached from the initial state following the path of successors (indexes in `all_successors`).
+
+    The last reached node is kept, so in consecutive decisions only the new steps are applied.
+    """
+    global _worker_node, _worker_path
+    if path[:len(_worker_path)] != _worker_path:
+        _worker_node = Node(_worker_problem.get_initial_state())
+        _worker_path = ()
+    for i in path[len(_worker_path):]:
+        state, action = _worker_node.state.all_successors()[i]
+        _worker_node = Node(state, _worker_node, action)
+    _worker_path = path
+    return _worker_node
+
+
+def _search(path: tuple[int, ...], seed: int) -> tuple[list[tuple[float, int]], int, int, int, int]:
+    """Run an independent UCT search from the node given by the path.
+
+    Return the (reward, visits) of each child of the node (in the order of `all_successors`),
+    and the number of simulations, terminal states evaluated, positive evaluations and nodes expanded.
+    """
+    random.seed(seed)
+    node = _get_node(path)
+    algorithm = _worker_algorithm
+    algorithm.initialize()
+    algorithm.get_decision_stopping_condition().initialize()
+    while not algorithm.get_decision_stopping_condition().reached():
+        algorithm.do_rollout(node)
+        algorithm.get_decision_stopping_condition().update()
+    children_stats = [(algorithm.Q[c], algorithm.N[c]) for c in algorithm.tree.get(node, [])]
+    return (children_stats,
+            algorithm.get_total_nof_simulations(),
+            algorithm.get_nof_terminal_states_evaluated(),
+            algorithm.get_total_nof_positive_evaluations(),
+            algorithm.get_tree_size())
+
+
+class RootParallelUCTMCTS(UCTMCTS):
+    """
+    Root parallelization of the UCT MCTS.
+    For each decision, several independent UCT searches are run from the same root in a pool of worker processes,
+    each one with its own seed. The statistics of the root's children are merged before choosing the best child.
+    Each worker runs the whole decision stopping condition, so a decision runs `nof_workers` times its simulations.
+    The workers are forked from the main process, so the problem (e.g., the FM with its SAT solver and BDD)
+    is loaded only once and inherited by each worker, instead of being sent for each decision.
+    Ref.:
+        Chaslot[2008] - Parallel Monte-Carlo Tree Search.
+    """
+
+    @staticmethod
+    def get_name() -> str:
+        return 'Root Parallel UCT MCTS'
+
+    def __init__(self,
+                 stopping_condition: StoppingCondition,
+                 selection_criteria: SelectionCriteria,
+                 decision_stopping_condition: StoppingCondition,
+                 exploration_weight: float = 0.5,
+                 nof_workers: int = None):
+        super().__init__(stopping_condition, selection_criteria, decision_stopping_condition, exploration_weight)
+        self.nof_workers = nof_workers if nof_workers else os.cpu_count()
+        self._pool = None
+        self._path: tuple[int, ...] = ()  # indexes of the successors chosen from the initial state
+
+    def initialize(self) -> None:
+        super().initialize()
+        self.nof_terminal_states_evaluated: int = 0
+        self.nof_expanded_nodes: int = 0
+
+    def __str__(self) -> str:
+        return f"Root Parallel UCT Algorithm ({str(self.stopping_condition)}, ew={self.exploration_weight}, workers={self.nof_workers})"
+
+    def choose(self, node: Node) -> Node:
+        children = [Node(s, node, a) for s, a in node.state.all_successors()]
+        self.tree[node] = children
+        if len(children) == 1:
+            self._path += (0,)
+            return children[0]
+
+        seeds = [random.randrange(2**32) for _ in range(self.nof_workers)]
+        results = self._pool.starmap(_search, [(self._path, seed) for seed in seeds])
+        for children_stats, simulations, evaluations, positive_evaluations, expanded_nodes in results:
+            for child, (reward, visits) in zip(children, children_stats):
+                self.Q[child] += reward
+                self.N[child] += visits
+                self.Q[node] += reward
+                self.N[node] += visits
+            self.total_nof_simulations += simulations
+            self.nof_terminal_states_evaluated += evaluations
+            self.total_nof_positive_evaluations += positive_evaluations
+            self.nof_expanded_nodes += expanded_nodes
+
+        best = self.get_selection_criteria().best_child(node, children, self.Q, self.N)
+        self._path += (children.index(best),)
+        return best
+
+    @AlgorithmStats('RootParallelUCTMCTS', logger=None)
+    def run(self, problem: Problem) -> Solution:
+        self._path = ()
+        worker = UCTMCTS(stopping_condition=NoneStoppingCondition(),
+                         selection_criteria=self.selection_criteria,
+                         decision_stopping_condition=self.decision_stopping_condition,
+                         exploration_weight=self.exploration_weight)
+        # Forked workers inherit the problem and the worker algorithm without pickling them.
+        problem.get_initial_state().before_fork()
+        context = multiprocessing.get_context('fork')
+        with context.Pool(self.nof_workers, initializer=_initialize_worker, initargs=(problem, worker)) as pool:
+            self._pool = pool
+            solution = MonteCarloTreeSearch.run(self, problem)
+        self._pool = None
+        return solution
+
+    def get_nof_terminal_states_evaluated(self) -> int:
+        return self.nof_terminal_states_evaluated
+
+    def get_tree_size(self) -> int:
+        """Number of nodes expanded in the search trees of the workers (summed over the workers and decisions),
+        which are discarded after each decision (`tree` only contains the decisions made)."""
+        return self.nof_expanded_nodes
@@ -0,0 +1,83 @@
+import os
+import math
+import random
+import multiprocessing
+from typing import Any
+
+from montecarlo_framework.models import State
+
+
+# State of each worker process (set once by the pool initializer).
+_worker_state: State = None  # any state of the problem, used to reconstruct states from their payloads
+_worker_terminal_states_evaluated: dict[State, float] = {}  # terminal states -> reward
+
+
+def _initialize_worker(state: State):
+    global _worker_state, _worker_terminal_states_evaluated
+    _worker_state = state
+    _worker_terminal_states_evaluated = {}
+
+
+def _simulate(seed: int, tasks: list[tuple[Any, Any]]) -> list[tuple[Any, float, bool]]:
+    """Run a simulation from each state payload.
+
+    Return, for each task, its key, the reward of the terminal state reached,
+    and whether the terminal state has been evaluated for the first time in this worker.
+    """
+    random.seed(seed)
+    results = []
+    for key, payload in tasks:
+        state = _worker_state.from_payload(payload)
+        terminal_state = state.get_random_terminal_state()
+        evaluated = terminal_state not in _worker_terminal_states_evaluated
+        if evaluated:
+            _worker_terminal_states_evaluated[terminal_state] = terminal_state.reward()
+        results.append((key, _worker_terminal_states_evaluated[terminal_state], evaluated))
+    return results
+
+
+class SimulationPool():
+    """Persistent pool of worker processes to run simulations (random rollouts) in parallel.
+
+    The workers are forked once from the main process, so they inherit the problem
+    (e.g., the FM with its SAT solver) from the given state instead of receiving it for each simulation.
+    States are sent to the workers as compact payloads (see `State.to_payload`)
+    and the simulations are distributed in one chunk per worker.
+    """
+
+    def __init__(self, state: State, nof_workers: int = None):
+        self.nof_workers = nof_workers if nof_workers else os.cpu_count()
+        state.before_fork()
+        context = multiprocessing.get_context('fork')
+        self._pool = context.Pool(self.nof_workers, initializer=_initialize_worker, initargs=(state,))
+
+    def simulate(self, tasks: list[tuple[Any, State]]) -> list[tuple[Any, float, bool]]:
+        """Run a simulation from the state of each (key, state) task.
+
+        Return a list with the (key, reward, evaluated) of each simulation,
+        where `evaluated` indicates that a terminal state has been evaluated for the first time in its worker.
+        """
+        payloads = {}
+        payload_tasks = []
+        for key, state in tasks:
+            if id(state) not in payloads:
+                payloads[id(state)] = state.to_payload()
+            payload_tasks.append((key, payloads[id(state)]))
+
+        chunksize = math.ceil(len(payload_tasks) / self.nof_workers)
+        chunks = [payload_tasks[i:i + chunksize] for i in range(0, len(payload_tasks), chunksize)]
+        seeds = [random.randrange(2**32) for _ in chunks]
+        results = self._pool.starmap(_simulate, zip(seeds, chunks))
+        return [result for chunk_results in results for result in chunk_results]
+
+    def close(self):
+        self._pool.close()
+        self._pool.join()
+
+    def __enter__(self) -> 'SimulationPool':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None:
+            self._pool.terminate()
+        self.close()
@@ -0,0 +1,137 @@
+import os
+import random
+import multiprocessing
+
+from montecarlo_framework.models import Problem, Node, Solution
+from montecarlo_framework.models.shared_array_search_tree import SharedArraySearchTree, SharedArraySearchTreeError
+from montecarlo_framework.algorithms import ArrayUCTMCTS
+from montecarlo_framework.algorithms.stopping_conditions import StoppingCondition
+from montecarlo_framework.algorithms.selection_criterias import SelectionCriteria
+
+from montecarlo_framework.utils.algorithm_stats import AlgorithmStats
+
+
+# Algorithm of each worker process (a forked copy of the main algorithm sharing its search tree).
+_worker_algorithm: 'TreeParallelUCTMCTS' = None
+
+
+def _initialize_worker(algorithm: 'TreeParallelUCTMCTS'):
+    global _worker_algorithm
+    _worker_algorithm = algorithm
+
+
+def _rollouts(root: int, seed: int) -> tuple[int, int, int]:
+    """Perform rollouts over the shared tree from the given node until the decision stopping condition is reached.
+
+    Return the number of simulations, new terminal states evaluated and positive evaluations.
+    """
+    random.seed(seed)
+    algorithm = _worker_algorithm
+    algorithm.root = root
+    algorithm.total_nof_simulations = 0
+    algorithm.total_nof_positive_evaluations = 0
+    nof_evaluated = len(algorithm.terminal_states_evaluated)
+    algorithm.get_decision_stopping_condition().initialize()
+    while not algorithm.get_decision_stopping_condition().reached():
+        algorithm.do_rollout(root)
+        algorithm.get_decision_stopping_condition().update()
+    return (algorithm.total_nof_simulations,
+            len(algorithm.terminal_states_evaluated) - nof_evaluated,
+            algorithm.total_nof_positive_evaluations)
+
+
+class TreeParallelUCTMCTS(ArrayUCTMCTS):
+    """
+    Tree parallelization of the UCT MCTS with virtual loss.
+    Several worker processes perform the select/expand/simulate/backpropagate steps concurrently
+    over a single search tree whose statistics live in shared memory (see SharedArraySearchTree).
+    While a worker descends the tree, it adds a virtual loss (visits without reward) to the nodes of its path,
+    so other workers are discouraged from following the same path until the reward is backpropagated.
+    Each worker runs the decision stopping condition, as in RootParallelUCTMCTS.
+    Ref.:
+        Chaslot[2008] - Parallel Monte-Carlo Tree Search.
+    """
+
+    @staticmethod
+    def get_name() -> str:
+        return 'Tree Parallel UCT MCTS'
+
+    def __init__(self,
+                 stopping_condition: StoppingCondition,
+                 selection_criteria: SelectionCriteria,
+                 decision_stopping_condition: StoppingCondition,
+                 exploration_weight: float = 0.5,
+                 nof_workers: int = None,
+                 virtual_loss: int = 1,
+                 capacity: int = SharedArraySearchTree.DEFAULT_CAPACITY):
+        super().__init__(stopping_condition, selection_criteria, decision_stopping_condition, exploration_weight)
+        self.nof_workers = nof_workers if nof_workers else os.cpu_count()
+        self.virtual_loss = virtual_loss
+        self.capacity = capacity
+        self._pool = None
+
+    def initialize(self) -> None:
+        super().initialize()
+        self.nof_terminal_states_evaluated: int = 0
+
+    def __str__(self) -> str:
+        return f"Tree Parallel UCT Algorithm ({str(self.stopping_condition)}, ew={self.exploration_weight}, workers={self.nof_workers}, vl={self.virtual_loss})"
+
+    def choose(self, node: Node) -> Node:
+        seeds = [random.randrange(2**32) for _ in range(self.nof_workers)]
+        results = self._pool.starmap(_rollouts, [(self.root, seed) for seed in seeds])
+        for simulations, evaluations, positive_evaluations in results:
+            self.total_nof_simulations += simulations
+            self.nof_terminal_states_evaluated += evaluations
+            self.total_nof_positive_evaluations += positive_evaluations
+        self.root = self.get_selection_criteria().best_child(self.root, self.tree.children(self.root), self.Q, self.N)
+        return self.tree.node(self.root)
+
+    @AlgorithmStats('TreeParallelUCTMCTS', logger=None)
+    def run(self, problem: Problem) -> Solution:
+        self.initialize()
+        node = Node(problem.get_initial_state())
+        # The shared tree (and the shared caches of the problem) must be created before forking the workers.
+        node.state.before_fork()
+        context = multiprocessing.get_context('fork')
+        self.tree = SharedArraySearchTree(node, self.capacity, context)
+        self.root = 0
+        with context.Pool(self.nof_workers, initializer=_initialize_worker, initargs=(self,)) as pool:
+            self._pool = pool
+            self.get_stopping_condition().initialize()
+            while not node.state.is_terminal() and not self.get_stopping_condition().reached():
+                node = self.choose(node)
+                self.get_stopping_condition().update()
+        self._pool = None
+        return Solution(node) if node is not None else None
+
+    def select(self, node_id: int) -> int:
+        """Descend the tree as in ArrayUCTMCTS, adding a virtual loss to each node of the path."""
+        with self.tree.lock:
+            self.tree.visits[node_id] += self.virtual_loss
+            while self.tree.nof_children[node_id] > 0:
+                child = self.tree.unvisited_child(node_id)
+                node_id = child if child >= 0 else self.best_child(node_id)
+                self.tree.visits[node_id] += self.virtual_loss
+                if child >= 0:  # the node was not fully explored
+                    break
+        return node_id
+
+    def expand(self, node_id: int):
+        try:
+            super().expand(node_id)
+        except SharedArraySearchTreeError:
+            pass  # the tree is full: the node remains a leaf
+
+    def backpropagate(self, node_id: int, reward: float, visits: int = 1):
+        """Send the reward back up to the root of the current decision, replacing the virtual loss by the real visits."""
+        with self.tree.lock:
+            while True:
+                self.tree.visits[node_id] += visits - self.virtual_loss
+                self.tree.rewards[node_id] += reward
+                if node_id == self.root:
+                    break
+                node_id = self.tree.parent[node_id]
+
+    def get_nof_terminal_states_evaluated(self) -> int:
+        return self.nof_terminal_states_evaluated
@@ -26,8 +26,11 @@ class UCTMCTS(MonteCarloTreeSearch):
                  stopping_condition: StoppingCondition, 
                  selection_criteria: SelectionCriteria, 
                  decision_stopping_condition: StoppingCondition, 
-                 exploration_weight: float = 0.5):
-        super().__init__(stopping_condition, selection_criteria, decision_stopping_condition)
+                 exploration_weight: float = 0.5,
+                 subtree_reuse: bool = False,
+                 leaf_simulations: int = 1,
+                 nof_workers: int = None):
+        super().__init__(stopping_condition, selection_criteria, decision_stopping_condition, subtree_reuse, leaf_simulations, nof_workers)
         self.exploration_weight = exploration_weight
 
     def best_child(self, node: Node) -> Node:
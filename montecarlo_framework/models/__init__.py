@@ -1,4 +1,4 @@
 from .problem import State, Action
-from .search_space import SearchTree, Node, NodeValue, Solution, Problem
+from .search_space import SearchTree, Node, NodeValue, Solution, SolutionRegistry, Problem
 
-__all__ = [State, Action, Node, NodeValue, SearchTree, Solution, Problem]
+__all__ = [State, Action, Node, NodeValue, SearchTree, Solution, SolutionRegistry, Problem]
@@ -0,0 +1,130 @@
+import numpy as np
+
+from montecarlo_framework.models.search_space import Node
+
+
+class ArraySearchTree():
+    """Search tree stored in contiguous arrays indexed by integer node ids.
+
+    Each node of the tree is identified by its position (id) in the buffers:
+    - visits: total visit count of the node.
+    - rewards: total (accumulated) reward of the node.
+    - parent: id of the parent node (-1 for the root).
+    - first_child: id of the first child of the node (-1 if the node has not been expanded).
+    - nof_children: number of children of the node.
+    The children of a node are always allocated together when the node is expanded,
+    so they occupy the contiguous slice [first_child, first_child + nof_children).
+    The search nodes (states) are kept in a list indexed by the same ids.
+    """
+
+    INITIAL_CAPACITY = 1024
+
+    def __init__(self, capacity: int = INITIAL_CAPACITY):
+        self.visits = np.zeros(capacity, dtype=np.int64)
+        self.rewards = np.zeros(capacity, dtype=np.float64)
+        self.parent = np.full(capacity, -1, dtype=np.int32)
+        self.first_child = np.full(capacity, -1, dtype=np.int32)
+        self.nof_children = np.zeros(capacity, dtype=np.int32)
+        self.nodes: list[Node] = []
+        self.nof_expanded = 0
+
+    def capacity(self) -> int:
+        return len(self.visits)
+
+    def size(self) -> int:
+        """Number of nodes allocated in the tree."""
+        return len(self.nodes)
+
+    def __len__(self) -> int:
+        """Number of expanded nodes (i.e., nodes with their children in the tree)."""
+        return self.nof_expanded
+
+    def _reserve(self, n: int):
+        """Grow the buffers (doubling its capacity) to store at least `n` new nodes."""
+        required = len(self.nodes) + n
+        if required <= self.capacity():
+            return
+        new_capacity = max(required, 2 * self.capacity())
+        extra = new_capacity - self.capacity()
+        self.visits = np.concatenate((self.visits, np.zeros(extra, dtype=np.int64)))
+        self.rewards = np.concatenate((self.rewards, np.zeros(extra, dtype=np.float64)))
+        self.parent = np.concatenate((self.parent, np.full(extra, -1, dtype=np.int32)))
+        self.first_child = np.concatenate((self.first_child, np.full(extra, -1, dtype=np.int32)))
+        self.nof_children = np.concatenate((self.nof_children, np.zeros(extra, dtype=np.int32)))
+
+    def add_root(self, node: Node) -> int:
+        """Add the root node to an empty tree and return its id."""
+        self._reserve(1)
+        self.nodes.append(node)
+        return 0
+
+    def add_children(self, node_id: int, children: list[Node]) -> range:
+        """Expand the node with the given children and return the range of their ids."""
+        self._reserve(len(children))
+        first = len(self.nodes)
+        last = first + len(children)
+        self.nodes.extend(children)
+        self.parent[first:last] = node_id
+        self.first_child[node_id] = first
+        self.nof_children[node_id] = len(children)
+        self.nof_expanded += 1
+        return range(first, last)
+
+    def node(self, node_id: int) -> Node:
+        return self.nodes[node_id]
+
+    def is_expanded(self, node_id: int) -> bool:
+        return self.first_child[node_id] >= 0
+
+    def children(self, node_id: int) -> range:
+        """Ids of the children of the node (empty if it has not been expanded)."""
+        first = self.first_child[node_id]
+        if first < 0:
+            return range(0)
+        return range(first, first + self.nof_children[node_id])
+
+    def children_slice(self, node_id: int) -> slice:
+        first = self.first_child[node_id]
+        return slice(first, first + self.nof_children[node_id])
+
+    def unvisited_child(self, node_id: int) -> int:
+        """Return the id of the first child never visited, or -1 if all children were visited."""
+        s = self.children_slice(node_id)
+        unvisited = np.flatnonzero(self.visits[s] == 0)
+        return s.start + int(unvisited[0]) if len(unvisited) > 0 else -1
+
+    def uct_child(self, node_id: int, exploration_weight: float) -> int:
+        """Return the child of the node maximizing the UCT value, computed over the child slice."""
+        s = self.children_slice(node_id)
+        visits = self.visits[s]
+        uct = self.rewards[s] / visits + exploration_weight * np.sqrt(np.log(self.visits[node_id]) / visits)
+        return s.start + int(np.argmax(uct))
+
+    def subtree(self, node_id: int) -> 'ArraySearchTree':
+        """Return a new tree with the subtree rooted at the given node (the new root has id 0).
+
+        Nodes are copied in breadth-first order, so children remain contiguous in the new buffers.
+        """
+        tree = ArraySearchTree(max(ArraySearchTree.INITIAL_CAPACITY, self.size() - node_id))
+        tree.add_root(self.nodes[node_id])
+        tree.visits[0] = self.visits[node_id]
+        tree.rewards[0] = self.rewards[node_id]
+        old_ids = [node_id]
+        i = 0
+        while i < len(old_ids):
+            old_id = old_ids[i]
+            if self.is_expanded(old_id):
+                s = self.children_slice(old_id)
+                children = tree.add_children(i, self.nodes[s])
+                tree.visits[children.start:children.stop] = self.visits[s]
+                tree.rewards[children.start:children.stop] = self.rewards[s]
+                old_ids.extend(range(s.start, s.stop))
+            i += 1
+        return tree
+
+    def backpropagate(self, node_id: int, reward: float, visits: int = 1):
+        """Add the reward and visits to the node and all its ancestors."""
+        while node_id >= 0:
+            self.visits[node_id] += visits
+            self.rewards[node_id] += reward
+            node_id = self.parent[node_id]
@@ -1,3 +1,11 @@
-from .fm_configuration import FM, FMConfiguration
+from .sat_cache import SATCache
+from .feature_tree_index import FeatureTreeIndex
+from .fm_analysis import FMAnalysis
+from .cnf_evaluator import CNFEvaluator
+from .rollout_session import RolloutSession
+from .product_enumerator import ProductEnumerator
+from .fm_configuration import FM, FMConfiguration, FMError
+from .featureide_streaming_reader import StreamingFeatureIDEReader, StreamingFeatureIDEReaderError
+from .fm_cache import FMCache
 
-__all__ = [FMConfiguration, FM]
\ No newline at end of file
+__all__ = [FMConfiguration, FM, SATCache, FeatureTreeIndex, FMAnalysis, CNFEvaluator, RolloutSession, ProductEnumerator, FMError, FMCache, StreamingFeatureIDEReader, StreamingFeatureIDEReaderError]
\ No newline at end of file
@@ -0,0 +1,94 @@
+import random
+from typing import Any
+
+
+class BDDSampler():
+    """Uniform random sampling of the configurations of a BDD.
+
+    Each node of the BDD is annotated once (and lazily) with its model count, i.e., the number of
+    satisfying assignments of the variables from its level to the bottom of the BDD.
+    A sample is drawn by a single top-down walk from the root, choosing each child with probability
+    proportional to its (weighted) count, so each sample costs O(#vars) without re-counting.
+    Samples that complete a partial assignment walk the BDD restricted to the assignment,
+    whose new nodes are annotated on first use and reused by later samples.
+    """
+
+    def __init__(self, bdd_model: Any) -> None:
+        self.bdd = bdd_model.bdd
+        self.root = bdd_model.root
+        self.nof_variables = len(self.bdd.vars)
+        self._variables = [self.bdd.var_at_level(level) for level in range(self.nof_variables)]
+        self._counts = {self.bdd.false: 0, self.bdd.true: 1}  # node -> model count from its level
+        self._children = {}  # node -> (level, low child, high child)
+
+    def _level(self, node: Any) -> int:
+        if node == self.bdd.true or node == self.bdd.false:
+            return self.nof_variables
+        return self._children[node][0]
+
+    def _annotate(self, root: Any) -> None:
+        """Compute the model count of all the nodes reachable from the root that are not annotated yet."""
+        stack = [root]
+        while stack:
+            node = stack[-1]
+            if node in self._counts:
+                stack.pop()
+                continue
+            if node not in self._children:
+                variable = node.var
+                low = self.bdd.let({variable: False}, node)
+                high = self.bdd.let({variable: True}, node)
+                self._children[node] = (self.bdd.level_of_var(variable), low, high)
+            level, low, high = self._children[node]
+            pending = [child for child in (low, high) if child not in self._counts]
+            if pending:
+                stack.extend(pending)
+            else:
+                stack.pop()
+                self._counts[node] = (self._counts[low] << (self._level(low) - level - 1)) + \
+                                     (self._counts[high] << (self._level(high) - level - 1))
+
+    def count(self, assignment: dict[str, bool] = None) -> int:
+        """Number of configurations (satisfying assignments of all the variables) that complete the assignment."""
+        node = self._restrict(assignment)
+        # The count of the node considers all the variables from its level, and the variables above it are free,
+        # but the assigned variables (which do not appear in the restricted BDD) have a single value.
+        return (self._counts[node] << self._level(node)) >> len(assignment or {})
+
+    def _restrict(self, assignment: dict[str, bool]) -> Any:
+        node = self.root if not assignment else self.bdd.let(assignment, self.root)
+        self._annotate(node)
+        return node
+
+    def sample(self, assignment: dict[str, bool] = None, k: int = 1) -> list[list[str]]:
+        """Return `k` configurations drawn uniformly at random among those that complete the (partial) assignment.
+
+        Each configuration is given as the list of its selected variables (features).
+        """
+        node = self._restrict(assignment)
+        if self._counts[node] == 0:
+            return []
+        fixed_mask = 0  # levels of the variables fixed by the assignment
+        fixed_values = 0
+        for variable, value in (assignment or {}).items():
+            level = self.bdd.level_of_var(variable)
+            fixed_mask |= 1 << level
+            fixed_values |= int(value) << level
+        samples = []
+        for _ in range(k):
+            # Variables skipped by the walk (not tested in the path) are free: random values
+            values = random.getrandbits(self.nof_variables) if self.nof_variables else 0
+            current = node
+            while current != self.bdd.true:
+                level, low, high = self._children[current]
+                low_count = self._counts[low] << (self._level(low) - level - 1)
+                high_count = self._counts[high] << (self._level(high) - level - 1)
+                if random.randrange(low_count + high_count) < high_count:
+                    values |= 1 << level
+                    current = high
+                else:
+                    values &= ~(1 << level)
+                    current = low
+            values = (values & ~fixed_mask) | fixed_values
+            samples.append([self._variables[level] for level in range(self.nof_variables) if (values >> level) & 1])
+        return samples
@@ -0,0 +1,60 @@
+import numpy as np
+
+from montecarlo_framework.models.feature_model.feature_tree_index import FeatureTreeIndex
+
+
+class CNFEvaluator():
+    """Evaluation of the clauses of a SAT model for complete configurations, without calling the solver.
+
+    A complete configuration assigns all the variables, so it is valid iff it satisfies every clause.
+    Each literal is stored as a position in the vector of values of the literals of a configuration,
+    [False, selected features, unselected features] (by feature index), so a clause is satisfied iff any of its
+    positions is True. The clauses are grouped in blocks of clauses with similar length (up to a power of two),
+    each one padded with the position 0 (always False) into a matrix stored by columns (the i-th literal of all
+    the clauses of the block are contiguous), and each block is evaluated with NumPy for one or for a whole batch
+    of configurations (given as bitmasks of their selected features).
+    """
+
+    MAX_BATCH_ELEMENTS = 1 << 22  # maximum number of words of literals gathered at once in batches
+
+    def __init__(self, clauses: list[list[int]], index: FeatureTreeIndex) -> None:
+        self.nof_features = len(index)
+        self.nof_bytes = (self.nof_features + 7) // 8
+        blocks: dict[int, list[list[int]]] = {}
+        for clause in clauses:
+            positions = [1 + index.get_index_by_variable(l) + (self.nof_features if l < 0 else 0) for l in clause]
+            width = 1 << max(len(positions) - 1, 0).bit_length()
+            blocks.setdefault(width, []).append(positions + [0] * (width - len(positions)))
+        # Shorter clauses first, since they are more likely to be falsified
+        self._blocks = [np.array(blocks[width], dtype=np.intp).T.copy() for width in sorted(blocks)]
+
+    def _get_selected(self, bitmasks: list[int]) -> np.ndarray:
+        """Boolean matrix of the selected features (by index) of each configuration."""
+        data = b''.join(bitmask.to_bytes(self.nof_bytes, 'little') for bitmask in bitmasks)
+        bits = np.frombuffer(data, dtype=np.uint8).reshape(len(bitmasks), self.nof_bytes)
+        return np.unpackbits(bits, axis=1, count=self.nof_features, bitorder='little').astype(bool)
+
+    def evaluate(self, bitmask: int) -> bool:
+        """Return True if the configuration satisfies all the clauses."""
+        selected = self._get_selected([bitmask])[0]
+        values = np.concatenate(([False], selected, ~selected))
+        return all(np.logical_or.reduce(values[block], axis=0).all() for block in self._blocks)
+
+    def evaluate_batch(self, bitmasks: list[int]) -> np.ndarray:
+        """Return a boolean array with the validity of each configuration.
+
+        The configurations are evaluated in parallel by bits: the values of each literal for 64 configurations
+        are packed in a word, so the clauses are evaluated with bitwise operations over the words.
+        """
+        nof_words = (len(bitmasks) + 63) // 64
+        selected = np.zeros((self.nof_features, nof_words * 64), dtype=bool)
+        selected[:, :len(bitmasks)] = self._get_selected(bitmasks).T
+        packed = np.packbits(selected, axis=1, bitorder='little').view(np.uint64)
+        values = np.concatenate((np.zeros((1, nof_words), dtype=np.uint64), packed, ~packed))
+        valid = np.full(nof_words, np.iinfo(np.uint64).max, dtype=np.uint64)
+        for block in self._blocks:
+            chunk = max(1, CNFEvaluator.MAX_BATCH_ELEMENTS // block.size)
+            for start in range(0, nof_words, chunk):
+                satisfied = np.bitwise_or.reduce(values[:, start:start + chunk][block], axis=0)
+                valid[start:start + chunk] &= np.bitwise_and.reduce(satisfied, axis=0)
+        return np.unpackbits(valid.view(np.uint8), count=len(bitmasks), bitorder='little').astype(bool)
@@ -0,0 +1,120 @@
+from famapy.metamodels.fm_metamodel.models import FeatureModel, Feature, Relation
+
+from montecarlo_framework.models.feature_model.fm_utils import RelationType
+
+
+NO_RELATION = 0  # kind of relation of the root feature
+MANDATORY = RelationType.MANDATORY.value
+OPTIONAL = RelationType.OPTIONAL.value
+OR = RelationType.OR.value
+ALTERNATIVE = RelationType.ALTERNATIVE.value
+GROUP_CARDINALITY = RelationType.GROUP_CARDINALITY.value
+
+
+def get_relation_kind(relation: Relation) -> int:
+    if relation.is_mandatory():
+        return MANDATORY
+    if relation.is_optional():
+        return OPTIONAL
+    if relation.is_or():
+        return OR
+    if relation.is_alternative():
+        return ALTERNATIVE
+    return GROUP_CARDINALITY
+
+
+class FeatureTreeIndex():
+    """Immutable integer-indexed representation of the tree of a feature model, built once at load time.
+
+    Features are indexed in breadth-first order from the root (index 0), so the parent of a feature has
+    a lower index, and the children of a feature (and of each of its relations, named groups) have consecutive indexes.
+    The tree is stored in flat arrays (tuples) indexed by feature or group:
+     - features: index -> feature; names: index -> name; variables: index -> SAT variable.
+     - parent: index of the parent feature (-1 for the root).
+     - relation_kind: kind of the relation with the parent (see `RelationType`, NO_RELATION for the root).
+     - group: id of the relation (group) with the parent (-1 for the root).
+     - depth: depth in the tree (0 for the root).
+     - children_start, children_end: range of indexes of the children of the feature.
+     - groups_start, groups_end: range of ids of the relations (groups) of the feature.
+     - group_kind, group_parent: kind of relation and parent of each group.
+     - group_start, group_end: range of indexes of the children of each group.
+     - group_masks: bitmask of the children of each group.
+    """
+
+    ROOT = 0
+
+    def __init__(self, fm: FeatureModel, variables: dict[str, int]) -> None:
+        features = [fm.root]
+        parent, relation_kind, group, depth = [-1], [NO_RELATION], [-1], [0]
+        children_start, children_end, groups_start, groups_end = [], [], [], []
+        group_kind, group_parent, group_start, group_end = [], [], [], []
+        i = 0
+        while i < len(features):
+            children_start.append(len(features))
+            groups_start.append(len(group_kind))
+            for relation in features[i].get_relations():
+                kind = get_relation_kind(relation)
+                group_kind.append(kind)
+                group_parent.append(i)
+                group_start.append(len(features))
+                for child in relation.children:
+                    features.append(child)
+                    parent.append(i)
+                    relation_kind.append(kind)
+                    group.append(len(group_kind) - 1)
+                    depth.append(depth[i] + 1)
+                group_end.append(len(features))
+            children_end.append(len(features))
+            groups_end.append(len(group_kind))
+            i += 1
+
+        self.features: tuple[Feature, ...] = tuple(features)
+        self.names: tuple[str, ...] = tuple(f.name for f in features)
+        self.variables: tuple[int, ...] = tuple(variables[name] for name in self.names)
+        self.parent: tuple[int, ...] = tuple(parent)
+        self.relation_kind: tuple[int, ...] = tuple(relation_kind)
+        self.group: tuple[int, ...] = tuple(group)
+        self.depth: tuple[int, ...] = tuple(depth)
+        self.children_start: tuple[int, ...] = tuple(children_start)
+        self.children_end: tuple[int, ...] = tuple(children_end)
+        self.groups_start: tuple[int, ...] = tuple(groups_start)
+        self.groups_end: tuple[int, ...] = tuple(groups_end)
+        self.group_kind: tuple[int, ...] = tuple(group_kind)
+        self.group_parent: tuple[int, ...] = tuple(group_parent)
+        self.group_start: tuple[int, ...] = tuple(group_start)
+        self.group_end: tuple[int, ...] = tuple(group_end)
+        self.group_masks: tuple[int, ...] = tuple(((1 << e) - 1) ^ ((1 << s) - 1) for s, e in zip(group_start, group_end))
+        self._indexes_by_name = {name: i for i, name in enumerate(self.names)}
+        self._indexes_by_variable = {v: i for i, v in enumerate(self.variables)}
+
+    def __len__(self) -> int:
+        return len(self.features)
+
+    def get_index(self, feature: Feature) -> int:
+        return self._indexes_by_name[feature.name]
+
+    def get_index_by_name(self, name: str) -> int:
+        return self._indexes_by_name[name]
+
+    def get_index_by_variable(self, variable: int) -> int:
+        return self._indexes_by_variable[abs(variable)]
+
+    def get_ancestors(self, index: int) -> list[int]:
+        """Indexes of the ancestors of the feature, from its parent to the root."""
+        ancestors = []
+        index = self.parent[index]
+        while index >= 0:
+            ancestors.append(index)
+            index = self.parent[index]
+        return ancestors
+
+    def get_bitmask(self, names: list[str], ancestors: bool = False) -> int:
+        """Bitmask of the features with the given names (and of their ancestors, if required)."""
+        bitmask = 0
+        for name in names:
+            index = self._indexes_by_name[name]
+            bitmask |= 1 << index
+            if ancestors:
+                for ancestor in self.get_ancestors(index):
+                    bitmask |= 1 << ancestor
+        return bitmask
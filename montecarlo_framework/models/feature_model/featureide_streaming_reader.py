@@ -0,0 +1,196 @@
+import itertools
+from xml.etree.ElementTree import Element, iterparse
+
+from famapy.core.models.ast import AST, Node, ASTOperation
+from famapy.metamodels.fm_metamodel.models import FeatureModel, Feature, Relation, Constraint
+from famapy.metamodels.pysat_metamodel.models.pysat_model import PySATModel
+
+
+class StreamingFeatureIDEReaderError(Exception):
+    """A custom exception used to report errors in use of StreamingFeatureIDEReader class."""
+
+
+class StreamingFeatureIDEReader():
+    """Reader for FeatureIDE models (.xml) based on incremental parsing.
+
+    Unlike `FeatureIDEReader`, the document is never fully built in memory: each element is discarded as soon as
+    it has been read, so the peak memory is proportional to the feature model instead of to the document.
+    The feature tree and the SAT model are built in the same pass: the clauses of each relation are added when the
+    relation is read, and each cross-tree constraint is transformed into CNF (by distribution) when it is read,
+    with the same encoding of `FmToPysat`.
+    The cross-tree constraints are also kept in the feature model with the same AST of `FeatureIDEReader`
+    (except that all the operands of a disjunction or conjunction are kept, nested from the left).
+    """
+
+    # Main tags
+    TAG_STRUCT = 'struct'
+    TAG_CONSTRAINTS = 'constraints'
+    TAG_RULE = 'rule'
+
+    # Feature tags
+    TAG_AND = 'and'
+    TAG_OR = 'or'
+    TAG_ALT = 'alt'
+    TAG_FEATURE = 'feature'
+    FEATURE_TAGS = (TAG_AND, TAG_OR, TAG_ALT, TAG_FEATURE)
+
+    # Constraints tags
+    TAG_VAR = 'var'
+    TAG_NOT = 'not'
+    TAG_IMP = 'imp'
+    TAG_DISJ = 'disj'
+    TAG_CONJ = 'conj'
+    TAG_EQ = 'eq'
+    CONSTRAINT_TAGS = (TAG_VAR, TAG_NOT, TAG_IMP, TAG_DISJ, TAG_CONJ, TAG_EQ)
+
+    # Feature attributes
+    ATTRIB_NAME = 'name'
+    ATTRIB_ABSTRACT = 'abstract'
+    ATTRIB_MANDATORY = 'mandatory'
+
+    def __init__(self, path: str) -> None:
+        self._path = path
+
+    def transform(self) -> tuple[FeatureModel, PySATModel]:
+        """Return the feature model and its SAT model."""
+        self._sat_model = PySATModel()
+        constraints = []
+        root = None
+        section = None
+        elements: list[Element] = []
+        features: list[Feature] = []  # features of the open feature elements
+        groups: list[list[Feature]] = []  # children of the open feature elements
+        for event, element in iterparse(self._path, events=('start', 'end')):
+            if event == 'start':
+                if section == StreamingFeatureIDEReader.TAG_STRUCT and element.tag in StreamingFeatureIDEReader.FEATURE_TAGS:
+                    parent = features[-1] if features else None
+                    feature = self._read_feature(element, parent, elements[-1].tag)
+                    if parent is None:
+                        root = feature
+                    else:
+                        groups[-1].append(feature)
+                    features.append(feature)
+                    groups.append([])
+                elif len(elements) == 1:
+                    section = element.tag
+                elements.append(element)
+                continue
+
+            elements.pop()
+            release = len(elements) == 1  # sections of the document
+            if section == StreamingFeatureIDEReader.TAG_STRUCT and element.tag in StreamingFeatureIDEReader.FEATURE_TAGS:
+                self._add_group(features.pop(), element.tag, groups.pop())
+                release = True
+            elif section == StreamingFeatureIDEReader.TAG_CONSTRAINTS and element.tag == StreamingFeatureIDEReader.TAG_RULE:
+                rule = next((e for e in element if e.tag in StreamingFeatureIDEReader.CONSTRAINT_TAGS), None)
+                if rule is None:
+                    raise StreamingFeatureIDEReaderError(f'Empty constraint in {self._path}.')
+                self._sat_model.ctc_cnf.extend(list(clause) for clause in self._to_cnf(rule, True))
+                constraints.append(Constraint(str(len(constraints) + 1), AST(self._to_ast(rule))))
+                release = True
+            if len(elements) == 1:
+                section = None
+            if release and elements:
+                # Discard the element once read, so the document is never fully built in memory
+                element.clear()
+                elements[-1].remove(element)
+
+        if root is None:
+            raise StreamingFeatureIDEReaderError(f'No feature model found in {self._path}.')
+        return FeatureModel(root, constraints), self._sat_model
+
+    def _read_feature(self, element: Element, parent: Feature, parent_tag: str) -> Feature:
+        name = element.attrib[StreamingFeatureIDEReader.ATTRIB_NAME]
+        if name in self._sat_model.variables:
+            raise StreamingFeatureIDEReaderError(f'Duplicated feature "{name}" in {self._path}.')
+        is_abstract = element.attrib.get(StreamingFeatureIDEReader.ATTRIB_ABSTRACT) == 'true'
+        feature = Feature(name=name, relations=[], parent=parent, is_abstract=is_abstract)
+        variable = len(self._sat_model.variables) + 1
+        self._sat_model.variables[name] = variable
+        self._sat_model.features[variable] = name
+        if parent is None:
+            self._sat_model.r_cnf.append([variable])
+        elif parent_tag == StreamingFeatureIDEReader.TAG_AND:
+            parent_variable = self._sat_model.variables[parent.name]
+            if element.attrib.get(StreamingFeatureIDEReader.ATTRIB_MANDATORY) == 'true':
+                parent.add_relation(Relation(parent=parent, children=[feature], card_min=1, card_max=1))
+                self._sat_model.r_cnf.append([-parent_variable, variable])
+            else:
+                parent.add_relation(Relation(parent=parent, children=[feature], card_min=0, card_max=1))
+            self._sat_model.r_cnf.append([-variable, parent_variable])
+        return feature
+
+    def _add_group(self, parent: Feature, tag: str, children: list[Feature]) -> None:
+        """Add the relation of the children of an or-group or an alternative-group with its clauses."""
+        if tag not in (StreamingFeatureIDEReader.TAG_OR, StreamingFeatureIDEReader.TAG_ALT) or not children:
+            return
+        card_max = 1 if tag == StreamingFeatureIDEReader.TAG_ALT else len(children)
+        parent.add_relation(Relation(parent=parent, children=children, card_min=1, card_max=card_max))
+        parent_variable = self._sat_model.variables[parent.name]
+        variables = [self._sat_model.variables[child.name] for child in children]
+        self._sat_model.r_cnf.append([-parent_variable] + variables)
+        for variable in variables:
+            self._sat_model.r_cnf.append([-variable, parent_variable])
+        if tag == StreamingFeatureIDEReader.TAG_ALT:
+            for variable1, variable2 in itertools.combinations(variables, 2):
+                self._sat_model.r_cnf.append([-variable1, -variable2])
+
+    def _to_cnf(self, element: Element, positive: bool) -> list[tuple[int, ...]]:
+        """Clauses of the formula of the element (or of its negation if `positive` is False)."""
+        tag = element.tag
+        if tag == StreamingFeatureIDEReader.TAG_VAR:
+            variable = self._sat_model.variables.get(element.text.strip() if element.text else None)
+            if variable is None:
+                raise StreamingFeatureIDEReaderError(f'Unknown feature "{element.text}" in a constraint of {self._path}.')
+            return [(variable if positive else -variable,)]
+        if tag == StreamingFeatureIDEReader.TAG_NOT:
+            return self._to_cnf(element[0], not positive)
+        if tag == StreamingFeatureIDEReader.TAG_IMP:
+            # a => b == ¬a ∨ b
+            operands = [self._to_cnf(element[0], not positive), self._to_cnf(element[1], positive)]
+            return self._conjunction(operands) if not positive else self._disjunction(operands)
+        if tag == StreamingFeatureIDEReader.TAG_EQ:
+            # a <=> b == (¬a ∨ b) ∧ (a ∨ ¬b), and ¬(a <=> b) == (a ∨ b) ∧ (¬a ∨ ¬b)
+            a, b = element[0], element[1]
+            return (self._disjunction([self._to_cnf(a, not positive), self._to_cnf(b, True)]) +
+                    self._disjunction([self._to_cnf(a, positive), self._to_cnf(b, False)]))
+        if tag in (StreamingFeatureIDEReader.TAG_DISJ, StreamingFeatureIDEReader.TAG_CONJ):
+            operands = [self._to_cnf(e, positive) for e in element if e.tag in StreamingFeatureIDEReader.CONSTRAINT_TAGS]
+            if (tag == StreamingFeatureIDEReader.TAG_CONJ) == positive:
+                return self._conjunction(operands)
+            return self._disjunction(operands)
+        raise StreamingFeatureIDEReaderError(f'Unsupported constraint element "{tag}" in {self._path}.')
+
+    def _to_ast(self, element: Element) -> Node:
+        """Root node of the AST of the formula of the element (checked by `_to_cnf`), as built by `FeatureIDEReader`."""
+        tag = element.tag
+        if tag == StreamingFeatureIDEReader.TAG_VAR:
+            return Node(element.text.strip())
+        if tag == StreamingFeatureIDEReader.TAG_NOT:
+            return Node(ASTOperation.NOT, self._to_ast(element[0]))
+        if tag == StreamingFeatureIDEReader.TAG_IMP:
+            return Node(ASTOperation.IMPLIES, self._to_ast(element[0]), self._to_ast(element[1]))
+        if tag == StreamingFeatureIDEReader.TAG_EQ:
+            # a <=> b == (a => b) ∧ (b => a), with the nodes of the operands built twice (as FeatureIDEReader does)
+            return Node(ASTOperation.AND,
+                        Node(ASTOperation.IMPLIES, self._to_ast(element[0]), self._to_ast(element[1])),
+                        Node(ASTOperation.IMPLIES, self._to_ast(element[1]), self._to_ast(element[0])))
+        operation = ASTOperation.OR if tag == StreamingFeatureIDEReader.TAG_DISJ else ASTOperation.AND
+        operands = [self._to_ast(e) for e in element if e.tag in StreamingFeatureIDEReader.CONSTRAINT_TAGS]
+        node = operands[0]
+        for operand in operands[1:]:
+            node = Node(operation, node, operand)
+        return node
+
+    @staticmethod
+    def _conjunction(operands: list[list[tuple[int, ...]]]) -> list[tuple[int, ...]]:
+        return [clause for clauses in operands for clause in clauses]
+
+    @staticmethod
+    def _disjunction(operands: list[list[tuple[int, ...]]]) -> list[tuple[int, ...]]:
+        """Distribute the disjunction over the clauses of the operands, dropping tautologies and repeated literals."""
+        result = [()]
+        for clauses in operands:
+            result = [tuple(dict.fromkeys(clause1 + clause2)) for clause1 in result for clause2 in clauses
+                      if not any(-literal in clause1 for literal in clause2)]
+        return result
@@ -0,0 +1,116 @@
+from pysat.solvers import Solver
+
+from montecarlo_framework.models.feature_model.feature_tree_index import FeatureTreeIndex, MANDATORY, OPTIONAL
+
+
+class FMAnalysis():
+    """Preprocessing of a feature model: core, dead and false-optional features, and atomic sets.
+
+    All the analyses are computed once from the backbone of the SAT model (the literals of the features
+    that are fixed in all valid configurations), using the incremental solver of the FM:
+     - Core features: selected in all valid configurations (positive literals of the backbone).
+     - Dead features: unselected in all valid configurations (negative literals of the backbone).
+     - False-optional features: optional features selected in all valid configurations in which their parent is selected.
+     - Atomic sets: maximal sets of features that are selected together in all valid configurations,
+       formed by joining each feature with its parent when it is mandatory or false-optional,
+       and all core features with the root.
+    The backbone literals are added to the solver as unit clauses, which does not change the valid
+    configurations but speeds up the later calls to the solver.
+
+    Features are referenced by their indexes in the feature tree index of the FM.
+    """
+
+    def __init__(self, index: FeatureTreeIndex, solver: Solver) -> None:
+        self.core: list[int] = []
+        self.dead: list[int] = []
+        self.false_optional: list[int] = []
+        self.valid = solver.solve()
+        if self.valid:
+            self._compute_backbone(index, solver)
+            self._compute_false_optional(index, solver)
+        self._compute_atomic_sets(index)
+
+    @classmethod
+    def from_results(cls,
+                     index: FeatureTreeIndex,
+                     solver: Solver,
+                     valid: bool,
+                     core: list[int],
+                     dead: list[int],
+                     false_optional: list[int]) -> 'FMAnalysis':
+        """Restore the analysis from its results (e.g., cached on disk) without calling the solver."""
+        analysis = cls.__new__(cls)
+        analysis.valid = valid
+        analysis.core = list(core)
+        analysis.dead = list(dead)
+        analysis.false_optional = list(false_optional)
+        for i in analysis.core:
+            solver.add_clause([index.variables[i]])
+        for i in analysis.dead:
+            solver.add_clause([-index.variables[i]])
+        analysis._compute_atomic_sets(index)
+        return analysis
+
+    def _compute_backbone(self, index: FeatureTreeIndex, solver: Solver) -> None:
+        model = solver.get_model()
+        candidates = [v if model[v - 1] > 0 else -v for v in index.variables]
+        backbone = set()
+        while candidates:
+            literal = candidates.pop()
+            if solver.solve(assumptions=[-literal]):
+                # The new model refutes all the candidates with a different value
+                model = solver.get_model()
+                candidates = [l for l in candidates if model[abs(l) - 1] == l]
+            else:
+                backbone.add(literal)
+                solver.add_clause([literal])
+        for i, variable in enumerate(index.variables):
+            if variable in backbone:
+                self.core.append(i)
+            elif -variable in backbone:
+                self.dead.append(i)
+
+    def _compute_false_optional(self, index: FeatureTreeIndex, solver: Solver) -> None:
+        dead = set(self.dead)
+        candidates = [i for i in range(len(index))
+                      if index.relation_kind[i] == OPTIONAL and i not in dead and index.parent[i] not in dead]
+        refuted = set()
+        for i in candidates:
+            if i in refuted:
+                continue
+            parent = index.parent[i]
+            if solver.solve(assumptions=[index.variables[parent], -index.variables[i]]):
+                # The new model refutes all the candidates unselected with their parent selected
+                model = solver.get_model()
+                refuted.update(c for c in candidates if model[index.variables[index.parent[c]] - 1] > 0 and model[index.variables[c] - 1] < 0)
+            else:
+                self.false_optional.append(i)
+
+    def _compute_atomic_sets(self, index: FeatureTreeIndex) -> None:
+        # Union-find over the feature indexes, the representative of each set is its lowest index (closest to the root).
+        representative = list(range(len(index)))
+
+        def find(i: int) -> int:
+            while representative[i] != i:
+                representative[i] = representative[representative[i]]
+                i = representative[i]
+            return i
+
+        def union(i: int, j: int) -> None:
+            i, j = find(i), find(j)
+            representative[max(i, j)] = min(i, j)
+
+        dead = set(self.dead)
+        for i in range(1, len(index)):
+            if i not in dead and index.relation_kind[i] == MANDATORY:
+                union(i, index.parent[i])
+        for i in self.false_optional:
+            union(i, index.parent[i])
+        for i in self.core:
+            union(i, FeatureTreeIndex.ROOT)
+
+        atomic_sets: dict[int, list[int]] = {}
+        for i in range(len(index)):
+            atomic_sets.setdefault(find(i), []).append(i)
+        self.atomic_sets: list[list[int]] = list(atomic_sets.values())
+        self.atomic_set_of: list[list[int]] = [atomic_sets[find(i)] for i in range(len(index))]
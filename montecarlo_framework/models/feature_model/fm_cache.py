@@ -0,0 +1,194 @@
+import os
+import json
+import shutil
+import hashlib
+import tempfile
+from typing import Union
+
+import numpy as np
+
+from famapy.core.models.ast import AST, Node, ASTOperation
+from famapy.metamodels.fm_metamodel.models import FeatureModel, Feature, Relation, Constraint
+from famapy.metamodels.pysat_metamodel.models.pysat_model import PySATModel
+from famapy.metamodels.bdd_metamodel.models import BDDModel
+
+from montecarlo_framework import __version__
+from montecarlo_framework.models.feature_model.fm_configuration import FM
+from montecarlo_framework.models.feature_model.featureide_streaming_reader import StreamingFeatureIDEReader
+
+
+class FMCache():
+    """On-disk cache of the compiled artifacts of the feature models.
+
+    Each entry is a directory named by a content hash of the FeatureIDE XML file and the version of the framework,
+    so a modified model (or framework) never reuses a stale entry. An entry stores:
+     - metadata.json: version, names of the features (in the order of the feature tree index), validity of the model
+       and number of clauses of the feature tree (the first clauses, followed by those of the cross-tree constraints).
+     - features.npy: SAT variable, parent, group (relation with the parent) and abstract flag of each feature of the tree index.
+     - groups.npy: parent, minimum and maximum cardinality of each group (relation).
+     - clauses.npy: literals of the CNF clauses, each clause terminated by 0 (as in DIMACS).
+     - constraints.json: name and AST of each cross-tree constraint, with the nodes as nested lists
+       [operation, left, right] and the names of the features as leaves.
+     - analysis.npy: flags of each feature (CORE, DEAD, FALSE_OPTIONAL), see `FMAnalysis`.
+     - bdd.json: dump of the BDD (optional).
+    The arrays are stored in the .npy format and memory-mapped when loaded.
+    On a miss, the model is read with `StreamingFeatureIDEReader`.
+    A warm load rebuilds the feature model (tree and cross-tree constraints) and the SAT model from the entry,
+    without parsing the XML file nor transforming the feature model, so it returns the same feature model
+    and clauses as the first (cold) load.
+    Entries are written to a temporary directory and renamed, so concurrent processes never read partial entries.
+    """
+
+    DEFAULT_DIR = '.fm_cache'
+    FORMAT = 3  # version of the format of the entries
+    CORE = 1
+    DEAD = 2
+    FALSE_OPTIONAL = 4
+
+    def __init__(self, cache_dir: str = DEFAULT_DIR) -> None:
+        self.cache_dir = cache_dir
+
+    @staticmethod
+    def get_key(filepath: str) -> str:
+        """Content hash of the feature model file, the version of the framework and the format of the entries."""
+        digest = hashlib.sha256()
+        with open(filepath, 'rb') as file:
+            for chunk in iter(lambda: file.read(1 << 20), b''):
+                digest.update(chunk)
+        digest.update(f'{__version__}/{FMCache.FORMAT}'.encode())
+        return digest.hexdigest()
+
+    def load(self, filepath: str, bdd: bool = False, **fm_options) -> FM:
+        """Return the helper of the feature model in the file, compiling and caching it on the first load.
+
+        The options are passed to `FM`.
+        If `bdd` is True, the BDD is also loaded from the cache, or built and cached if it is not cached yet.
+        """
+        entry = os.path.join(self.cache_dir, FMCache.get_key(filepath))
+        if os.path.isdir(entry):
+            fm = FMCache._load_entry(entry, **fm_options)
+        else:
+            feature_model, sat_model = StreamingFeatureIDEReader(filepath).transform()
+            fm = FM(feature_model, sat_model=sat_model, **fm_options)
+            self._store_entry(entry, fm)
+        if bdd and FM.BDD in fm.backends:
+            bdd_file = os.path.join(entry, 'bdd.json')
+            if os.path.exists(bdd_file):
+                fm.restore_bdd_model(FMCache._load_bdd(bdd_file, fm))
+            elif fm.bdd_model is not None:
+                FMCache._dump_bdd(bdd_file, fm.bdd_model)
+        return fm
+
+    def _store_entry(self, entry: str, fm: FM) -> None:
+        os.makedirs(self.cache_dir, exist_ok=True)
+        index = fm.index
+        analysis = fm.get_analysis()
+        cardinalities = [(relation.card_min, relation.card_max)
+                         for feature in index.features for relation in feature.get_relations()]
+        flags = np.zeros(len(index), dtype=np.int8)
+        flags[analysis.core] |= FMCache.CORE
+        flags[analysis.dead] |= FMCache.DEAD
+        flags[analysis.false_optional] |= FMCache.FALSE_OPTIONAL
+        clauses = [l for clause in fm.sat_model.get_all_clauses() for l in clause + [0]]
+        metadata = {'version': __version__, 'names': index.names, 'valid': analysis.valid,
+                    'nof_tree_clauses': len(fm.sat_model.r_cnf.clauses)}
+        constraints = [[ctc.name, FMCache._dump_node(ctc.ast.root)] for ctc in fm.fm_model.get_constraints()]
+
+        tmp_entry = tempfile.mkdtemp(dir=self.cache_dir)
+        try:
+            with open(os.path.join(tmp_entry, 'metadata.json'), 'w') as file:
+                json.dump(metadata, file)
+            with open(os.path.join(tmp_entry, 'constraints.json'), 'w') as file:
+                json.dump(constraints, file)
+            np.save(os.path.join(tmp_entry, 'features.npy'),
+                    np.array([index.variables, index.parent, index.group, [f.is_abstract for f in index.features]], dtype=np.int32).T)
+            np.save(os.path.join(tmp_entry, 'groups.npy'),
+                    np.array([(p, cmin, cmax) for p, (cmin, cmax) in zip(index.group_parent, cardinalities)], dtype=np.int32).reshape(-1, 3))
+            np.save(os.path.join(tmp_entry, 'clauses.npy'), np.array(clauses, dtype=np.int32))
+            np.save(os.path.join(tmp_entry, 'analysis.npy'), flags)
+            os.rename(tmp_entry, entry)
+        except OSError:
+            # Another process has stored the entry in the meantime (or the cache is not writable)
+            shutil.rmtree(tmp_entry, ignore_errors=True)
+
+    @staticmethod
+    def _load_entry(entry: str, **fm_options) -> FM:
+        with open(os.path.join(entry, 'metadata.json')) as file:
+            metadata = json.load(file)
+        with open(os.path.join(entry, 'constraints.json')) as file:
+            constraints = [Constraint(name, AST(FMCache._load_node(node))) for name, node in json.load(file)]
+        names = metadata['names']
+        features = np.load(os.path.join(entry, 'features.npy'), mmap_mode='r')
+        groups = np.load(os.path.join(entry, 'groups.npy'), mmap_mode='r')
+        clauses = np.load(os.path.join(entry, 'clauses.npy'), mmap_mode='r')
+        flags = np.load(os.path.join(entry, 'analysis.npy'), mmap_mode='r')
+
+        variables, parents, feature_groups = features[:, 0].tolist(), features[:, 1].tolist(), features[:, 2].tolist()
+        abstract = features[:, 3].astype(bool).tolist()
+        feature_model = FMCache._build_feature_model(names, parents, feature_groups, abstract, groups.tolist(), constraints)
+        sat_model = PySATModel()
+        sat_model.variables = dict(zip(names, variables))
+        sat_model.features = dict(zip(variables, names))
+        literals = clauses.tolist()
+        start = 0
+        for i, end in enumerate(np.flatnonzero(clauses == 0).tolist()):
+            cnf = sat_model.r_cnf if i < metadata['nof_tree_clauses'] else sat_model.ctc_cnf
+            cnf.append(literals[start:end])
+            start = end + 1
+
+        fm = FM(feature_model, sat_model=sat_model, **fm_options)
+        fm.restore_analysis(metadata['valid'],
+                            np.flatnonzero(flags & FMCache.CORE).tolist(),
+                            np.flatnonzero(flags & FMCache.DEAD).tolist(),
+                            np.flatnonzero(flags & FMCache.FALSE_OPTIONAL).tolist())
+        return fm
+
+    @staticmethod
+    def _build_feature_model(names: list[str],
+                             parents: list[int],
+                             feature_groups: list[int],
+                             abstract: list[bool],
+                             groups: list[list[int]],
+                             constraints: list[Constraint]) -> FeatureModel:
+        """Rebuild the tree of the feature model from the feature tree index."""
+        features = []
+        for name, parent, is_abstract in zip(names, parents, abstract):
+            features.append(Feature(name, [], parent=features[parent] if parent >= 0 else None, is_abstract=is_abstract))
+        relations = []
+        for parent, card_min, card_max in groups:
+            relation = Relation(parent=features[parent], children=[], card_min=card_min, card_max=card_max)
+            features[parent].add_relation(relation)
+            relations.append(relation)
+        for feature, group in zip(features[1:], feature_groups[1:]):
+            relations[group].add_child(feature)
+        return FeatureModel(features[0], constraints)
+
+    @staticmethod
+    def _dump_node(node: Node) -> Union[str, list]:
+        if not node.is_op():
+            return node.data
+        return [node.data.value] + [FMCache._dump_node(child) for child in (node.left, node.right) if child is not None]
+
+    @staticmethod
+    def _load_node(node: Union[str, list]) -> Node:
+        if isinstance(node, str):
+            return Node(node)
+        return Node(ASTOperation(node[0]), *[FMCache._load_node(child) for child in node[1:]])
+
+    @staticmethod
+    def _dump_bdd(bdd_file: str, bdd_model: BDDModel) -> None:
+        tmp_file = f'{bdd_file}.{os.getpid()}.tmp'
+        try:
+            bdd_model.bdd.dump(tmp_file, roots=[bdd_model.root], filetype='json')
+            os.replace(tmp_file, bdd_file)
+        except Exception:
+            print(f'The BDD model cannot be cached.')
+            if os.path.exists(tmp_file):
+                os.remove(tmp_file)
+
+    @staticmethod
+    def _load_bdd(bdd_file: str, fm: FM) -> BDDModel:
+        bdd_model = BDDModel()
+        bdd_model.root = bdd_model.bdd.load(bdd_file)[0]
+        bdd_model.variables = [fm.sat_model.features[v] for v in sorted(fm.sat_model.features)]
+        return bdd_model
@@ -1,6 +1,10 @@
 import copy
 import random
-from typing import Optional 
+import itertools
+import threading
+from typing import Callable, Iterator, Optional 
+
+import numpy as np
 
 from pysat.solvers import Glucose3
 
@@ -8,84 +12,433 @@ from famapy.core.models import Configuration
 from famapy.metamodels.fm_metamodel.models import FeatureModel, Feature
 from famapy.metamodels.pysat_metamodel.operations.glucose3_valid_configuration import Glucose3ValidConfiguration
 from famapy.metamodels.pysat_metamodel.operations.glucose3_valid_product import Glucose3ValidProduct
-from famapy.metamodels.pysat_metamodel.operations.glucose3_products import Glucose3Products
+from famapy.metamodels.pysat_metamodel.models.pysat_model import PySATModel
 from famapy.metamodels.pysat_metamodel.transformations.fm_to_pysat import FmToPysat
-from famapy.metamodels.bdd_metamodel.transformations.fm_to_bdd import FmToBDD
-from montecarlo_framework.models.feature_model import fm_utils
+from famapy.metamodels.bdd_metamodel.models import BDDModel
+from montecarlo_framework.models.feature_model.sat_cache import SATCache
+from montecarlo_framework.models.feature_model.feature_tree_index import FeatureTreeIndex, MANDATORY, OPTIONAL, OR, ALTERNATIVE
+from montecarlo_framework.models.feature_model.fm_analysis import FMAnalysis
+from montecarlo_framework.models.feature_model.bdd_sampler import BDDSampler
+from montecarlo_framework.models.feature_model.cnf_evaluator import CNFEvaluator
+from montecarlo_framework.models.feature_model.rollout_session import RolloutSession
+from montecarlo_framework.models.feature_model.product_enumerator import ProductEnumerator
+
+
+class FMError(Exception):
+    """A custom exception used to report errors in use of FM class."""
 
 
 class FM(FeatureModel):
     """Helper for feature model analysis."""
 
-    def __init__(self, fm: FeatureModel) -> None:
+    SAT = 'sat'
+    BDD = 'bdd'
+    BACKENDS = (SAT, BDD)
+
+    ZOBRIST_SEED = 0
+
+    def __init__(self,
+                 fm: FeatureModel,
+                 sat_cache: SATCache = None,
+                 atomic_sets: bool = False,
+                 backends: tuple[str, ...] = BACKENDS,
+                 bdd_background: bool = False,
+                 bdd_timeout: float = None,
+                 bdd_node_limit: int = None,
+                 sat_model: PySATModel = None) -> None:
+        """Create the helper for the feature model.
+
+        The SAT model is compiled from the feature model unless it is given (e.g., loaded from `FMCache`).
+
+        If `atomic_sets` is True, selecting a feature in a configuration selects its whole atomic set
+        (see `FMAnalysis`), so each atomic set is configured with a single decision.
+
+        The SAT backend is always built because configurations rely on it.
+        The BDD backend (if included in `backends`) is built lazily on first use of `bdd_model`,
+        or in a background thread from now if `bdd_background` is True.
+        The BDD is discarded (`bdd_model` is None) if it is not built within `bdd_timeout` seconds of waiting
+        for it, or if it has more than `bdd_node_limit` nodes.
+        """
+        unknown_backends = set(backends) - set(FM.BACKENDS)
+        if unknown_backends:
+            raise FMError(f'Unknown backends: {unknown_backends}. Available backends: {FM.BACKENDS}.')
         self.fm_model = fm
-        self.sat_model = FmToPysat(fm).transform()
-        try:
-            self.bdd_model = FmToBDD(fm).transform()
-        except:
-            print(f'The BDD model cannot be build for this feature model.')
-            self.bdd_model = None
+        self.backends = tuple(backends)
+        self.sat_model = FmToPysat(fm).transform() if sat_model is None else sat_model
+        self.bdd_timeout = bdd_timeout
+        self.bdd_node_limit = bdd_node_limit
+        self._bdd_model = None
+        self._bdd_thread = None
+        self._bdd_waited = False
+        if FM.BDD in self.backends and bdd_background:
+            self._start_bdd_construction()
         self._features_by_name = {f.name: f for f in self.fm_model.get_features()}
+        # Index of the feature tree (used by the bitmasks of the configurations)
+        self.index = FeatureTreeIndex(self.fm_model, self.sat_model.variables)
+        self.features = self.index.features
+        self.variables = self.index.variables
+        self.full_bitmask = (1 << len(self.features)) - 1
+        # Random 64-bit key of each feature (by index): the hash of a configuration is the XOR of the keys of its
+        # selected features (Zobrist hashing), so it is updated in O(1) when a feature is selected or deselected.
+        # The keys do not depend on the random module, so they are the same in every run and process.
+        self.zobrist_keys = np.random.default_rng(FM.ZOBRIST_SEED).integers(0, 1 << 64, size=len(self.features), dtype=np.uint64, endpoint=False)
+        self._zobrist_keys = self.zobrist_keys.tolist()
         self.solver = Glucose3()
         for clause in self.sat_model.get_all_clauses():
             self.solver.add_clause(clause)
+        # Results of the solver for partial configurations, indexed by the bitmask of their selected features
+        # (complete configurations are checked by evaluating the clauses, see `get_cnf_evaluator`).
+        self.sat_cache = SATCache() if sat_cache is None else sat_cache
+        self.collapse_atomic_sets = atomic_sets
+        self._analysis = None
+        self._bdd_sampler = None
+        self._cnf_evaluator = None
+        self._model_positions = None  # positions of the variables of the features (by index) in the models of the solver
+        self._rollout_session = None
+        self._rollout_bitmask = 0  # selected features assumed in the trail of the rollout session
+        self._completion_solver = None  # solver with random phases for the random completions
+
+    def _start_bdd_construction(self) -> None:
+        self._bdd_thread = threading.Thread(target=self._build_bdd, name='BDD construction', daemon=True)
+        self._bdd_thread.start()
+
+    def _build_bdd(self) -> None:
+        try:
+            bdd_model = self._compile_bdd()
+        except:
+            print(f'The BDD model cannot be build for this feature model.')
+            return
+        if self.bdd_node_limit is not None and len(bdd_model.bdd) > self.bdd_node_limit:
+            print(f'The BDD model exceeds the limit of {self.bdd_node_limit} nodes.')
+            return
+        self._bdd_model = bdd_model
+
+    def _compile_bdd(self) -> BDDModel:
+        """Build the BDD from the clauses of the SAT model (the same CNF encoding of `FmToBDD`)."""
+        names = self.sat_model.features
+        or_connective = f' {BDDModel.OR} '
+        cnf_formula = f' {BDDModel.AND} '.join(
+            '(' + or_connective.join(f'{BDDModel.NOT}{names[-l]}' if l < 0 else names[l] for l in clause) + ')'
+            for clause in self.sat_model.get_all_clauses())
+        bdd_model = BDDModel()
+        bdd_model.from_textual_cnf(cnf_formula, [names[v] for v in sorted(names)])
+        return bdd_model
+
+    def restore_bdd_model(self, bdd_model: BDDModel) -> None:
+        """Use the given BDD (e.g., loaded from `FMCache`) instead of building it."""
+        if FM.BDD in self.backends:
+            self._bdd_model = bdd_model
+            self._bdd_waited = True
+
+    @property
+    def bdd_model(self) -> Optional[BDDModel]:
+        """The BDD of the feature model, built on first use (None if it is not available)."""
+        if FM.BDD not in self.backends:
+            return None
+        if not self._bdd_waited:
+            if self._bdd_thread is None:
+                self._start_bdd_construction()
+            self._bdd_thread.join(self.bdd_timeout)
+            self._bdd_waited = True
+            if self._bdd_thread.is_alive():
+                print(f'The BDD model has not been built in {self.bdd_timeout} seconds.')
+        return self._bdd_model
     
     def get_feature_by_name(self, feature_name: str) -> Optional[Feature]:
         return self._features_by_name.get(feature_name)
 
+    def get_feature_index(self, feature: Feature) -> int:
+        return self.index.get_index(feature)
+
+    def get_analysis(self) -> FMAnalysis:
+        """Core, dead and false-optional features and atomic sets, computed on first use."""
+        if self._analysis is None:
+            self._analysis = FMAnalysis(self.index, self.solver)
+        return self._analysis
+
+    def restore_analysis(self, valid: bool, core: list[int], dead: list[int], false_optional: list[int]) -> None:
+        """Use the given results of the analysis (e.g., loaded from `FMCache`) instead of computing them."""
+        self._analysis = FMAnalysis.from_results(self.index, self.solver, valid, core, dead, false_optional)
+
+    def get_core_features(self) -> list[Feature]:
+        return [self.features[i] for i in self.get_analysis().core]
+
+    def get_dead_features(self) -> list[Feature]:
+        return [self.features[i] for i in self.get_analysis().dead]
+
+    def get_false_optional_features(self) -> list[Feature]:
+        return [self.features[i] for i in self.get_analysis().false_optional]
+
+    def get_atomic_sets(self) -> list[list[Feature]]:
+        return [[self.features[i] for i in atomic_set] for atomic_set in self.get_analysis().atomic_sets]
+
+    def get_selection(self, index: int) -> list[int]:
+        """Indexes of the features selected together with the given one: its atomic set if they are collapsed."""
+        if self.collapse_atomic_sets:
+            return self.get_analysis().atomic_set_of[index]
+        return [index]
+
+    def get_zobrist_key(self, index: int) -> int:
+        return self._zobrist_keys[index]
+
+    def get_zobrist_hash(self, indexes: list[int]) -> int:
+        """Hash of the configuration that selects the features with the given indexes (XOR of their keys)."""
+        return int(np.bitwise_xor.reduce(self.zobrist_keys[indexes])) if indexes else 0
+
+    def get_indexes(self, bitmask: int) -> list[int]:
+        """Indexes of the features whose bits are set in the bitmask, in increasing order."""
+        bits = np.unpackbits(np.frombuffer(bitmask.to_bytes((len(self.features) + 7) // 8, 'little'), dtype=np.uint8), bitorder='little')
+        return np.flatnonzero(bits).tolist()
+
+    def _solve(self, key: int, assumptions: Callable[[], list[int]]) -> bool:
+        """Call the solver with the assumptions, unless the result for the key is cached."""
+        valid = self.sat_cache.get(key)
+        if valid is None:
+            valid = self.solver.solve(assumptions=assumptions())
+            self.sat_cache.put(key, valid)
+        return valid
+
+    def start_rollout_session(self, partial_configuration: 'FMConfiguration') -> RolloutSession:
+        """Start an incremental session of the solver for a rollout from the partial configuration.
+
+        Until `end_rollout_session`, partial configurations are checked in the session: the features selected
+        since the last check are pushed on its trail (and those deselected are popped), instead of calling
+        the solver with all the selected variables as assumptions.
+        """
+        self._rollout_session = RolloutSession(self.solver, partial_configuration.get_selected_variables())
+        self._rollout_bitmask = partial_configuration.get_bitmask()
+        return self._rollout_session
+
+    def end_rollout_session(self) -> None:
+        self._rollout_session = None
+        self._rollout_bitmask = 0
+
+    def _get_rollout_session(self, partial_configuration: 'FMConfiguration') -> Optional[RolloutSession]:
+        """The rollout session (if any) with the trail synchronized with the partial configuration."""
+        session = self._rollout_session
+        if session is None:
+            return None
+        bitmask = partial_configuration.get_bitmask()
+        while self._rollout_bitmask & ~bitmask:
+            self._rollout_bitmask &= ~(1 << self.index.get_index_by_variable(session.pop()))
+        for i in self.get_indexes(bitmask & ~self._rollout_bitmask):
+            session.push(self.variables[i])
+        self._rollout_bitmask = bitmask
+        return session
+
     def is_valid_partial_configuration(self, partial_configuration: 'FMConfiguration') -> bool:
-        return self.solver.solve(assumptions=partial_configuration.get_selected_variables())
+        session = self._get_rollout_session(partial_configuration)
+        if session is not None:
+            return session.is_satisfiable()
+        return self._solve(partial_configuration.get_bitmask(), partial_configuration.get_selected_variables)
+
+    def is_valid_partial_configuration_with_feature(self, partial_configuration: 'FMConfiguration', feature: Feature) -> bool:
+        index = self.get_feature_index(feature)
+        session = self._get_rollout_session(partial_configuration)
+        if session is not None:
+            return session.try_literal(self.variables[index])
+        return self._solve(partial_configuration.get_bitmask() | (1 << index),
+                           lambda: partial_configuration.get_selected_variables() + [self.variables[index]])
+
+    def propagate(self, partial_configuration: 'FMConfiguration') -> Optional[tuple[set[int], set[int]]]:
+        """Unit propagation of the selected features of the partial configuration.
+
+        Return the sets of variables implied (forced to be selected) and refuted (forced to be unselected)
+        by the partial configuration, or None if propagation finds a conflict (the configuration is not valid).
+        Propagation is incomplete: a partial configuration without conflicts may still be invalid.
+        """
+        no_conflict, literals = self.solver.propagate(assumptions=partial_configuration.get_selected_variables())
+        if not no_conflict:
+            return None
+        return ({l for l in literals if l > 0}, {-l for l in literals if l < 0})
+
+    def get_valid_indexes(self, partial_configuration: 'FMConfiguration', indexes: list[int]) -> list[int]:
+        """Return the indexes of the features that form a valid partial configuration when added (individually) to the given one.
+
+        First, unit propagation settles the features implied (valid, because the partial configuration is valid)
+        and refuted (invalid) by the partial configuration.
+        Then, each model found by the solver validates at once all the features selected in it,
+        so only the features that are not settled by propagation nor selected in any model found so far
+        need a new call to the solver.
+        During a rollout session (see `start_rollout_session`), the same checks are done incrementally in the session.
+        """
+        bitmask = partial_configuration.get_bitmask()
+        if not indexes or self.sat_cache.get(bitmask) is False:
+            return []
+        session = self._get_rollout_session(partial_configuration)
+        if session is not None:
+            valid = session.is_satisfiable()
+            self.sat_cache.put(bitmask, valid)
+            if not valid:
+                return []
+            return list(itertools.compress(indexes, session.try_literals([self.variables[i] for i in indexes])))
+        assumptions = partial_configuration.get_selected_variables()
+        propagation = self.propagate(partial_configuration)
+        valid = propagation is not None and self.solver.solve(assumptions=assumptions)
+        self.sat_cache.put(bitmask, valid)
+        if not valid:
+            return []
+        implied, refuted = propagation
+        model = self.solver.get_model()
+        valid_indexes = []
+        for index in indexes:
+            variable = self.variables[index]
+            if variable in refuted:
+                continue
+            if variable not in implied and model[variable - 1] < 0:
+                valid = self.sat_cache.get(bitmask | (1 << index))
+                if valid is None:
+                    valid = self.solver.solve(assumptions=assumptions + [variable])
+                    self.sat_cache.put(bitmask | (1 << index), valid)
+                    if valid:
+                        model = self.solver.get_model()
+                if not valid:
+                    continue
+            valid_indexes.append(index)
+        return valid_indexes
+
+    def get_cnf_evaluator(self) -> CNFEvaluator:
+        """Evaluator of the clauses of the SAT model for complete configurations, built on first use."""
+        if self._cnf_evaluator is None:
+            self._cnf_evaluator = CNFEvaluator(self.sat_model.get_all_clauses(), self.index)
+        return self._cnf_evaluator
 
     def is_valid_configuration(self, configuration: 'FMConfiguration') -> bool:
-        variables = configuration.get_selected_variables() + configuration.get_unselected_variables()
-        return self.solver.solve(assumptions=variables)
-    
+        """A complete configuration assigns all the variables, so its clauses are evaluated instead of calling the solver."""
+        return self.get_cnf_evaluator().evaluate(configuration.get_bitmask())
+
+    def are_valid_configurations(self, configurations: list['FMConfiguration']) -> list[bool]:
+        """Validity of each complete configuration, evaluated for the whole batch at once.
+
+        Configurations of other feature models are translated (see `get_configuration_bitmask`),
+        and a configuration that selects a feature missing in this feature model is not valid.
+        """
+        bitmasks = [self.get_configuration_bitmask(configuration) for configuration in configurations]
+        valid = iter(self.get_cnf_evaluator().evaluate_batch([b for b in bitmasks if b is not None]).tolist())
+        return [bitmask is not None and next(valid) for bitmask in bitmasks]
+
+    def get_configuration_bitmask(self, configuration: 'FMConfiguration') -> Optional[int]:
+        """Bitmask in this feature model of the configuration, which may be of another feature model.
+
+        Configurations of other feature models are translated by the names of their selected features
+        (None if the configuration selects a feature missing in this feature model).
+        """
+        if configuration.fm is self:
+            return configuration.get_bitmask()
+        names = [configuration.fm.index.names[i] for i in configuration.get_selected_indexes()]
+        if not all(name in self._features_by_name for name in names):
+            return None
+        return self.index.get_bitmask(names)
+
+    def iter_configurations(self, limit: int = None, projection: list[Feature] = None) -> Iterator['FMConfiguration']:
+        """Yield the valid configurations (products) one at a time, up to `limit` configurations,
+        projected onto the given features if `projection` is given (see `ProductEnumerator`)."""
+        for bitmask in ProductEnumerator(self, projection).bitmasks(limit):
+            yield FMConfiguration.from_bitmask(self, bitmask)
+
     def get_configurations(self) -> list['FMConfiguration']:
-        products = Glucose3Products().execute(self.sat_model).get_result()
-        configurations = []
-        for p in products:
-            config = fm_utils.initialize_configuration(self.fm_model, p)
-            selected_features = [f for f in config.elements]
-            unselected_features = list(set(self.fm_model.get_features()) - set(selected_features))
-            selected_variables = [self.sat_model.variables[f.name] for f in selected_features]
-            unselected_variables = [-self.sat_model.variables[f.name] for f in unselected_features]
-            configuration = FMConfiguration(self, selected_features, unselected_features, selected_variables, unselected_variables)
-            configurations.append(configuration)
-        return configurations
-
-    # Get random configuration using the BDD
-    # def get_random_configuration(self, p_config: 'FMConfiguration' = None) -> Configuration:
-    #     # Initialize the configurations and values for BDD nodes with already known features
-    #     values = {} if p_config is None else {f.name: selected for f, selected in p_config.elements.items()}
-    #     features = {} if p_config is None else {f: selected for f, selected in p_config.elements.items()}
-
-    #     # Set the BDD nodes with the already known features values
-    #     u_func = self.bdd_model.bdd.let(values, self.bdd_model.root)
-
-    #     care_vars = set(self.bdd_model.variables) - values.keys()
-    #     n_vars = len(care_vars)
-    #     for feature in care_vars:
-    #         # Number of configurations with the feature selected
-    #         v_sel = self.bdd_model.bdd.let({feature: True}, u_func)
-    #         nof_configs_var_selected = self.bdd_model.bdd.count(v_sel, nvars=n_vars - 1)
-    #         # Number of configurations with the feature unselected
-    #         v_unsel = self.bdd_model.bdd.let({feature: False}, u_func)
-    #         nof_configs_var_unselected = self.bdd_model.bdd.count(v_unsel, nvars=n_vars - 1)
-
-    #         # Randomly select or not the feature
-    #         selected = random.choices([True, False], 
-    #                                 [nof_configs_var_selected, nof_configs_var_unselected], 
-    #                                 k=1)[0]
-
-    #         # Update configuration and BDD node for the new feature
-    #         values[feature] = selected
-    #         u_func = self.bdd_model.bdd.let({feature: selected}, u_func)
-    #         features[self.get_feature_by_name(feature)] = selected
-
-    #         n_vars -= 1
-    #     return FMConfiguration(Configuration(features), self)
+        return list(self.iter_configurations())
+
+    def get_bdd_sampler(self) -> BDDSampler:
+        """Sampler of uniform random configurations from the BDD, whose node counts are cached across samples."""
+        if self.bdd_model is None:
+            raise FMError('The BDD model is not available for this feature model.')
+        if self._bdd_sampler is None:
+            self._bdd_sampler = BDDSampler(self.bdd_model)
+        return self._bdd_sampler
+
+    def get_random_configurations(self, partial_configuration: 'FMConfiguration' = None, k: int = 1) -> list['FMConfiguration']:
+        """Return `k` valid configurations drawn uniformly at random among those that complete the partial configuration
+        (i.e., that select its selected features), using the BDD."""
+        assignment = {} if partial_configuration is None else {self.index.names[i]: True for i in partial_configuration.get_selected_indexes()}
+        samples = self.get_bdd_sampler().sample(assignment, k)
+        return [FMConfiguration.from_bitmask(self, self.index.get_bitmask(names)) for names in samples]
+
+    def get_model_bitmask(self, model: list[int]) -> int:
+        """Bitmask of the features selected in a model of the solver."""
+        if self._model_positions is None:
+            self._model_positions = np.array(self.variables, dtype=np.intp) - 1
+        selected = np.array(model, dtype=np.int64)[self._model_positions] > 0
+        return int.from_bytes(np.packbits(selected, bitorder='little').tobytes(), 'little')
+
+    def get_random_completion(self, partial_configuration: 'FMConfiguration', top_down: bool = False) -> Optional['FMConfiguration']:
+        """Return a random valid configuration that completes the partial configuration (None if it is not valid).
+
+        The configuration is found by the solver with a random preferred polarity (phase) for each variable
+        and the selected features as assumptions in random order, so a single call gives a random completion
+        (not uniformly distributed, see `get_random_configurations` for uniform samples).
+        If `top_down` is True, the features are decided from the root to the leaves as in a random walk over the tree:
+        level by level, the children of the selected features are decided by the kind of their relation
+        (optional children with probability 1/2, one child of an alternative group, a non-empty random subset
+        of an or-group) with a solver call per level, and the decisions of the level that are in conflict
+        (those in the unsatisfiable core) are left to the solver.
+        The completions use their own solver, so the random phases do not change the models found by `solver`.
+        """
+        solver = self._get_completion_solver()
+        assumptions = random.sample(partial_configuration.get_selected_variables(), partial_configuration.get_nof_selected_features())
+        solver.set_phases([v if random.getrandbits(1) else -v for v in self.variables])
+        valid = solver.solve(assumptions=assumptions)
+        self.sat_cache.put(partial_configuration.get_bitmask(), valid)
+        if not valid:
+            return None
+        model = solver.get_model()
+        if top_down:
+            model = self._complete_top_down(solver, assumptions, model)
+        return FMConfiguration.from_bitmask(self, self.get_model_bitmask(model))
+
+    def _get_completion_solver(self) -> Glucose3:
+        if self._completion_solver is None:
+            self._completion_solver = Glucose3()
+            for clause in self.sat_model.get_all_clauses():
+                self._completion_solver.add_clause(clause)
+        return self._completion_solver
+
+    def _complete_top_down(self, solver: Glucose3, assumptions: list[int], model: list[int]) -> list[int]:
+        """Decide the features level by level from the root, starting from a model of the assumptions."""
+        index = self.index
+        fixed = {abs(l) for l in assumptions}
+        for _, level in itertools.groupby(range(len(index)), key=index.depth.__getitem__):
+            decisions = []
+            for i in level:
+                if model[self.variables[i] - 1] < 0:
+                    continue
+                for group in range(index.groups_start[i], index.groups_end[i]):
+                    kind = index.group_kind[group]
+                    children = [c for c in range(index.group_start[group], index.group_end[group]) if self.variables[c] not in fixed]
+                    if kind == MANDATORY or not children:
+                        continue
+                    if kind == ALTERNATIVE:
+                        if len(children) == index.group_end[group] - index.group_start[group]:
+                            decisions.append(self.variables[random.choice(children)])
+                        continue
+                    chosen = [c for c in children if random.getrandbits(1)]
+                    if kind == OR and not chosen and len(children) == index.group_end[group] - index.group_start[group]:
+                        chosen = [random.choice(children)]
+                    decisions.extend(self.variables[c] if c in chosen else -self.variables[c] for c in children)
+            if not decisions:
+                continue
+            random.shuffle(decisions)
+            while not solver.solve(assumptions=assumptions + decisions):
+                # The previous assumptions are satisfiable, so the core includes some decisions of the level
+                conflicting = set(solver.get_core()).intersection(decisions)
+                decisions = [l for l in decisions if l not in conflicting] if conflicting else []
+            assumptions = assumptions + decisions
+            fixed.update(abs(l) for l in decisions)
+            model = solver.get_model()
+        return model
+
 
 class FMConfiguration(Configuration):
+    """Configuration of a feature model represented as a bitmask over the feature indexes of the FM.
+
+    The selected features are the bits set in the mask, and the unselected features are the remaining ones,
+    so copying a configuration is O(1) and the lists of features and SAT variables (assumptions)
+    are derived lazily from the mask only when they are requested.
+    """
+
+    __slots__ = ('fm', '_bitmask', '_hash_value',
+                 '_selected_indexes', '_selected_features', '_unselected_features', '_selected_variables', '_unselected_variables',
+                 '_configurable_indexes', '_configurable_features', '_configurable_indexes_delta')
 
     def __init__(self,
                  fm: FM,
@@ -93,109 +446,221 @@ class FMConfiguration(Configuration):
                  unselected_features: list[Feature] = None,
                  selected_variables: list[int] = None,
                  unselected_variables: list[int] = None):
+        """The unselected features and the variables are derived from the selected features,
+        and are only accepted for compatibility."""
         self.fm = fm
-        self._selected_features = [*selected_features] if selected_features else [] 
-        self._unselected_features = [*unselected_features] if unselected_features else [] 
-        self._selected_variables = [*selected_variables] if selected_variables else [] 
-        self._unselected_variables = [*unselected_variables] if unselected_variables else []
+        bitmask = 0
+        for feature in selected_features if selected_features else []:
+            bitmask |= 1 << fm.get_feature_index(feature)
+        self._set_bitmask(bitmask)
+        self._configurable_indexes = None
         self._configurable_features = None
-    
+        self._configurable_indexes_delta = None  # (previous configurable indexes, indexes added since then)
+
+    @classmethod
+    def from_bitmask(cls, fm: FM, bitmask: int) -> 'FMConfiguration':
+        config = cls(fm)
+        config._set_bitmask(bitmask)
+        return config
+
+    def _set_bitmask(self, bitmask: int, hash_value: int = None) -> None:
+        self._bitmask = bitmask
+        self._hash_value = hash_value  # Zobrist hash (see `FM.zobrist_keys`), computed on first use
+        self._selected_indexes = None
+        self._selected_features = None
+        self._unselected_features = None
+        self._selected_variables = None
+        self._unselected_variables = None
+
+    def get_bitmask(self) -> int:
+        return self._bitmask
+
+    def get_selected_indexes(self) -> list[int]:
+        if self._selected_indexes is None:
+            self._selected_indexes = self.fm.get_indexes(self._bitmask)
+        return self._selected_indexes
+
+    def get_nof_selected_features(self) -> int:
+        return len(self.get_selected_indexes())
+
     def get_selected_features(self) -> list[Feature]:
+        if self._selected_features is None:
+            self._selected_features = [self.fm.features[i] for i in self.get_selected_indexes()]
         return self._selected_features
 
     def get_unselected_features(self) -> list[Feature]:
+        if self._unselected_features is None:
+            unselected = self.fm.get_indexes(self.fm.full_bitmask & ~self._bitmask)
+            self._unselected_features = [self.fm.features[i] for i in unselected]
         return self._unselected_features
-    
+
     def get_selected_variables(self) -> list[int]:
+        if self._selected_variables is None:
+            self._selected_variables = [self.fm.variables[i] for i in self.get_selected_indexes()]
         return self._selected_variables
-    
+
     def get_unselected_variables(self) -> list[int]:
+        if self._unselected_variables is None:
+            unselected = self.fm.get_indexes(self.fm.full_bitmask & ~self._bitmask)
+            self._unselected_variables = [-self.fm.variables[i] for i in unselected]
         return self._unselected_variables
 
+    def is_selected(self, feature: Feature) -> bool:
+        return (self._bitmask >> self.fm.get_feature_index(feature)) & 1 == 1
+
+    def is_selected_index(self, index: int) -> bool:
+        return (self._bitmask >> index) & 1 == 1
+
     @classmethod
     def from_configuration(cls, config: 'FMConfiguration') -> 'FMConfiguration':
-        new_config = cls(fm=config.fm, 
-                         selected_features=config._selected_features,
-                         unselected_features=config._unselected_features,
-                         selected_variables=config._selected_variables,
-                         unselected_variables=config._unselected_variables)
+        """Copy of the configuration. The derived lists are shared because they are never modified in place."""
+        new_config = cls.__new__(cls)
+        for attribute in FMConfiguration.__slots__:
+            setattr(new_config, attribute, getattr(config, attribute))
         return new_config
 
     def get_configurable_features(self) -> list[Feature]:
         """Configurable features are those features that can be selected to form a valid 
         configuration from the already selected features following the tree structure of the 
         feature model top-down.
+
+        The features are sorted by their index in the FM, so the order does not depend on how
+        the configuration has been built (from scratch or incrementally, see `add_feature`).
         """
-        if self._configurable_features is not None:
-            return self._configurable_features
+        if self._configurable_features is None:
+            self._configurable_features = [self.fm.features[i] for i in self.get_configurable_indexes()]
+        return self._configurable_features
 
-        configurable_features = []
-        if not self._selected_features:
-            configurable_features.append(self.fm.fm_model.root)
+    def get_configurable_indexes(self) -> list[int]:
+        """Indexes of the configurable features (see `get_configurable_features`)."""
+        if self._configurable_indexes is not None:
+            return self._configurable_indexes
+        if self._configurable_indexes_delta is not None:
+            self._configurable_indexes = self._update_configurable_indexes(*self._configurable_indexes_delta)
+            self._configurable_indexes_delta = None
+            return self._configurable_indexes
+
+        index = self.fm.index
+        mandatory_indexes = []  # configurable features that do not need to be checked
+        candidate_indexes = []  # features that are configurable if they are valid
+        if not self._bitmask:
+            mandatory_indexes.append(index.ROOT)
         else:
             # we transverse only the shortest list of features for efficiency
-            if len(self._selected_features) <= len(self._unselected_features):
+            if 2 * self.get_nof_selected_features() <= len(index):
                 # configurable features are the valid children of the already selected features
-                for feature in self._selected_features:
-                    for relation in feature.get_relations():
-                        if relation.is_mandatory():
-                            child = relation.children[0]
-                            if child not in self._selected_features:
-                                configurable_features.append(child)
-                        elif relation.is_optional():
-                            child = relation.children[0]
-                            if child not in self._selected_features and self.is_valid_partial_configuration_with_feature(child):
-                                configurable_features.append(child)
-                        elif relation.is_or():
-                            for child in relation.children:
-                                if child not in self._selected_features and self.is_valid_partial_configuration_with_feature(child):
-                                    configurable_features.append(child)
-                        elif relation.is_alternative():
-                            if not any(c in self._selected_features for c in relation.children):
-                                for child in relation.children:
-                                    if self.is_valid_partial_configuration_with_feature(child):
-                                        configurable_features.append(child)
+                for i in self.get_selected_indexes():
+                    self._add_children_candidates(i, mandatory_indexes, candidate_indexes)
             else:
                 # configurable features are those valid features whose parent have been already selected
-                for feature in self._unselected_features:
-                    if feature.get_parent() in self._selected_features and self.is_valid_partial_configuration_with_feature(feature):
-                        configurable_features.append(feature)
-        self._configurable_features = configurable_features
-        return configurable_features
+                for i in self.fm.get_indexes(self.fm.full_bitmask & ~self._bitmask):
+                    parent = index.parent[i]
+                    if parent >= 0 and (self._bitmask >> parent) & 1:
+                        if index.relation_kind[i] == MANDATORY:
+                            mandatory_indexes.append(i)
+                        else:
+                            candidate_indexes.append(i)
+        self._configurable_indexes = sorted(mandatory_indexes + self.fm.get_valid_indexes(self, candidate_indexes))
+        return self._configurable_indexes
+
+    def _add_children_candidates(self, i: int, mandatory_indexes: list[int], candidate_indexes: list[int]) -> None:
+        """Add the unselected children of the feature to the mandatory or candidate configurable features."""
+        index = self.fm.index
+        bitmask = self._bitmask
+        for group in range(index.groups_start[i], index.groups_end[i]):
+            kind = index.group_kind[group]
+            start, end = index.group_start[group], index.group_end[group]
+            if kind == MANDATORY:
+                if not (bitmask >> start) & 1:
+                    mandatory_indexes.append(start)
+            elif kind == OPTIONAL or kind == OR:
+                candidate_indexes.extend(c for c in range(start, end) if not (bitmask >> c) & 1)
+            elif kind == ALTERNATIVE:
+                if not bitmask & index.group_masks[group]:
+                    candidate_indexes.extend(range(start, end))
+
+    def _update_configurable_indexes(self, configurable_indexes: list[int], added_indexes: list[int]) -> list[int]:
+        """Configurable features after selecting the added features, from the configurable features before selecting them.
+
+        Selecting features only restricts the valid configurations, so only the previous configurable features
+        that remain candidates (i.e., they are not the added features or their siblings in an alternative group)
+        and the children of the added features need to be checked.
+        """
+        index = self.fm.index
+        excluded_indexes = set()
+        for i in added_indexes:
+            excluded_indexes.add(i)
+            if index.relation_kind[i] == ALTERNATIVE:
+                group = index.group[i]
+                excluded_indexes.update(range(index.group_start[group], index.group_end[group]))
+        mandatory_indexes = []
+        candidate_indexes = []
+        for i in configurable_indexes:
+            if i not in excluded_indexes:
+                if index.relation_kind[i] == MANDATORY:
+                    mandatory_indexes.append(i)
+                else:
+                    candidate_indexes.append(i)
+        for i in added_indexes:
+            self._add_children_candidates(i, mandatory_indexes, candidate_indexes)
+        return sorted(mandatory_indexes + self.fm.get_valid_indexes(self, candidate_indexes))
 
     def add_feature(self, feature: Feature) -> None:
-        self._selected_features.append(feature)
-        self._unselected_features.remove(feature)
-        self._selected_variables.append(self.fm.sat_model.variables[feature.name])
-        self._unselected_variables.remove(-self.fm.sat_model.variables[feature.name])
+        """Select the feature (and its atomic set if the FM collapses them).
+
+        If the configurable features were already computed, they will be updated incrementally when requested.
+        """
+        added = [i for i in self.fm.get_selection(self.fm.get_feature_index(feature)) if not self.is_selected_index(i)]
+        if not added:
+            return
+        bitmask = self._bitmask
+        hash_value = self._hash_value
+        for i in added:
+            bitmask |= 1 << i
+            if hash_value is not None:
+                hash_value ^= self.fm.get_zobrist_key(i)
+        self._set_bitmask(bitmask, hash_value)
+        if self._configurable_indexes is not None:
+            self._configurable_indexes_delta = (self._configurable_indexes, added)
+        elif self._configurable_indexes_delta is not None:
+            configurable_indexes, added_indexes = self._configurable_indexes_delta
+            self._configurable_indexes_delta = (configurable_indexes, added_indexes + added)
+        self._configurable_indexes = None
         self._configurable_features = None
     
     def remove_feature(self, feature: Feature) -> None:
-        self._selected_features.remove(feature)
-        self._unselected_features.append(feature)
-        self._selected_variables.remove(self.fm.sat_model.variables[feature.name])
-        self._unselected_variables.append(-self.fm.sat_model.variables[feature.name])
+        index = self.fm.get_feature_index(feature)
+        hash_value = self._hash_value
+        if hash_value is not None and self.is_selected_index(index):
+            hash_value ^= self.fm.get_zobrist_key(index)
+        self._set_bitmask(self._bitmask & ~(1 << index), hash_value)
+        self._configurable_indexes = None
         self._configurable_features = None
+        self._configurable_indexes_delta = None
 
     def is_valid_partial_configuration(self) -> bool:
         return self.fm.is_valid_partial_configuration(self)
 
     def is_valid_partial_configuration_with_feature(self, feature) -> bool:
-        self._selected_variables.append(self.fm.sat_model.variables[feature.name])
-        valid = self.is_valid_partial_configuration()
-        self._selected_variables.remove(self.fm.sat_model.variables[feature.name])
-        return valid
+        return self.fm.is_valid_partial_configuration_with_feature(self, feature)
 
     def is_valid_configuration(self) -> bool:
         return self.fm.is_valid_configuration(self)
 
     def __eq__(self, other: object) -> bool:
+        """The hashes (if both are known) are compared before the bitmasks."""
         if isinstance(other, FMConfiguration):
-            return (set(self._selected_features) == set(other._selected_features))
+            if self._hash_value is not None and other._hash_value is not None and self._hash_value != other._hash_value:
+                return False
+            return self._bitmask == other._bitmask
         return False
 
     def __hash__(self) -> int:
-        return hash((frozenset(self._selected_features)))
+        if self._hash_value is None:
+            # The selected indexes are not kept if they have not been requested yet (configurations are hashed often)
+            indexes = self._selected_indexes if self._selected_indexes is not None else self.fm.get_indexes(self._bitmask)
+            self._hash_value = self.fm.get_zobrist_hash(indexes)
+        return self._hash_value
 
     def __str__(self) -> str:
-        return str([str(f) for f in self._selected_features])
+        return str([str(f) for f in self.get_selected_features()])
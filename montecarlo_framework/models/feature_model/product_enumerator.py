@@ -0,0 +1,80 @@
+import csv
+import itertools
+from typing import Any, Iterator
+
+from famapy.metamodels.fm_metamodel.models import Feature
+
+
+class ProductEnumerator():
+    """Enumeration of the products (valid configurations) of a feature model, one at a time.
+
+    The products are enumerated by a depth-first search over the values of the variables of the features
+    (in the order of the feature indexes, i.e., top-down), where each node of the search is a call to the solver
+    with the values assigned so far as assumptions. The search follows the model found by the solver down to a
+    product and backtracks to the opposite values, so the enumerated products are excluded by the assumptions
+    instead of by blocking clauses: neither the solver nor the enumerator grow with the number of products.
+
+    If a projection (subset of the features) is given, only the variables of the projected features are enumerated,
+    so each product is the set of projected features selected in (at least) a valid configuration.
+    """
+
+    def __init__(self, fm: Any, projection: list[Feature] = None) -> None:
+        self.fm = fm
+        if projection is None:
+            indexes = range(len(fm.features))
+        else:
+            indexes = sorted({fm.get_feature_index(feature) for feature in projection})
+        self._variables = [fm.variables[i] for i in indexes]
+        self._projection_mask = sum(1 << i for i in indexes)
+
+    def bitmasks(self, limit: int = None) -> Iterator[int]:
+        """Yield the bitmasks of the (projected) products, up to `limit` products."""
+        solver = self.fm.solver
+        variables = self._variables
+        assumptions = []
+        pending = [(0, None)]  # branches to be explored: (number of assumptions kept, new assumption)
+        nof_products = 0
+        while pending and (limit is None or nof_products < limit):
+            depth, literal = pending.pop()
+            del assumptions[depth:]
+            if literal is not None:
+                assumptions.append(literal)
+            if not solver.solve(assumptions=assumptions):
+                continue
+            model = solver.get_model()
+            for variable in variables[len(assumptions):]:
+                literal = variable if model[variable - 1] > 0 else -variable
+                pending.append((len(assumptions), -literal))
+                assumptions.append(literal)
+            nof_products += 1
+            yield self.fm.get_model_bitmask(model) & self._projection_mask
+
+    def chunks(self, chunk_size: int, limit: int = None) -> Iterator[list[int]]:
+        """Yield the bitmasks of the (projected) products in lists of `chunk_size` products, up to `limit` products."""
+        bitmasks = self.bitmasks(limit)
+        chunk = list(itertools.islice(bitmasks, chunk_size))
+        while chunk:
+            yield chunk
+            chunk = list(itertools.islice(bitmasks, chunk_size))
+
+    def write(self, filepath: str, chunk_size: int = 1000, limit: int = None) -> int:
+        """Write the (projected) products to a CSV file, one product per line with the names of its selected features.
+
+        The products are written in chunks of `chunk_size` products as they are enumerated.
+        Return the number of products written.
+        """
+        names = self.fm.index.names
+        nof_products = 0
+        with open(filepath, 'w', encoding='utf8', newline='') as file:
+            writer = csv.writer(file, delimiter=',')
+            for chunk in self.chunks(chunk_size, limit):
+                writer.writerows([names[i] for i in self.fm.get_indexes(bitmask)] for bitmask in chunk)
+                nof_products += len(chunk)
+        return nof_products
+
+    @staticmethod
+    def read(fm: Any, filepath: str) -> Iterator[int]:
+        """Yield, one at a time, the bitmasks (in the FM) of the products written in a CSV file by `write`."""
+        with open(filepath, 'r', encoding='utf8', newline='') as file:
+            for names in csv.reader(file, delimiter=','):
+                yield fm.index.get_bitmask(names)
@@ -0,0 +1,133 @@
+from typing import Optional
+
+from pysat.solvers import Solver
+
+
+class RolloutSession():
+    """Incremental session of a solver along a rollout.
+
+    The assumptions of the session are kept in a trail of literals that is given as is to the solver,
+    and that grows (`push`) and shrinks (`pop`) one literal at a time, so the assumptions are never rebuilt.
+    For each level of the trail, the session keeps the literals settled by the trail (those implied by unit
+    propagation, and those refuted by the solver), whether the trail is satisfiable, and the last model found.
+    Assumptions only restrict the models, so the literals settled at a level remain settled at the deeper levels,
+    and a model of a level is a model of the next one if it satisfies the pushed literal.
+    Everything is computed lazily, when `is_satisfiable` or `try_literal` need it.
+    """
+
+    def __init__(self, solver: Solver, literals: list[int] = None) -> None:
+        self.solver = solver
+        self._trail: list[int] = []
+        # Data of each level (level 0 is the empty trail)
+        self._settled: list[Optional[set[int]]] = [None]
+        self._satisfiable: list[Optional[bool]] = [None]
+        self._models: list[Optional[list[int]]] = [None]
+        for literal in literals if literals else []:
+            self.push(literal)
+
+    def __len__(self) -> int:
+        return len(self._trail)
+
+    def get_trail(self) -> list[int]:
+        return list(self._trail)
+
+    def push(self, literal: int) -> None:
+        """Add the literal to the assumptions."""
+        settled = self._settled[-1]
+        satisfiable = self._satisfiable[-1]
+        model = self._models[-1]
+        self._trail.append(literal)
+        if satisfiable is False or (settled is not None and -literal in settled):
+            self._push_level(settled, False, None)
+        elif settled is not None and literal in settled:
+            # The literal is already implied: the models are the same
+            self._push_level(settled, satisfiable, model)
+        elif model is not None and model[abs(literal) - 1] == literal:
+            self._push_level(None, True, model)
+        else:
+            self._push_level(None, None, None)
+
+    def _push_level(self, settled: Optional[set[int]], satisfiable: Optional[bool], model: Optional[list[int]]) -> None:
+        self._settled.append(settled)
+        self._satisfiable.append(satisfiable)
+        self._models.append(model)
+
+    def pop(self) -> int:
+        """Remove the last literal from the assumptions and return it."""
+        self._settled.pop()
+        satisfiable = self._satisfiable.pop()
+        model = self._models.pop()
+        if satisfiable and self._models[-1] is None:
+            # A model of the trail is also a model of any prefix of the trail
+            self._satisfiable[-1] = True
+            self._models[-1] = model
+        return self._trail.pop()
+
+    def _get_settled(self) -> set[int]:
+        """Literals settled by the trail, from the unit propagation of the trail and the settled literals of the previous levels."""
+        if self._settled[-1] is None:
+            no_conflict, literals = self.solver.propagate(assumptions=self._trail)
+            if not no_conflict:
+                self._satisfiable[-1] = False
+            previous = next((s for s in reversed(self._settled) if s is not None), set())
+            self._settled[-1] = previous.union(literals)
+        return self._settled[-1]
+
+    def _settle(self, literal: int) -> None:
+        settled = self._get_settled()
+        if len(self._settled) > 1 and self._settled[-2] is settled:
+            # The set is shared with the previous level
+            settled = set(settled)
+            self._settled[-1] = settled
+        settled.add(literal)
+
+    def is_satisfiable(self) -> bool:
+        """Return True if the assumptions are satisfiable."""
+        if self._satisfiable[-1] is None:
+            self._get_settled()
+            if self._satisfiable[-1] is None:
+                self._satisfiable[-1] = self.solver.solve(assumptions=self._trail)
+                if self._satisfiable[-1]:
+                    self._models[-1] = self.solver.get_model()
+        return self._satisfiable[-1]
+
+    def get_model(self) -> Optional[list[int]]:
+        """A model of the assumptions (None if they are not satisfiable)."""
+        return self._models[-1] if self.is_satisfiable() else None
+
+    def try_literal(self, literal: int) -> bool:
+        """Return True if the assumptions are satisfiable with the literal, without adding it to the assumptions."""
+        if not self.is_satisfiable():
+            return False
+        settled = self._get_settled()
+        if literal in settled:
+            return True
+        if -literal in settled:
+            return False
+        if self._models[-1][abs(literal) - 1] == literal:
+            return True
+        return self._solve_literal(literal)
+
+    def try_literals(self, literals: list[int]) -> list[bool]:
+        """Return, for each literal, True if the assumptions are satisfiable with it (see `try_literal`).
+
+        Each model found validates the remaining literals that it satisfies without calling the solver again.
+        """
+        if not self.is_satisfiable():
+            return [False] * len(literals)
+        settled = self._get_settled()
+        results = [True if literal in settled else False if -literal in settled else None for literal in literals]
+        for i, literal in enumerate(literals):
+            if results[i] is None:
+                results[i] = self._models[-1][abs(literal) - 1] == literal or self._solve_literal(literal)
+        return results
+
+    def _solve_literal(self, literal: int) -> bool:
+        self._trail.append(literal)
+        satisfiable = self.solver.solve(assumptions=self._trail)
+        self._trail.pop()
+        if satisfiable:
+            self._models[-1] = self.solver.get_model()
+        else:
+            self._settle(-literal)
+        return satisfiable
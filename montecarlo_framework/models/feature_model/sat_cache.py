@@ -0,0 +1,95 @@
+import sys
+import hashlib
+import multiprocessing
+from collections import OrderedDict
+from typing import Optional
+
+import numpy as np
+
+
+class SATCache():
+    """Memoization of the results of the SAT solver for (partial) configurations.
+
+    The keys are canonical representations of the assumptions of each call to the solver
+    (e.g., the bitmask of the selected features of a configuration, see `FM`).
+    The results are kept in a local LRU cache bounded by a memory budget,
+    and optionally in a table in shared memory (enabled with `enable_shared` before forking the worker processes
+    of the parallel algorithms) so that the workers reuse the results found by the others.
+
+    The shared table is direct-mapped and lossy: each slot stores a 64-bit fingerprint of the key and
+    the result, and it is overwritten by later keys mapped to the same slot.
+    Fingerprints could collide, but with negligible probability (2^-62 per lookup).
+    """
+
+    DEFAULT_MEMORY = 64  # MB
+    DEFAULT_SHARED_ENTRIES = 1 << 20  # 8 MB (see `enable_shared`)
+    ENTRY_OVERHEAD = 100  # approximate size in bytes of an entry of the LRU cache without its key
+
+    def __init__(self, memory: float = DEFAULT_MEMORY, shared_entries: int = 0):
+        self.max_memory = int(memory * 1e6)
+        self.memory = 0
+        self._cache: OrderedDict[int, bool] = OrderedDict()
+        self._shared = None
+        self.enable_shared(shared_entries)
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+
+    def enable_shared(self, shared_entries: int = DEFAULT_SHARED_ENTRIES) -> None:
+        """Create the table in shared memory (if it does not exist yet), so that it is shared with the processes forked afterwards."""
+        if self._shared is None and shared_entries > 0:
+            context = multiprocessing.get_context('fork')
+            self._shared = np.frombuffer(context.RawArray('q', shared_entries), dtype=np.int64)
+
+    def is_shared(self) -> bool:
+        return self._shared is not None
+
+    def get(self, key: int) -> Optional[bool]:
+        """Return the cached result for the key, or None if it is not cached."""
+        result = self._cache.get(key)
+        if result is not None:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return result
+        if self._shared is not None:
+            slot, fingerprint = self._slot(key)
+            value = int(self._shared[slot])
+            if value != 0 and value & ~3 == fingerprint:
+                result = value & 3 == 1
+                self._put_local(key, result)
+                self.shared_hits += 1
+                return result
+        self.misses += 1
+        return None
+
+    def put(self, key: int, result: bool) -> None:
+        self._put_local(key, result)
+        if self._shared is not None:
+            slot, fingerprint = self._slot(key)
+            self._shared[slot] = fingerprint | (1 if result else 2)
+
+    def _put_local(self, key: int, result: bool) -> None:
+        if key in self._cache:
+            self._cache.move_to_end(key)
+        else:
+            self._cache[key] = result
+            self.memory += sys.getsizeof(key) + SATCache.ENTRY_OVERHEAD
+            while self.memory > self.max_memory and self._cache:
+                old_key, _ = self._cache.popitem(last=False)
+                self.memory -= sys.getsizeof(old_key) + SATCache.ENTRY_OVERHEAD
+
+    def _slot(self, key: int) -> tuple[int, int]:
+        """Slot of the key in the shared table and fingerprint of the key (with the two lowest bits cleared)."""
+        data = key.to_bytes((key.bit_length() + 8) // 8, 'little', signed=True)
+        fingerprint = int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'little', signed=True)
+        return (fingerprint & 0x7FFFFFFFFFFFFFFF) % len(self._shared), fingerprint & ~3
+
+    def get_hit_rate(self) -> float:
+        lookups = self.hits + self.shared_hits + self.misses
+        return (self.hits + self.shared_hits) / lookups if lookups else 0.0
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def __str__(self) -> str:
+        return f'SATCache(entries={len(self)}, hits={self.hits}, shared hits={self.shared_hits}, misses={self.misses})'
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from typing import Any
 
 
 class State(ABC):
@@ -10,8 +11,11 @@ class State(ABC):
     from a give state (i.e., the successors).
     
     Each kind of problem must extend this class to represent its states.
+    Subclasses may declare `__slots__` for their attributes (many states are created during a search).
     """   
 
+    __slots__ = ()
+
     @abstractmethod
     def actions(self) -> list['Action']:
         """All applicable actions in this state."""
@@ -38,6 +42,23 @@ class State(ABC):
     def get_random_terminal_state(self) -> 'State':
         """Return a random terminal state from this state (redefine it for efficiency during simulations)."""
 
+    def to_payload(self) -> Any:
+        """Compact and picklable representation of this state, used to send it to other processes
+        (redefine it for states that hold non-picklable or heavy objects)."""
+        return self
+
+    def from_payload(self, payload: Any) -> 'State':
+        """Reconstruct a state of the same problem as this state from its payload (see `to_payload`)."""
+        return payload
+
+    def action_from_payload(self, payload: Any) -> 'Action':
+        """Reconstruct an action of the same problem as this state from its payload (see `Action.to_payload`)."""
+        return payload
+
+    def before_fork(self) -> None:
+        """Prepare the problem of this state to be inherited by forked worker processes
+        (redefine it for states whose problem holds caches that the workers can share, e.g., in shared memory)."""
+
     @abstractmethod
     def is_terminal(self) -> bool:
         """The goal test. Determine whether a given state is a goal (terminal) state."""
@@ -70,6 +91,8 @@ class State(ABC):
 class Action(ABC):
     """Valid actions for the problem."""
 
+    __slots__ = ()
+
     @staticmethod
     @abstractmethod
     def get_name() -> str:
@@ -83,6 +106,11 @@ class Action(ABC):
     def is_applicable(self, state: 'State') -> bool:
         """True if the action is applicable for the given state, False in othercase."""
 
+    def to_payload(self) -> Any:
+        """Compact and picklable representation of this action, used to send it to other processes
+        (redefine it for actions that hold non-picklable or heavy objects)."""
+        return self
+
     @abstractmethod
     def execute(self, state: 'State') -> 'State':
         """Execute the actions."""
@@ -1,4 +1,8 @@
+import dbm
+import os
+import pickle
 from abc import ABC, abstractmethod
+from typing import Any, BinaryIO, Iterator
 
 from montecarlo_framework.models.problem import State, Action
 
@@ -14,6 +18,8 @@ class Node():
                  to the node, as indicated by the parent pointers.
     """
 
+    __slots__ = ('state', 'parent', 'action', 'path_cost')
+
     def __init__(self, state: State, parent: 'Node' = None, action: Action = None):
         self.state = state
         self.parent = parent
@@ -33,6 +39,8 @@ class Node():
 class NodeValue():
     """Node that stores a value (heuristic, cost,...) and provides a partial order."""
 
+    __slots__ = ('node', 'value')
+
     def __init__(self, node: Node, value: float):
         self.node = node 
         self.value = value 
@@ -92,6 +100,8 @@ class SearchTree():
 
 class Solution():
 
+    __slots__ = ('terminal_node',)
+
     def __init__(self, terminal_node: Node):
         self.terminal_node = terminal_node 
     
@@ -103,13 +113,109 @@ class Solution():
             node = node.parent 
         path.insert(0, (node.state, node.action))
         return path
+
+    def to_payload(self) -> list[tuple[Any, Any]]:
+        """Compact and picklable representation of the solution path (see `State.to_payload`)."""
+        return [(state.to_payload(), None if action is None else action.to_payload())
+                for state, action in self.get_solution_path()]
+
+    @staticmethod
+    def from_payload(payload: list[tuple[Any, Any]], state: State) -> 'Solution':
+        """Reconstruct a solution from its payload, using any state of the same problem."""
+        node = None
+        for state_payload, action_payload in payload:
+            action = None if action_payload is None else state.action_from_payload(action_payload)
+            node = Node(state.from_payload(state_payload), node, action)
+        return Solution(node)
         
 
+class SolutionRegistry():
+    """Registry of the solutions of a problem, hashed by the keys of their terminal states.
+
+    The key of a terminal state is its payload (see `State.to_payload`), so checking whether a state is
+    the terminal state of a registered solution is O(1). A solution whose terminal state is already registered
+    is not registered again.
+    By default the solutions are kept in memory. If a file is given, the registry is disk-backed:
+    the keys are stored in a `dbm` database (file.keys) and the payloads of the solutions are appended
+    to the file as they are registered, so only the open handles stay in memory.
+    A disk-backed registry starts empty unless `reopen` is True, in which case the solutions registered
+    in the file by a previous registry are kept (a state of the problem is needed to reconstruct them).
+    In both cases, the solutions are iterated one at a time in the order they were registered.
+    """
+
+    def __init__(self, filepath: str = None, reopen: bool = False, state: State = None) -> None:
+        self.filepath = filepath
+        self._nof_solutions = 0
+        self._state = state  # a state of the problem, used to reconstruct the solutions from their payloads
+        if filepath is None:
+            self._keys = set()
+            self._solutions = []
+        elif reopen:
+            self._keys = dbm.open(f'{filepath}.keys', 'c')
+            if os.path.exists(filepath):
+                with open(filepath, 'rb') as file:
+                    for _ in SolutionRegistry._load_payloads(file):
+                        self._nof_solutions += 1
+            self._file = open(filepath, 'ab')
+        else:
+            self._keys = dbm.open(f'{filepath}.keys', 'n')
+            self._file = open(filepath, 'wb')
+
+    @staticmethod
+    def _load_payloads(file: BinaryIO) -> Iterator[Any]:
+        while True:
+            try:
+                yield pickle.load(file)
+            except EOFError:
+                return
+
+    @staticmethod
+    def get_key(state: State) -> Any:
+        return state.to_payload()
+
+    def add(self, solution: Solution) -> None:
+        state = solution.terminal_node.state
+        if state in self:
+            return
+        if self.filepath is None:
+            self._keys.add(SolutionRegistry.get_key(state))
+            self._solutions.append(solution)
+        else:
+            self._keys[pickle.dumps(SolutionRegistry.get_key(state))] = b''
+            pickle.dump(solution.to_payload(), self._file)
+            self._file.flush()
+        if self._state is None:
+            self._state = state
+        self._nof_solutions += 1
+
+    def __contains__(self, state: State) -> bool:
+        """Return True if the state is the terminal state of a registered solution."""
+        if self.filepath is None:
+            return SolutionRegistry.get_key(state) in self._keys
+        return pickle.dumps(SolutionRegistry.get_key(state)) in self._keys
+
+    def __len__(self) -> int:
+        return self._nof_solutions
+
+    def __iter__(self) -> Iterator[Solution]:
+        if self.filepath is None:
+            yield from self._solutions
+            return
+        with open(self.filepath, 'rb') as file:
+            for _ in range(self._nof_solutions):
+                yield Solution.from_payload(pickle.load(file), self._state)
+
+    def close(self) -> None:
+        if self.filepath is not None:
+            self._keys.close()
+            self._file.close()
+
+
 class Problem(ABC):
     """Problem formulation."""
 
     def __init__(self) -> None:
-        self._solutions = []
+        self._solutions = SolutionRegistry()
 
     @staticmethod
     @abstractmethod
@@ -120,9 +226,33 @@ class Problem(ABC):
     def get_initial_state(self) -> State:
         """Return the initial state of the problem."""
 
+    def set_solutions_file(self, filepath: str, reopen: bool = False) -> None:
+        """Store the solutions on disk, in the given file (see `SolutionRegistry`).
+
+        The solutions registered so far are moved to the file.
+        If `reopen` is True, the solutions already stored in the file (e.g., by a previous run) are kept.
+        The file is not shared: use it in a single process (e.g., not with several workers in `run_executor`).
+        """
+        solutions = self._solutions
+        self._solutions = SolutionRegistry(filepath, reopen, self.get_initial_state() if reopen else None)
+        for sol in solutions:
+            self._solutions.add(sol)
+        solutions.close()
+
     def add_solution(self, sol: Solution) -> None:
-        self._solutions.append(sol)
+        self._solutions.add(sol)
+
+    def is_solution(self, state: State) -> bool:
+        """Return True if the state is the terminal state of a registered solution (O(1))."""
+        return state in self._solutions
+
+    def nof_solutions(self) -> int:
+        return len(self._solutions)
+
+    def iter_solutions(self) -> Iterator[Solution]:
+        """Iterate over the registered solutions, one at a time (without loading all of them if they are on disk)."""
+        return iter(self._solutions)
 
     def get_solutions(self) -> list[Solution]:
-        return self._solutions
+        return list(self._solutions)
 
@@ -0,0 +1,90 @@
+import multiprocessing
+
+import numpy as np
+
+from montecarlo_framework.models.search_space import Node
+from montecarlo_framework.models.array_search_tree import ArraySearchTree
+
+
+class SharedArraySearchTreeError(Exception):
+    """A custom exception used to report errors in use of SharedArraySearchTree class."""
+
+
+class SharedArraySearchTree(ArraySearchTree):
+    """Array-backed search tree whose buffers live in shared memory.
+
+    The buffers have a fixed capacity and are shared by all processes forked after the tree is created,
+    so several workers can select, expand and backpropagate concurrently over the same tree.
+    Structural updates (allocation of children) and statistics updates are protected by a lock.
+
+    The search nodes (states) cannot be shared between processes, so each process keeps its own cache of
+    nodes indexed by id, and reconstructs missing nodes from the successors of their parents
+    (a child id is the position of the successor in `all_successors()` of its parent plus `first_child`).
+    """
+
+    DEFAULT_CAPACITY = 1_000_000
+
+    def __init__(self, root: Node, capacity: int = DEFAULT_CAPACITY, context: multiprocessing.context.BaseContext = None):
+        context = multiprocessing.get_context('fork') if context is None else context
+        self.lock = context.Lock()
+        self._size = context.RawValue('q', 0)
+        self._nof_expanded = context.RawValue('q', 0)
+        self.visits = np.frombuffer(context.RawArray('q', capacity), dtype=np.int64)
+        self.rewards = np.frombuffer(context.RawArray('d', capacity), dtype=np.float64)
+        self.parent = np.frombuffer(context.RawArray('i', capacity), dtype=np.int32)
+        self.first_child = np.frombuffer(context.RawArray('i', capacity), dtype=np.int32)
+        self.nof_children = np.frombuffer(context.RawArray('i', capacity), dtype=np.int32)
+        self.parent[:] = -1
+        self.first_child[:] = -1
+        self.nodes: dict[int, Node] = {}  # local cache of each process: id -> node
+        self.add_root(root)
+
+    def size(self) -> int:
+        return self._size.value
+
+    def __len__(self) -> int:
+        return self._nof_expanded.value
+
+    def _reserve(self, n: int):
+        if self._size.value + n > self.capacity():
+            raise SharedArraySearchTreeError(f'The shared search tree is full (capacity: {self.capacity()} nodes).')
+
+    def add_root(self, node: Node) -> int:
+        self._size.value = 1
+        self.nodes[0] = node
+        return 0
+
+    def add_children(self, node_id: int, children: list[Node]) -> range:
+        """Expand the node with the given children, unless another process has already expanded it.
+
+        Return the range of ids of the children of the node.
+        """
+        with self.lock:
+            if not self.is_expanded(node_id):
+                self._reserve(len(children))
+                first = self._size.value
+                self._size.value += len(children)
+                self.parent[first:first + len(children)] = node_id
+                self.nof_children[node_id] = len(children)
+                self.first_child[node_id] = first
+                self._nof_expanded.value += 1
+        ids = self.children(node_id)
+        for child_id, child in zip(ids, children):
+            self.nodes.setdefault(child_id, child)
+        return ids
+
+    def node(self, node_id: int) -> Node:
+        """Return the node, reconstructing it (and its missing ancestors) in the cache of this process."""
+        path = []
+        while node_id not in self.nodes:
+            path.append(node_id)
+            node_id = int(self.parent[node_id])
+        for child_id in reversed(path):
+            parent_id = int(self.parent[child_id])
+            parent = self.nodes[parent_id]
+            for i, (state, action) in enumerate(parent.state.all_successors()):
+                self.nodes.setdefault(int(self.first_child[parent_id]) + i, Node(state, parent, action))
+        return self.nodes[path[0]] if path else self.nodes[node_id]
+
+    def subtree(self, node_id: int) -> 'ArraySearchTree':
+        raise SharedArraySearchTreeError('Subtrees cannot be extracted from a shared search tree.')
@@ -1,4 +1,4 @@
-from .configuration_state import ConfigurationState, SelectFeature
+from .configuration_state import ConfigurationState, ConfigurationStateError, SelectFeature
 from .valid_config_state import (
     CompletionPartialConfigProblem,
     ValidConfigurationState,
@@ -22,7 +22,7 @@ from .optimize_config_state import (
     FindingOptimumConfigProblem
 )
 
-__all__ = [ConfigurationState, SelectFeature,
+__all__ = [ConfigurationState, ConfigurationStateError, SelectFeature,
            CompletionPartialConfigProblem, ValidConfigurationState, FindAllValidConfigurationState,
            ValidMinConfigProblem, ValidMinimumConfigurationState, FindAllValidMinimumConfigurationState,
            FindingDefectiveConfigProblem, DefectiveConfigurationState,
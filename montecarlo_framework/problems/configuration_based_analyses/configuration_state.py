@@ -1,20 +1,46 @@
 import random 
 from abc import abstractmethod
 
-from famapy.core.models import Configuration
 from famapy.metamodels.fm_metamodel.models import Feature
-from famapy.metamodels.bdd_metamodel.operations import random_configuration
 
 from montecarlo_framework.models.problem import State, Action
 from montecarlo_framework.models.feature_model import FMConfiguration
 
 
+class ConfigurationStateError(Exception):
+    """A custom exception used to report errors in use of ConfigurationState class."""
+
+
 class ConfigurationState(State):
-    """A state represents a configuration of a feature model."""
+    """A state represents a configuration of a feature model.
+
+    The random terminal states of the simulations (rollouts) are reached with the selected rollout policy
+    (see `set_rollout_policy`):
+     - RANDOM_WALK: select random configurable features until the state is terminal (default).
+     - SOLVER: complete the configuration with a single call to the solver with random phases.
+     - SOLVER_TOP_DOWN: complete the configuration with a solver call per level of the tree, from the root.
+     - BDD: complete the configuration uniformly at random using the BDD.
+    """
+
+    RANDOM_WALK = 'random_walk'
+    SOLVER = 'solver'
+    SOLVER_TOP_DOWN = 'solver_top_down'
+    BDD = 'bdd'
+    ROLLOUT_POLICIES = (RANDOM_WALK, SOLVER, SOLVER_TOP_DOWN, BDD)
+
+    rollout_policy = RANDOM_WALK
+
+    __slots__ = ('configuration', '_actions')
+
+    @classmethod
+    def set_rollout_policy(cls, rollout_policy: str) -> None:
+        """Select the rollout policy of the states of this class (and of its subclasses)."""
+        if rollout_policy not in ConfigurationState.ROLLOUT_POLICIES:
+            raise ConfigurationStateError(f'Unknown rollout policy: {rollout_policy}. Available policies: {ConfigurationState.ROLLOUT_POLICIES}.')
+        cls.rollout_policy = rollout_policy
 
     def __init__(self, configuration: FMConfiguration) -> None:
         self.configuration = configuration
-        self._hash_value = hash(configuration)
         self._actions = None
 
     def actions(self) -> list[Action]:
@@ -41,33 +67,68 @@ class ConfigurationState(State):
         return (state, action)
 
     def get_random_terminal_state(self) -> State:
-        #return self.get_random_terminal_state_bdd()
+        """Return a random terminal state from this state using the rollout policy."""
+        if self.rollout_policy == ConfigurationState.SOLVER:
+            return self.get_random_terminal_state_solver()
+        if self.rollout_policy == ConfigurationState.SOLVER_TOP_DOWN:
+            return self.get_random_terminal_state_solver(top_down=True)
+        if self.rollout_policy == ConfigurationState.BDD:
+            return self.get_random_terminal_state_bdd()
+        return self.get_random_terminal_state_random_walk()
+
+    def get_random_terminal_state_random_walk(self) -> State:
+        """Return a random terminal state from this state by selecting random configurable features.
+
+        The partial configurations of the walk are checked in a single rollout session of the solver.
+        """
         new_config = FMConfiguration.from_configuration(self.configuration)
         state = self.configuration_transition_function(new_config)
-        while not state.is_terminal():
-            random_feature = random.choice(state.configuration.get_configurable_features())
-            state.configuration.add_feature(random_feature)
+        fm = new_config.fm
+        fm.start_rollout_session(new_config)
+        try:
+            while not state.is_terminal():
+                random_feature = random.choice(state.configuration.get_configurable_features())
+                state.configuration.add_feature(random_feature)
+        finally:
+            fm.end_rollout_session()
         return state
 
+    def get_random_terminal_state_solver(self, top_down: bool = False) -> State:
+        """Return a random terminal state from this state by completing its configuration with the solver
+        (see `FM.get_random_completion`), or a copy of this state if its configuration cannot be completed."""
+        fm_config = self.configuration.fm.get_random_completion(self.configuration, top_down)
+        if fm_config is None:
+            fm_config = FMConfiguration.from_configuration(self.configuration)
+        return self.configuration_transition_function(fm_config)
+
     def get_random_terminal_state_bdd(self) -> State:
-        """Return a random terminal state from this state using the BDD sampling."""
-        assert self.configuration.fm.bdd_model is not None
-        elements = {f.name: True for f in self.configuration.get_selected_features()}
-        random_config = random_configuration(self.configuration.fm.bdd_model, Configuration(elements))
-        selected_features = [] 
-        unselected_features = [] 
-        selected_variables = [] 
-        unselected_variables = []
-        for feature_name, selected in random_config.elements.items():
-            if selected:
-                selected_features.append(self.configuration.fm.get_feature_by_name(feature_name))
-                selected_variables.append(self.configuration.fm.sat_model.variables[feature_name])
-            else:
-                unselected_features.append(self.configuration.fm.get_feature_by_name(feature_name))
-                unselected_variables.append(-self.configuration.fm.sat_model.variables[feature_name])
-        fm_config = FMConfiguration(self.configuration.fm, selected_features, unselected_features, selected_variables, unselected_variables)
+        """Return a random terminal state from this state using the BDD sampling,
+        or a copy of this state if its configuration cannot be completed."""
+        states = self.get_random_terminal_states_bdd(1)
+        if not states:
+            return self.configuration_transition_function(FMConfiguration.from_configuration(self.configuration))
+        return states[0]
+
+    def get_random_terminal_states_bdd(self, k: int) -> list[State]:
+        """Return `k` terminal states from this state drawn uniformly at random using the BDD sampling."""
+        configurations = self.configuration.fm.get_random_configurations(self.configuration, k)
+        return [self.configuration_transition_function(fm_config) for fm_config in configurations]
+
+    def to_payload(self) -> int:
+        """The bitmask of the selected features."""
+        return self.configuration.get_bitmask()
+
+    def from_payload(self, payload: int) -> 'ConfigurationState':
+        fm_config = FMConfiguration.from_bitmask(self.configuration.fm, payload)
         return self.configuration_transition_function(fm_config)
 
+    def action_from_payload(self, payload: str) -> 'SelectFeature':
+        return SelectFeature(self.configuration.fm.get_feature_by_name(payload))
+
+    def before_fork(self) -> None:
+        """Share the results of the solver with the workers (see `SATCache.enable_shared`)."""
+        self.configuration.fm.sat_cache.enable_shared()
+
     def is_terminal(self) -> bool:
         return self.configuration.is_valid_configuration() or not self.configuration.get_configurable_features()
 
@@ -75,7 +136,8 @@ class ConfigurationState(State):
         return self.configuration.is_valid_configuration()
 
     def __hash__(self) -> int:
-        return self._hash_value
+        """The hash of the configuration, which is kept up to date when the configuration changes."""
+        return hash(self.configuration)
 
     def __eq__(self, other: object) -> bool:
         return isinstance(other, ConfigurationState) and self.configuration == other.configuration
@@ -89,6 +151,8 @@ class ConfigurationState(State):
 
 
 class SelectFeature(Action):
+
+    __slots__ = ('feature',)
     
     @staticmethod
     def get_name() -> str:
@@ -101,10 +165,14 @@ class SelectFeature(Action):
         return 1.0
 
     def is_applicable(self, state: 'ConfigurationState') -> bool:
-        if self.feature in state.configuration.get_selected_features():
+        if state.configuration.is_selected(self.feature):
             return False 
         return state.configuration.is_valid_partial_configuration_with_feature(self.feature)
 
+    def to_payload(self) -> str:
+        """The name of the feature."""
+        return self.feature.name
+
     def __str__(self) -> str:
         return f"{self.get_name()} '{str(self.feature)}'"
 
@@ -9,6 +9,8 @@ PACKAGES_WITH_ERRORS_IN_WIN = ['pylgl', 'satyrn', 'pydebqbf', 'SimpleParser']
 
 class DefectiveConfigurationState(ConfigurationState):
 
+    __slots__ = ('problem',)
+
     def __init__(self, configuration: FMConfiguration, problem: Problem = None) -> None:
         super().__init__(configuration)
         self.problem = problem
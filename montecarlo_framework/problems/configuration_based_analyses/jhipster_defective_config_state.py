@@ -6,6 +6,8 @@ from montecarlo_framework.problems.configuration_based_analyses import jhipster_
 
 class JHipsterDefectiveConfigurationState(ConfigurationState):
 
+    __slots__ = ('problem',)
+
     def __init__(self, configuration: FMConfiguration, problem: Problem = None) -> None:
         super().__init__(configuration)
         self.problem = problem
@@ -25,7 +27,7 @@ class JHipsterDefectiveConfigurationState(ConfigurationState):
         elif self.configuration in self.problem.sample:
             return -1
         else:
-            return 1 if self.problem.jhipster_configurations[self.configuration] else -1
+            return 1 if self.problem.jhipster_index.is_failure(self.configuration.get_bitmask()) else -1
 
 
 class JHipsterFindingDefectiveConfigProblem(Problem):
@@ -1,10 +1,14 @@
+import os
 import csv 
 import ast
 import random 
+import hashlib
+import tempfile
 
-from famapy.metamodels.fm_metamodel.transformations.featureide_reader import FeatureIDEReader
+import numpy as np
 
-from montecarlo_framework.models.feature_model import FMConfiguration, FM
+from montecarlo_framework import __version__
+from montecarlo_framework.models.feature_model import FMConfiguration, FM, FMCache
 
 JHIPSTER_CONFIGS_FILE = "models/jhipster/jhipster3.6.1-testresults.csv"
 JHIPSTER_CONFIGS_FAILURES_FILE = "models/jhipster/jhipster3.6.1-configs-failures.csv"
@@ -98,32 +102,141 @@ def read_jHipster_configurations() -> list:
     return configs
 
 
-def read_jHipster_feature_model_configurations() -> dict:
-    """Read the configurations of the jHipster feature model from the .csv file."""
-        # Read the feature model without constraints
-    feature_model = FeatureIDEReader(FM_FILE).transform()
-    fm = FM(feature_model)
-    configs = {}
-    with open(JHIPSTER_CONFIGS_FAILURES_FILE) as csvfile:
-        reader = csv.DictReader(csvfile, delimiter=',', quotechar='"', skipinitialspace=True)
-        for row in reader:
-            features = ast.literal_eval(row['Config'])
-            config_features = {fm.get_feature_by_name(f): True for f in features}
-            selected_features = list(config_features.keys())
-            unselected_features = list(set(feature_model.get_features()) - set(selected_features))
-            selected_variables = [fm.sat_model.variables[f.name] for f in selected_features]
-            unselected_variables = [-fm.sat_model.variables[f.name] for f in unselected_features]
-            configuration = FMConfiguration(fm, selected_features, unselected_features, selected_variables, unselected_variables)
-            failure = ast.literal_eval(row['Failure'])
-            configs[configuration] = failure
-            
-    return configs
-
-
-def get_random_sampling(sample_size: int) -> tuple:
-    jhipster_configurations = read_jHipster_feature_model_configurations()
-
-    configs_sample = random.sample(list(jhipster_configurations.keys()), sample_size)
-    n_positive_evaluations = len([x for x in configs_sample if jhipster_configurations[x]])
-
-    return (configs_sample, n_positive_evaluations)
\ No newline at end of file
+class JHipsterIndex():
+    """Index of the jHipster test results: bitmask of each configuration (in a FM) -> flags.
+
+    The flags of a configuration are its failure (from the configurations failures .csv file) and, if the configuration
+    is found in the test results .csv file (with the filters of `JHIPSTER_FILTERS`), its status: tested, build KO and compile KO.
+    The index is built once (the test results are filtered with bitsets of rows instead of lists) and serialized
+    in the cache directory of the feature models (see `FMCache`), in an entry named by a content hash of the .csv files,
+    the version of the framework and the features of the FM (the order of the bits of the bitmasks).
+    The entry is a .npz file with the bitmasks (as little-endian bytes) and the flags, which is loaded in O(rows).
+    """
+
+    FAILURE = 1
+    TESTED = 2
+    BUILD_KO = 4
+    COMPILE_KO = 8
+
+    def __init__(self, bitmasks: list[int], flags: list[int]) -> None:
+        self.bitmasks = bitmasks
+        self._flags = dict(zip(bitmasks, flags))
+
+    def __len__(self) -> int:
+        return len(self._flags)
+
+    def __contains__(self, bitmask: int) -> bool:
+        return bitmask in self._flags
+
+    def get_flags(self, bitmask: int) -> int:
+        """Flags of the configuration (0 if the configuration is not in the index)."""
+        return self._flags.get(bitmask, 0)
+
+    def is_failure(self, bitmask: int) -> bool:
+        return bool(self.get_flags(bitmask) & JHipsterIndex.FAILURE)
+
+    def contains_failures(self, bitmask: int) -> bool:
+        """Return True if the build or the compilation of the tested configuration is KO,
+        i.e., the module function `contains_failures` of its row of the test results (False if it is not tested)."""
+        return bool(self.get_flags(bitmask) & (JHipsterIndex.BUILD_KO | JHipsterIndex.COMPILE_KO))
+
+    @staticmethod
+    def get_key(fm: FM) -> str:
+        """Content hash of the .csv files, the version of the framework and the features of the FM."""
+        digest = hashlib.sha256()
+        for filepath in [JHIPSTER_CONFIGS_FILE, JHIPSTER_CONFIGS_FAILURES_FILE]:
+            with open(filepath, 'rb') as file:
+                for chunk in iter(lambda: file.read(1 << 20), b''):
+                    digest.update(chunk)
+        digest.update(__version__.encode())
+        digest.update(','.join(fm.index.names).encode())
+        return digest.hexdigest()
+
+    @classmethod
+    def load(cls, fm: FM, cache_dir: str = FMCache.DEFAULT_DIR) -> 'JHipsterIndex':
+        """Return the index of the test results for the FM, building and caching it on the first load."""
+        entry = os.path.join(cache_dir, f'jhipster-{JHipsterIndex.get_key(fm)}.npz')
+        if os.path.exists(entry):
+            with np.load(entry) as data:
+                bitmasks = [int.from_bytes(row.tobytes(), 'little') for row in data['bitmasks']]
+                return cls(bitmasks, data['flags'].tolist())
+        index = cls.build(fm)
+        index._store(entry, len(fm.index))
+        return index
+
+    @classmethod
+    def build(cls, fm: FM) -> 'JHipsterIndex':
+        """Build the index of the test results from the .csv files."""
+        rows = read_jHipster_configurations()
+        # Bitset of the rows with each value of each variation point
+        variation_points = {variation_point for variation_point, _, _ in JHIPSTER_FILTERS.values()}
+        rows_by_value: dict[tuple[str, str], int] = {}
+        for i, row in enumerate(rows):
+            for variation_point in variation_points:
+                key = (variation_point, row[variation_point])
+                rows_by_value[key] = rows_by_value.get(key, 0) | (1 << i)
+        all_rows = (1 << len(rows)) - 1
+
+        bitmasks = []
+        flags = []
+        with open(JHIPSTER_CONFIGS_FAILURES_FILE) as csvfile:
+            reader = csv.DictReader(csvfile, delimiter=',', quotechar='"', skipinitialspace=True)
+            for row in reader:
+                names = ast.literal_eval(row['Config'])
+                config_flags = JHipsterIndex.FAILURE if ast.literal_eval(row['Failure']) else 0
+                # Same filters as `filter_configuration`
+                candidates = all_rows
+                for name, (variation_point, variant, value_not_selected) in JHIPSTER_FILTERS.items():
+                    if name in names:
+                        candidates &= rows_by_value.get((variation_point, variant), 0)
+                    elif value_not_selected not in ['-', variant]:
+                        candidates &= ~rows_by_value.get((variation_point, variant), 0)
+                if candidates and candidates & (candidates - 1) == 0:  # a single row
+                    jhipster_configuration = rows[candidates.bit_length() - 1]
+                    config_flags |= JHipsterIndex.TESTED
+                    config_flags |= JHipsterIndex.BUILD_KO if jhipster_configuration['Build'] == 'KO' else 0
+                    config_flags |= JHipsterIndex.COMPILE_KO if jhipster_configuration['Compile'] == 'KO' else 0
+                bitmasks.append(fm.index.get_bitmask(names))
+                flags.append(config_flags)
+        return cls(bitmasks, flags)
+
+    def _store(self, entry: str, nof_features: int) -> None:
+        nof_bytes = (nof_features + 7) // 8
+        data = b''.join(bitmask.to_bytes(nof_bytes, 'little') for bitmask in self.bitmasks)
+        bitmasks = np.frombuffer(data, dtype=np.uint8).reshape(len(self.bitmasks), nof_bytes)
+        flags = np.array([self._flags[bitmask] for bitmask in self.bitmasks], dtype=np.int8)
+        cache_dir = os.path.dirname(entry)
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_fd, tmp_file = tempfile.mkstemp(dir=cache_dir, suffix='.npz')
+        try:
+            with os.fdopen(tmp_fd, 'wb') as file:
+                np.savez(file, bitmasks=bitmasks, flags=flags)
+            os.replace(tmp_file, entry)
+        except OSError:
+            # The cache is not writable
+            if os.path.exists(tmp_file):
+                os.remove(tmp_file)
+
+
+def read_jHipster_feature_model_configurations(fm: FM = None) -> dict:
+    """Read the configurations of the jHipster feature model from the .csv file.
+
+    Return a dictionary of FMConfiguration -> failure, using the index of the test results (see `JHipsterIndex`).
+    If the FM is not given, the jHipster feature model is loaded (see `FMCache`).
+    """
+    if fm is None:
+        fm = FMCache().load(FM_FILE)
+    index = JHipsterIndex.load(fm)
+    return {FMConfiguration.from_bitmask(fm, bitmask): index.is_failure(bitmask) for bitmask in index.bitmasks}
+
+
+def get_random_sampling(sample_size: int, fm: FM = None) -> tuple:
+    if fm is None:
+        fm = FMCache().load(FM_FILE)
+    index = JHipsterIndex.load(fm)
+
+    bitmasks_sample = random.sample(index.bitmasks, sample_size)
+    n_positive_evaluations = sum(1 for bitmask in bitmasks_sample if index.is_failure(bitmask))
+    configs_sample = [FMConfiguration.from_bitmask(fm, bitmask) for bitmask in bitmasks_sample]
+
+    return (configs_sample, n_positive_evaluations)
@@ -11,6 +11,8 @@ from montecarlo_framework.problems.configuration_based_analyses import Configura
 
 class OptimizeConfigurationState(ConfigurationState):
 
+    __slots__ = ('attributes', 'problem')
+
     def __init__(self, configuration: FMConfiguration, attributes: dict[Feature, dict[str, Any]], problem: Problem = None) -> None:
         super().__init__(configuration)
         self.attributes = attributes
@@ -6,6 +6,8 @@ from montecarlo_framework.problems.configuration_based_analyses import Configura
 
 class ValidConfigurationState(ConfigurationState):
 
+    __slots__ = ()
+
     def configuration_transition_function(self, configuration: FMConfiguration) -> 'ConfigurationState':
         return ValidConfigurationState(configuration)
 
@@ -18,6 +20,8 @@ class ValidConfigurationState(ConfigurationState):
 
 class FindAllValidConfigurationState(ValidConfigurationState):
 
+    __slots__ = ('problem',)
+
     def __init__(self, configuration: FMConfiguration, problem: Problem = None) -> None:
         super().__init__(configuration)
         self.problem = problem
@@ -29,7 +33,7 @@ class FindAllValidConfigurationState(ValidConfigurationState):
         return FindAllValidConfigurationState(configuration, self.problem)
 
     def reward(self) -> float:
-        if self.configuration in self.problem.get_solutions():
+        if self.problem.is_solution(self):
             return float("-inf")
         return super().reward()
 
@@ -1,11 +1,13 @@
 from montecarlo_framework.models import Problem 
 
 from montecarlo_framework.models.feature_model import FMConfiguration
-from montecarlo_framework.problems.configuration_based_analyses import ConfigurationState, ValidConfigurationState
+from montecarlo_framework.problems.configuration_based_analyses import ConfigurationState, ValidConfigurationState, FindAllValidConfigurationState
 
 
 class ValidMinimumConfigurationState(ValidConfigurationState):
 
+    __slots__ = ()
+
     def configuration_transition_function(self, configuration: FMConfiguration) -> 'ConfigurationState':
         return ValidMinimumConfigurationState(configuration)
 
@@ -16,11 +18,18 @@ class ValidMinimumConfigurationState(ValidConfigurationState):
         return n
 
 
-class FindAllValidMinimumConfigurationState(ValidConfigurationState):
+class FindAllValidMinimumConfigurationState(FindAllValidConfigurationState):
+
+    __slots__ = ()
 
     def configuration_transition_function(self, configuration: FMConfiguration) -> 'ConfigurationState':
         return FindAllValidMinimumConfigurationState(configuration, self.problem)
 
+    def reward(self) -> float:
+        if self.problem.is_solution(self):
+            return float("-inf")
+        return ValidMinimumConfigurationState.reward(self)
+
 
 class ValidMinConfigProblem(Problem):
 
@@ -251,6 +251,13 @@ class FMState(State):
         self.configurations = configurations
         self.missing_features = self._get_missing_features()
         self._actions = None
+        self._fm = None
+
+    def get_fm(self) -> FM:
+        """Helper of the feature model of this state (only with the SAT backend), built on first use."""
+        if self._fm is None:
+            self._fm = FM(self.feature_model, backends=(FM.SAT,))
+        return self._fm
 
     def _get_missing_features(self) -> list[Feature]:
         """Return the set of features in the configurations that are missing in the feature model."""
@@ -434,9 +441,9 @@ class FMState(State):
                 We want to minimize this value.
         """
         #print(f"FM: {self.feature_model}")
-        fm = FM(self.feature_model)
+        fm = self.get_fm()
         #configurations_captured = aafms_helper.get_configurations()
-        relaxed_value = reduce(lambda count, c: count + (fm.is_valid_configuration(c)), self.configurations, 0)
+        relaxed_value = sum(fm.are_valid_configurations(self.configurations))
         #deficit_value = reduce(lambda count, c: count + (c not in configurations_captured), self.configurations, 0)
         #surplus_value = reduce(lambda count, c: count + (c not in self.configurations), configurations_captured, 0)
 
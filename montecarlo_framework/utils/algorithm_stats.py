@@ -50,6 +50,7 @@ class AlgorithmStats(ContextDecorator):
     logger: Optional[Callable[[str], None]] = print  # by default this is replaced in the post_init
     precision_decimal_digits: int = 4
     stats: ClassVar[dict[int, dict[str, Any]]] = {}
+    last_run: ClassVar[Optional[tuple[str, int]]] = None  # (stats_name, run) of the last stats recorded
     _run: int = field(default=0, init=False, repr=False)
     _start_time: float = field(default=None, init=False, repr=False)
     _memory_peak_usage: int = field(default=None, init=False, repr=False)
@@ -88,12 +89,30 @@ class AlgorithmStats(ContextDecorator):
         AlgorithmStats.stats[self.stats_name][run][AlgorithmStats.TIME_STR] = time
         AlgorithmStats.stats[self.stats_name][run][AlgorithmStats.MEMORY_STR] = memory
         AlgorithmStats.stats[self.stats_name][run][AlgorithmStats.SOLUTION_STR] = solution_state
+        AlgorithmStats.last_run = (self.stats_name, run)
 
     @staticmethod
     def get_stats(stats_name: str) -> list[dict[str, Any]]:
         stats_name = stats_name.lower()
         return [AlgorithmStats.stats[stats_name][run] for run in AlgorithmStats.stats[stats_name]]
 
+    @staticmethod
+    def pop_last_stats() -> dict[str, Any]:
+        """Remove and return the stats of the last run recorded (by any decorated algorithm)."""
+        if AlgorithmStats.last_run is None:
+            raise AlgorithmStatsError('No stats have been recorded. Use @AlgorithmStats(stats_name) decorator over a `run` method.')
+        stats_name, run = AlgorithmStats.last_run
+        AlgorithmStats.last_run = None
+        return AlgorithmStats.stats[stats_name].pop(run)
+
+    @staticmethod
+    def add_stats(stats_name: str, run: int, stats: dict[str, Any]):
+        """Record the stats of a run performed elsewhere (e.g., in another process)."""
+        stats_name = stats_name.lower()
+        AlgorithmStats.stats.setdefault(stats_name, {})
+        AlgorithmStats.stats[stats_name][run] = dict(stats)
+        AlgorithmStats.stats[stats_name][run][AlgorithmStats.RUN_STR] = run
+
     @staticmethod
     def get_best_solutions_stats(best_solution: Solution) -> list[dict[str, Any]]:
         best_stats = []
@@ -154,7 +173,7 @@ class AlgorithmStats(ContextDecorator):
         if isinstance(algorithm, MonteCarloAlgorithm):
             simulations = algorithm.get_decision_stopping_condition().get_value()
             total_simulations = algorithm.get_total_nof_simulations()
-            tree_size = len(algorithm.tree) if isinstance(algorithm, MonteCarloTreeSearch) else 0
+            tree_size = algorithm.get_tree_size() if isinstance(algorithm, MonteCarloTreeSearch) else 0
             evaluations = algorithm.get_nof_terminal_states_evaluated()
             positive_evaluations = algorithm.get_total_nof_positive_evaluations()
         else:
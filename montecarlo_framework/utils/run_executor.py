@@ -0,0 +1,88 @@
+import os
+import random
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any
+
+from montecarlo_framework.models import Problem, Solution
+from montecarlo_framework.algorithms import Algorithm
+from montecarlo_framework.utils.algorithm_stats import AlgorithmStats
+
+
+# Algorithm and problem of each worker process (set once by the executor initializer).
+_worker_algorithm: Algorithm = None
+_worker_problem: Problem = None
+
+
+def _initialize_worker(algorithm: Algorithm, problem: Problem):
+    global _worker_algorithm, _worker_problem
+    _worker_algorithm = algorithm
+    _worker_problem = problem
+
+
+def get_nof_parallel_workers(nof_workers: int) -> int:
+    """Number of processes of each parallel algorithm when `nof_workers` runs are executed in parallel.
+
+    The CPUs are split between the runs executed in parallel and the processes of each parallel algorithm.
+    """
+    return max(1, os.cpu_count() // nof_workers)
+
+
+def _run(algorithm: Algorithm, problem: Problem, seed: int) -> tuple[Solution, dict[str, Any]]:
+    """Execute a run of the algorithm and return its solution and the stats recorded by its decorator."""
+    random.seed(seed)
+    algorithm.initialize()
+    solution = algorithm.run(problem)
+    return (solution, AlgorithmStats.pop_last_stats())
+
+
+def _execute_run(seed: int) -> tuple[Any, dict[str, Any]]:
+    """Execute a run of the algorithm of the worker and return the payloads of the solution and of its stats."""
+    solution, stats = _run(_worker_algorithm, _worker_problem, seed)
+    stats[AlgorithmStats.SOLUTION_STR] = stats[AlgorithmStats.SOLUTION_STR].to_payload()
+    return (solution.to_payload() if solution is not None else None, stats)
+
+
+def execute_runs(algorithm: Algorithm, problem: Problem, runs: int, stats_name: str, nof_workers: int = 1) -> list[Solution]:
+    """Execute several independent runs of the algorithm over the problem and return their solutions (in order).
+
+    Each run uses its own seed drawn from the `random` module, so the results are reproducible
+    with the same seed regardless of the number of workers.
+    With several workers, the runs are spread over a pool of forked processes that inherit the algorithm and problem;
+    the solutions and the stats rows of the workers are gathered in this process.
+    In both cases, the stats row of each run (recorded by the `AlgorithmStats` decorator of the algorithm,
+    whatever its name) is stored as the row of the run number in `stats_name`, so the stats can be serialized.
+    Note that runs are independent: solutions registered in the problem by a run are not seen by the others.
+    """
+    seeds = [random.randrange(2**32) for _ in range(runs)]
+    print('  |run: ', end='', flush=True)
+    if nof_workers <= 1:
+        solutions = []
+        for r, seed in enumerate(seeds):
+            print(f'{r+1} ', end='', flush=True)
+            solution, stats = _run(algorithm, problem, seed)
+            solutions.append(solution)
+            AlgorithmStats.add_stats(stats_name, r + 1, stats)
+        print()
+        return solutions
+
+    initial_state = problem.get_initial_state()
+    initial_state.before_fork()
+    solutions = [None] * runs
+    runs_stats = [None] * runs
+    context = multiprocessing.get_context('fork')
+    # Worker processes of the executor are not daemonic, so parallel algorithms can create their own pools.
+    with ProcessPoolExecutor(nof_workers, mp_context=context, initializer=_initialize_worker, initargs=(algorithm, problem)) as executor:
+        futures = {executor.submit(_execute_run, seed): r for r, seed in enumerate(seeds)}
+        for future in as_completed(futures):
+            r = futures[future]
+            solution_payload, stats = future.result()
+            print(f'{r+1} ', end='', flush=True)
+            if solution_payload is not None:
+                solutions[r] = Solution.from_payload(solution_payload, initial_state)
+            stats[AlgorithmStats.SOLUTION_STR] = initial_state.from_payload(stats[AlgorithmStats.SOLUTION_STR])
+            runs_stats[r] = stats
+    print()
+    for r, stats in enumerate(runs_stats):
+        AlgorithmStats.add_stats(stats_name, r + 1, stats)
+    return solutions
@@ -0,0 +1,64 @@
+import glob
+import os
+import random
+import sys
+
+import pytest
+from pysat.solvers import Glucose3
+
+# setting path
+sys.path.append('.')
+
+from montecarlo_framework.models.feature_model import FM, FMConfiguration, StreamingFeatureIDEReader
+
+
+MODELS = sorted(os.path.splitext(os.path.basename(f))[0] for f in glob.glob('models/*.xml'))
+INPUT_MODELS_FOLDER = 'models/'
+EXTENSION = '.xml'
+SEED = 2022
+NOF_CONFIGURATIONS = 50  # of each kind (valid, near valid and random)
+BATCH_SIZES = [1, 7, 63, 64, 65, 150]  # including sizes that are not multiple of 64 (the configurations packed in a word)
+
+
+def get_model(model_name: str) -> FM:
+    feature_model, sat_model = StreamingFeatureIDEReader(INPUT_MODELS_FOLDER + model_name + EXTENSION).transform()
+    return FM(feature_model, sat_model=sat_model, backends=(FM.SAT,))
+
+
+def get_random_configurations(fm: FM) -> list[FMConfiguration]:
+    """Random complete configurations: valid ones (random completions of the empty configuration),
+    the same ones with a random feature flipped (near the boundary of the valid configurations), and random ones."""
+    valid = [fm.get_random_completion(FMConfiguration(fm)) for _ in range(NOF_CONFIGURATIONS)]
+    bitmasks = [c.get_bitmask() for c in valid if c is not None]
+    bitmasks += [bitmask ^ (1 << random.randrange(len(fm.features))) for bitmask in list(bitmasks)]
+    bitmasks += [random.getrandbits(len(fm.features)) for _ in range(NOF_CONFIGURATIONS)]
+    random.shuffle(bitmasks)
+    return [FMConfiguration.from_bitmask(fm, bitmask) for bitmask in bitmasks]
+
+
+def get_solver_validity(fm: FM, configurations: list[FMConfiguration]) -> list[bool]:
+    """Validity of each configuration according to a new solver, with all the variables assigned as assumptions."""
+    with Glucose3(bootstrap_with=fm.sat_model.get_all_clauses()) as solver:
+        return [solver.solve(assumptions=c.get_selected_variables() + c.get_unselected_variables()) for c in configurations]
+
+
+@pytest.mark.parametrize("model_name", MODELS)
+def test_is_valid_configuration(model_name: str):
+    """The clauses evaluated for a complete configuration agree with the solver."""
+    random.seed(SEED)
+    fm = get_model(model_name)
+    configurations = get_random_configurations(fm)
+    expected = get_solver_validity(fm, configurations)
+    assert any(expected)
+    assert [fm.is_valid_configuration(c) for c in configurations] == expected
+
+
+@pytest.mark.parametrize("model_name", MODELS)
+@pytest.mark.parametrize("batch_size", BATCH_SIZES)
+def test_are_valid_configurations(model_name: str, batch_size: int):
+    """The clauses evaluated for a batch of complete configurations (in parallel by bits) agree with the solver."""
+    random.seed(SEED)
+    fm = get_model(model_name)
+    configurations = get_random_configurations(fm)
+    configurations = (configurations * (batch_size // len(configurations) + 1))[:batch_size]
+    assert fm.are_valid_configurations(configurations) == get_solver_validity(fm, configurations)
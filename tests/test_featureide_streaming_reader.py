@@ -0,0 +1,84 @@
+import glob
+import os
+import sys
+
+import pytest
+from pysat.solvers import Minisat22
+
+# setting path
+sys.path.append('.')
+
+from famapy.core.models.ast import Node, ASTOperation
+from famapy.metamodels.fm_metamodel.models import FeatureModel
+from famapy.metamodels.fm_metamodel.transformations.featureide_reader import FeatureIDEReader
+from famapy.metamodels.pysat_metamodel.transformations.fm_to_pysat import FmToPysat
+
+from montecarlo_framework.models.feature_model import StreamingFeatureIDEReader
+
+
+MODELS = sorted(os.path.splitext(os.path.basename(f))[0] for f in glob.glob('models/*.xml'))
+INPUT_MODELS_FOLDER = 'models/'
+EXTENSION = '.xml'
+
+
+def get_tree(feature_model: FeatureModel) -> dict[str, tuple]:
+    """Parent, abstract flag and relations (cardinalities and children) of each feature, by name."""
+    return {f.name: (f.get_parent().name if f.get_parent() is not None else None,
+                     bool(f.is_abstract),
+                     [(r.card_min, r.card_max, [c.name for c in r.children]) for r in f.get_relations()])
+            for f in feature_model.get_features()}
+
+
+def encode(node: Node, variables: dict[str, int], clauses: list[list[int]]) -> int:
+    """Literal equivalent to the formula of the AST node, adding the clauses that define it (Tseitin encoding)
+    with new variables numbered after the last one."""
+    if not node.is_op():
+        return variables[node.data.strip()]
+    if node.data == ASTOperation.NOT:
+        return -encode(node.left, variables, clauses)
+    a = encode(node.left, variables, clauses)
+    b = encode(node.right, variables, clauses)
+    t = len(variables) + 1
+    variables[f'#{t}'] = t
+    if node.data == ASTOperation.AND:
+        clauses += [[-t, a], [-t, b], [t, -a, -b]]
+    elif node.data == ASTOperation.OR:
+        clauses += [[-t, a, b], [t, -a], [t, -b]]
+    elif node.data in (ASTOperation.IMPLIES, ASTOperation.REQUIRES):
+        clauses += [[-t, -a, b], [t, a], [t, -b]]
+    elif node.data == ASTOperation.EXCLUDES:
+        clauses += [[-t, -a, -b], [t, a], [t, b]]
+    elif node.data == ASTOperation.EQUIVALENCE:
+        clauses += [[-t, -a, b], [-t, a, -b], [t, a, b], [t, -a, -b]]
+    else:
+        raise ValueError(f'Unknown operation {node.data}')
+    return t
+
+
+@pytest.mark.parametrize("model_name", MODELS)
+def test_streaming_reader(model_name: str):
+    """The streaming reader reads the same tree and constraints as `FeatureIDEReader`, and its clauses are those of
+    `FmToPysat` for the tree and are equivalent to the constraints (to their formulas, encoded independently,
+    because the CNF conversion of the ASTs in famapy loses the negations nested in other operations).
+    The clauses are checked with another solver than that of the framework (Glucose3)."""
+    filepath = INPUT_MODELS_FOLDER + model_name + EXTENSION
+    expected_model = FeatureIDEReader(filepath).transform()
+    feature_model, sat_model = StreamingFeatureIDEReader(filepath).transform()
+
+    assert get_tree(feature_model) == get_tree(expected_model)
+    assert [(c.name, str(c.ast)) for c in feature_model.get_constraints()] == [(c.name, str(c.ast)) for c in expected_model.get_constraints()]
+
+    variables = dict(sat_model.variables)
+    tree_model = FmToPysat(FeatureModel(expected_model.root, [])).transform()
+    names = {v: n for n, v in tree_model.variables.items()}
+    expected_tree_clauses = {frozenset(variables[names[abs(l)]] * (1 if l > 0 else -1) for l in c) for c in tree_model.get_all_clauses()}
+    assert {frozenset(c) for c in sat_model.r_cnf.clauses} == expected_tree_clauses
+
+    definitions = []
+    literals = [encode(c.ast.root, variables, definitions) for c in expected_model.get_constraints()]
+    # The clauses imply each constraint
+    with Minisat22(bootstrap_with=sat_model.get_all_clauses().clauses + definitions) as solver:
+        assert not any(solver.solve(assumptions=[-l]) for l in literals)
+    # The tree and the constraints imply each clause of the constraints
+    with Minisat22(bootstrap_with=sat_model.r_cnf.clauses + definitions + [[l] for l in literals]) as solver:
+        assert not any(solver.solve(assumptions=[-l for l in clause]) for clause in sat_model.ctc_cnf.clauses)
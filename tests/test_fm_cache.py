@@ -0,0 +1,58 @@
+import os
+import sys
+
+import pytest
+
+# setting path
+sys.path.append('.')
+
+from famapy.metamodels.fm_metamodel.models import FeatureModel
+
+from montecarlo_framework.models.feature_model import FM, FMCache
+
+
+MODELS = ['pizzas', 'GPL', 'wget', 'tankwar', 'mobilemedia2', 'jHipster', 'aafms_framework', 'WeaFQAs', 'busybox-1.18.0', 'embtoolkit']
+INPUT_MODELS_FOLDER = 'models/'
+EXTENSION = '.xml'
+
+
+def get_tree(feature_model: FeatureModel) -> dict[str, tuple]:
+    """Parent, abstract flag and relations (cardinalities and children) of each feature, by name."""
+    return {f.name: (f.get_parent().name if f.get_parent() is not None else None,
+                     bool(f.is_abstract),
+                     [(r.card_min, r.card_max, [c.name for c in r.children]) for r in f.get_relations()])
+            for f in feature_model.get_features()}
+
+
+def get_constraints(feature_model: FeatureModel) -> list[tuple[str, str]]:
+    return [(ctc.name, str(ctc.ast)) for ctc in feature_model.get_constraints()]
+
+
+def get_analysis(fm: FM) -> tuple:
+    analysis = fm.get_analysis()
+    return analysis.valid, analysis.core, analysis.dead, analysis.false_optional, analysis.atomic_sets
+
+
+@pytest.mark.parametrize("model_name", MODELS)
+def test_warm_load(model_name: str, tmp_path):
+    """A warm load (from the entry stored by the cold load) returns the same feature model (tree and cross-tree
+    constraints), SAT model and analysis as the cold load (from the XML file)."""
+    filepath = INPUT_MODELS_FOLDER + model_name + EXTENSION
+    cache = FMCache(str(tmp_path))
+    cold_fm = cache.load(filepath, backends=(FM.SAT,))
+    assert os.listdir(str(tmp_path)) == [FMCache.get_key(filepath)]
+    warm_fm = cache.load(filepath, backends=(FM.SAT,))
+    assert warm_fm.fm_model is not cold_fm.fm_model
+
+    assert get_tree(warm_fm.fm_model) == get_tree(cold_fm.fm_model)
+    assert warm_fm.index.names == cold_fm.index.names
+    assert get_constraints(warm_fm.fm_model) == get_constraints(cold_fm.fm_model)
+    assert len(cold_fm.fm_model.get_constraints()) == open(filepath, encoding='utf8').read().count('<rule')
+
+    assert warm_fm.sat_model.variables == cold_fm.sat_model.variables
+    assert warm_fm.sat_model.features == cold_fm.sat_model.features
+    assert warm_fm.sat_model.r_cnf.clauses == cold_fm.sat_model.r_cnf.clauses
+    assert warm_fm.sat_model.ctc_cnf.clauses == cold_fm.sat_model.ctc_cnf.clauses
+
+    # The analysis of the warm load is restored from the entry, and that of the cold load is computed again
+    assert get_analysis(warm_fm) == get_analysis(FM(cold_fm.fm_model, sat_model=cold_fm.sat_model, backends=(FM.SAT,)))
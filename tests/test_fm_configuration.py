@@ -0,0 +1,140 @@
+import random
+import sys
+
+import pytest
+from pysat.solvers import Glucose3
+
+# setting path
+sys.path.append('.')
+
+from montecarlo_framework.models.feature_model import FM, FMConfiguration, StreamingFeatureIDEReader
+from montecarlo_framework.models.feature_model.feature_tree_index import ALTERNATIVE
+
+
+MODELS = ['pizzas', 'GPL', 'wget', 'tankwar', 'mobilemedia2', 'jHipster', 'aafms_framework', 'WeaFQAs']  # small models (one solver call per step)
+INPUT_MODELS_FOLDER = 'models/'
+EXTENSION = '.xml'
+SEED = 2022
+NOF_WALKS = 20
+NOF_PARTIAL_CONFIGURATIONS = 30
+
+
+def get_model(model_name: str, atomic_sets: bool = False) -> FM:
+    feature_model, sat_model = StreamingFeatureIDEReader(INPUT_MODELS_FOLDER + model_name + EXTENSION).transform()
+    return FM(feature_model, sat_model=sat_model, backends=(FM.SAT,), atomic_sets=atomic_sets)
+
+
+def get_alternative_siblings(fm: FM, index: int) -> set[int]:
+    """Indexes of the other children of the alternative group of the feature (empty if it is not in an alternative group)."""
+    if fm.index.relation_kind[index] != ALTERNATIVE:
+        return set()
+    group = fm.index.group[index]
+    return set(range(fm.index.group_start[group], fm.index.group_end[group])) - {index}
+
+
+@pytest.mark.parametrize("model_name", MODELS)
+@pytest.mark.parametrize("atomic_sets", [False, True])
+def test_incremental_configurable_indexes(model_name: str, atomic_sets: bool):
+    """The configurable features updated incrementally after each `add_feature` along random walks are those
+    computed from scratch for the same selected features (with another FM, so the SAT cache is not shared)."""
+    random.seed(SEED)
+    fm = get_model(model_name, atomic_sets)
+    reference_fm = get_model(model_name, atomic_sets)
+    nof_dropped_siblings = 0
+    for _ in range(NOF_WALKS):
+        configuration = FMConfiguration(fm)
+        configurable_indexes = configuration.get_configurable_indexes()
+        while configurable_indexes:
+            index = random.choice(configurable_indexes)
+            configuration.add_feature(fm.features[index])
+            # Some steps select two features before the configurable features are requested again
+            if random.getrandbits(1):
+                pending_indexes = [i for i in configurable_indexes if i != index and not get_alternative_siblings(fm, index) & {i}]
+                if pending_indexes:
+                    configuration.add_feature(fm.features[random.choice(pending_indexes)])
+            previous_indexes = configurable_indexes
+            configurable_indexes = configuration.get_configurable_indexes()
+            expected = FMConfiguration.from_bitmask(reference_fm, configuration.get_bitmask()).get_configurable_indexes()
+            assert configurable_indexes == expected
+            # The siblings of a selected feature in an alternative group are not configurable anymore
+            siblings = get_alternative_siblings(fm, index)
+            assert not siblings & set(configurable_indexes)
+            nof_dropped_siblings += len(siblings & set(previous_indexes))
+    if any(kind == ALTERNATIVE for kind in fm.index.relation_kind):
+        assert nof_dropped_siblings > 0
+
+
+def get_random_partial_configurations(fm: FM) -> list[FMConfiguration]:
+    """Valid partial configurations (random subsets of the features of random completions)
+    and random partial configurations (most of them not valid)."""
+    bitmasks = []
+    for _ in range(NOF_PARTIAL_CONFIGURATIONS):
+        configuration = fm.get_random_completion(FMConfiguration(fm))
+        selected = configuration.get_selected_indexes()
+        bitmasks.append(fm.index.get_bitmask([fm.index.names[i] for i in random.sample(selected, random.randint(0, len(selected)))]))
+        bitmasks.append(random.getrandbits(len(fm.features)) & random.getrandbits(len(fm.features)))
+    return [FMConfiguration.from_bitmask(fm, bitmask) for bitmask in bitmasks]
+
+
+@pytest.mark.parametrize("model_name", MODELS + ['busybox-1.18.0'])
+def test_valid_indexes(model_name: str):
+    """The features valid when added to a partial configuration (propagation, a single solve and the models found)
+    are those for which a new solver finds the partial configuration with the feature satisfiable, one call per feature.
+    Propagation only settles features correctly: implied features are valid and refuted features are not."""
+    random.seed(SEED)
+    fm = get_model(model_name)
+    with Glucose3(bootstrap_with=fm.sat_model.get_all_clauses()) as solver:
+        for configuration in get_random_partial_configurations(fm):
+            candidates = fm.get_indexes(fm.full_bitmask & ~configuration.get_bitmask())
+            random.shuffle(candidates)
+            assumptions = configuration.get_selected_variables()
+            expected = [i for i in candidates if solver.solve(assumptions=assumptions + [fm.variables[i]])]
+            assert fm.get_valid_indexes(configuration, candidates) == expected
+            propagation = fm.propagate(configuration)
+            if propagation is not None:
+                implied, refuted = propagation
+                valid_variables = {fm.variables[i] for i in expected}
+                if solver.solve(assumptions=assumptions):
+                    assert implied - set(assumptions) <= valid_variables
+                assert not refuted & valid_variables
+            else:
+                assert not solver.solve(assumptions=assumptions)
+
+
+@pytest.mark.parametrize("model_name", MODELS)
+def test_zobrist_hash(model_name: str):
+    """Configurations with the same selected features have the same hash (and are equal), whether they are built
+    from the bitmask, by adding the features in any order (with the hash updated incrementally or computed at the end),
+    by removing features, or by selecting whole atomic sets."""
+    random.seed(SEED)
+    fm = get_model(model_name)
+    atomic_sets_fm = get_model(model_name, atomic_sets=True)
+    for _ in range(NOF_PARTIAL_CONFIGURATIONS):
+        indexes = fm.get_random_completion(FMConfiguration(fm)).get_selected_indexes()
+        bitmask = fm.index.get_bitmask([fm.index.names[i] for i in indexes])
+        expected = FMConfiguration.from_bitmask(fm, bitmask)
+        configurations = []
+        for incremental in [False, True]:
+            configuration = FMConfiguration(fm)
+            if incremental:
+                hash(configuration)
+            for i in random.sample(indexes, len(indexes)):
+                configuration.add_feature(fm.features[i])
+            configurations.append(configuration)
+        configuration = FMConfiguration.from_bitmask(fm, fm.full_bitmask)
+        hash(configuration)
+        for i in random.sample(fm.get_indexes(fm.full_bitmask & ~bitmask), len(fm.features) - len(indexes)):
+            configuration.remove_feature(fm.features[i])
+        configurations.append(configuration)
+        configurations.append(FMConfiguration.from_configuration(configurations[1]))
+        # Selecting a feature of a valid configuration selects its whole atomic set (they are also in the configuration)
+        configuration = FMConfiguration(atomic_sets_fm)
+        hash(configuration)
+        for i in random.sample(indexes, len(indexes)):
+            configuration.add_feature(atomic_sets_fm.features[i])
+        configurations.append(configuration)
+        for configuration in configurations:
+            assert configuration.get_bitmask() == bitmask
+            assert hash(configuration) == hash(expected)
+            assert configuration.__hash__() == fm.get_zobrist_hash(indexes)
+        assert all(configuration == expected for configuration in configurations[:-1])
@@ -0,0 +1,72 @@
+import ast
+import csv
+import os
+import random
+import sys
+
+import pytest
+
+# setting path
+sys.path.append('.')
+
+from montecarlo_framework.models.feature_model import FM, FMConfiguration, StreamingFeatureIDEReader
+from montecarlo_framework.problems.configuration_based_analyses import jhipster_utils
+from montecarlo_framework.problems.configuration_based_analyses.jhipster_utils import JHipsterIndex
+
+
+pytestmark = pytest.mark.skipif(not (os.path.exists(jhipster_utils.JHIPSTER_CONFIGS_FILE) and os.path.exists(jhipster_utils.JHIPSTER_CONFIGS_FAILURES_FILE)),
+                                reason='The .csv files of the jHipster test results are not available.')
+
+SEED = 2022
+NOF_CONFIGURATIONS = 1000  # checked with `filter_configuration` (that goes through all the test results for each configuration)
+
+
+def get_model() -> FM:
+    feature_model, sat_model = StreamingFeatureIDEReader(jhipster_utils.FM_FILE).transform()
+    return FM(feature_model, sat_model=sat_model, backends=(FM.SAT,))
+
+
+def read_failures() -> list[tuple[list[str], bool]]:
+    """Selected features and failure of each configuration of the configurations failures .csv file."""
+    with open(jhipster_utils.JHIPSTER_CONFIGS_FAILURES_FILE) as csvfile:
+        reader = csv.DictReader(csvfile, delimiter=',', quotechar='"', skipinitialspace=True)
+        return [(ast.literal_eval(row['Config']), ast.literal_eval(row['Failure'])) for row in reader]
+
+
+def test_is_failure():
+    """The failure of each configuration is that of its row of the configurations failures .csv file."""
+    fm = get_model()
+    index = JHipsterIndex.build(fm)
+    failures = read_failures()
+    assert len(index) == len(failures)
+    for names, failure in failures:
+        bitmask = fm.index.get_bitmask(names)
+        assert bitmask in index
+        assert index.is_failure(bitmask) == failure
+    assert not index.is_failure(0) and 0 not in index
+
+
+def test_contains_failures():
+    """The status of the configurations in the test results is that found by `filter_configuration` and `contains_failures`."""
+    random.seed(SEED)
+    fm = get_model()
+    index = JHipsterIndex.build(fm)
+    jhipster_configurations = jhipster_utils.read_jHipster_configurations()
+    for bitmask in random.sample(index.bitmasks, min(NOF_CONFIGURATIONS, len(index))):
+        try:
+            jhipster_configuration = jhipster_utils.filter_configuration(FMConfiguration.from_bitmask(fm, bitmask), jhipster_configurations)
+        except Exception:
+            jhipster_configuration = None  # several configurations in the test results
+        tested = bool(index.get_flags(bitmask) & JHipsterIndex.TESTED)
+        assert tested == (jhipster_configuration is not None)
+        assert index.contains_failures(bitmask) == (tested and jhipster_utils.contains_failures(jhipster_configuration))
+
+
+def test_load(tmp_path):
+    """The index is stored on the first load and the next loads read the same index."""
+    fm = get_model()
+    index = JHipsterIndex.load(fm, str(tmp_path))
+    assert os.listdir(str(tmp_path)) == [f'jhipster-{JHipsterIndex.get_key(fm)}.npz']
+    loaded_index = JHipsterIndex.load(fm, str(tmp_path))
+    assert loaded_index.bitmasks == index.bitmasks
+    assert [loaded_index.get_flags(b) for b in loaded_index.bitmasks] == [index.get_flags(b) for b in index.bitmasks]
@@ -0,0 +1,98 @@
+import random
+import sys
+
+import pytest
+
+# setting path
+sys.path.append('.')
+
+from montecarlo_framework.algorithms import AlgorithmFactory, UCTMCTS, root_parallel_uct_mcts
+from montecarlo_framework.algorithms.selection_criterias import MaxChild
+from montecarlo_framework.algorithms.stopping_conditions import IterationsStoppingCondition, NoneStoppingCondition
+from montecarlo_framework.models.feature_model import FM, FMConfiguration, StreamingFeatureIDEReader
+from montecarlo_framework.problems.configuration_based_analyses import CompletionPartialConfigProblem, ValidConfigurationState
+
+
+MODELS = ['pizzas', 'GPL', 'wget']
+INPUT_MODELS_FOLDER = 'models/'
+EXTENSION = '.xml'
+SEED = 2022
+NOF_SIMULATIONS = 50  # per worker and decision
+WORKERS = [1, 4]
+
+
+def get_problem(model_name: str, root_selected: bool = False) -> CompletionPartialConfigProblem:
+    """Problem of completing the empty configuration (or the configuration with the root feature selected)."""
+    feature_model, sat_model = StreamingFeatureIDEReader(INPUT_MODELS_FOLDER + model_name + EXTENSION).transform()
+    fm = FM(feature_model, sat_model=sat_model, backends=(FM.SAT,))
+    bitmask = fm.index.get_bitmask([feature_model.root.name]) if root_selected else 0
+    return CompletionPartialConfigProblem(ValidConfigurationState(FMConfiguration.from_bitmask(fm, bitmask)))
+
+
+@pytest.mark.parametrize("model_name", MODELS)
+@pytest.mark.parametrize("nof_workers", WORKERS)
+@pytest.mark.parametrize("virtual_loss", [1, 3])
+def test_tree_parallel_statistics(model_name: str, nof_workers: int, virtual_loss: int):
+    """After a decision, the visits of the root are the simulations of all the workers (the virtual losses
+    have been replaced by the real visits), and the visits and rewards of each node are those of its children
+    plus those of the simulations run from the node itself (rewards in [-1, 1])."""
+    random.seed(SEED)
+    algorithm = AlgorithmFactory.tree_parallel_uct_mcts_maxchild(stopping_condition=IterationsStoppingCondition(iterations=1),
+                                                                  mc_stopping_condition=IterationsStoppingCondition(iterations=NOF_SIMULATIONS),
+                                                                  exploration_weight=0.5,
+                                                                  nof_workers=nof_workers,
+                                                                  virtual_loss=virtual_loss)
+    solution = algorithm.run(get_problem(model_name))
+    tree = algorithm.tree
+    assert len(solution.get_solution_path()) == 2
+    assert algorithm.get_total_nof_simulations() == nof_workers * NOF_SIMULATIONS
+    assert tree.visits[0] == algorithm.get_total_nof_simulations()
+    assert algorithm.get_tree_size() == len(tree) > 0
+    for node_id in range(tree.size()):
+        children = list(tree.children(node_id)) if tree.nof_children[node_id] > 0 else []
+        own_visits = tree.visits[node_id] - sum(tree.visits[c] for c in children)
+        own_rewards = tree.rewards[node_id] - sum(tree.rewards[c] for c in children)
+        assert own_visits >= 0
+        assert abs(own_rewards) <= own_visits
+
+
+@pytest.mark.parametrize("model_name", MODELS)
+def test_tree_size(model_name: str):
+    """The tree size of the root and tree parallelizations is the number of nodes expanded in their search trees,
+    so both are comparable (the decisions made are not the tree of root parallelization)."""
+    random.seed(SEED)
+    mc_stopping_condition = IterationsStoppingCondition(iterations=NOF_SIMULATIONS)
+    for algorithm in [AlgorithmFactory.root_parallel_uct_mcts_maxchild(NoneStoppingCondition(), mc_stopping_condition, 0.5, nof_workers=2),
+                      AlgorithmFactory.tree_parallel_uct_mcts_maxchild(NoneStoppingCondition(), mc_stopping_condition, 0.5, nof_workers=2)]:
+        solution = algorithm.run(get_problem(model_name))
+        nof_decisions = len(solution.get_solution_path()) - 1
+        assert nof_decisions < algorithm.get_tree_size() <= algorithm.get_total_nof_simulations()
+
+
+@pytest.mark.parametrize("model_name", MODELS)
+@pytest.mark.parametrize("nof_workers", WORKERS)
+def test_root_parallel_merge(model_name: str, nof_workers: int):
+    """The statistics of the root and its children after a root-parallel decision are the sum of the statistics of the
+    independent searches of the workers (run again here with the same seeds), each one with the whole budget."""
+    random.seed(SEED)
+    algorithm = AlgorithmFactory.root_parallel_uct_mcts_maxchild(stopping_condition=IterationsStoppingCondition(iterations=1),
+                                                                  mc_stopping_condition=IterationsStoppingCondition(iterations=NOF_SIMULATIONS),
+                                                                  exploration_weight=0.5,
+                                                                  nof_workers=nof_workers)
+    problem = get_problem(model_name, root_selected=True)  # the first decision of the empty configuration has one choice
+    solution = algorithm.run(problem)
+    root = solution.terminal_node.parent
+    children = algorithm.tree[root]
+    assert len(children) > 1
+
+    random.seed(SEED)
+    seeds = [random.randrange(2**32) for _ in range(nof_workers)]
+    worker = UCTMCTS(NoneStoppingCondition(), MaxChild(), IterationsStoppingCondition(iterations=NOF_SIMULATIONS), 0.5)
+    root_parallel_uct_mcts._initialize_worker(problem, worker)
+    results = [root_parallel_uct_mcts._search((), seed) for seed in seeds]
+    assert algorithm.get_total_nof_simulations() == sum(r[1] for r in results) == nof_workers * NOF_SIMULATIONS
+    for i, child in enumerate(children):
+        assert algorithm.Q[child] == sum(r[0][i][0] for r in results)
+        assert algorithm.N[child] == sum(r[0][i][1] for r in results)
+    assert algorithm.Q[root] == sum(r[0][i][0] for r in results for i in range(len(children)))
+    assert algorithm.N[root] == sum(r[0][i][1] for r in results for i in range(len(children)))
@@ -0,0 +1,78 @@
+import random
+import sys
+
+import pytest
+
+# setting path
+sys.path.append('.')
+
+from models.models_info import MODELS as MODELS_INFO, NAME, NOF_PRODUCTS, PRODUCT_DISTRIBUTION
+from montecarlo_framework.models.feature_model import FM, ProductEnumerator, StreamingFeatureIDEReader
+
+
+MODELS = ['pizzas', 'GPL', 'wget']  # models with a known number of products that can be enumerated quickly
+INPUT_MODELS_FOLDER = 'models/'
+EXTENSION = '.xml'
+SEED = 2022
+NOF_PROJECTIONS = 10
+CHUNK_SIZES = [1, 7, 1000]
+
+
+def get_model(model_name: str) -> FM:
+    feature_model, sat_model = StreamingFeatureIDEReader(INPUT_MODELS_FOLDER + model_name + EXTENSION).transform()
+    return FM(feature_model, sat_model=sat_model, backends=(FM.SAT,))
+
+
+def get_model_info(model_name: str) -> dict:
+    return next(info for info in MODELS_INFO if info[NAME] == model_name)
+
+
+@pytest.mark.parametrize("model_name", MODELS)
+def test_nof_products(model_name: str):
+    """All the products are enumerated once, and all of them are valid."""
+    fm = get_model(model_name)
+    info = get_model_info(model_name)
+    bitmasks = list(ProductEnumerator(fm).bitmasks())
+    assert len(bitmasks) == len(set(bitmasks)) == info[NOF_PRODUCTS]
+    assert all(fm.get_cnf_evaluator().evaluate_batch(bitmasks))
+    if info.get(PRODUCT_DISTRIBUTION) is not None:
+        distribution = [0] * (len(fm.features) + 1)
+        for bitmask in bitmasks:
+            distribution[bin(bitmask).count('1')] += 1
+        assert distribution == info[PRODUCT_DISTRIBUTION]
+    assert len(list(ProductEnumerator(fm).bitmasks(limit=10))) == min(10, info[NOF_PRODUCTS])
+
+
+@pytest.mark.parametrize("model_name", MODELS)
+def test_projected_products(model_name: str):
+    """The products projected onto a subset of the features are the distinct projections of the products."""
+    random.seed(SEED)
+    fm = get_model(model_name)
+    bitmasks = list(ProductEnumerator(fm).bitmasks())
+    for _ in range(NOF_PROJECTIONS):
+        projection = random.sample(fm.features, random.randint(1, len(fm.features)))
+        projection_mask = fm.index.get_bitmask([feature.name for feature in projection])
+        projected_bitmasks = list(ProductEnumerator(fm, projection).bitmasks())
+        assert len(projected_bitmasks) == len(set(projected_bitmasks))
+        assert set(projected_bitmasks) == {bitmask & projection_mask for bitmask in bitmasks}
+
+
+@pytest.mark.parametrize("model_name", MODELS)
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_write_read(model_name: str, chunk_size: int, tmp_path):
+    """The products written to a file are read back, also when they are projected or limited.
+    The order of the products depends on the state of the solver, so it may change between enumerations."""
+    random.seed(SEED)
+    fm = get_model(model_name)
+    projection = random.sample(fm.features, len(fm.features) // 2)
+    for enumerator, limit in [(ProductEnumerator(fm), None), (ProductEnumerator(fm), 20), (ProductEnumerator(fm, projection), None)]:
+        filepath = str(tmp_path / 'products.csv')
+        nof_products = enumerator.write(filepath, chunk_size=chunk_size, limit=limit)
+        products = list(ProductEnumerator.read(fm, filepath))
+        bitmasks = list(enumerator.bitmasks())
+        assert nof_products == len(products) == len(set(products))
+        if limit is None:
+            assert sorted(products) == sorted(bitmasks)
+        else:
+            assert nof_products == min(limit, len(bitmasks))
+            assert set(products) <= set(bitmasks)
@@ -0,0 +1,96 @@
+import random
+import sys
+
+import pytest
+from pysat.solvers import Glucose3
+
+# setting path
+sys.path.append('.')
+
+from montecarlo_framework.models.feature_model import FM, FMConfiguration, RolloutSession, StreamingFeatureIDEReader
+
+
+MODELS = ['pizzas', 'GPL', 'wget', 'tankwar', 'mobilemedia2', 'jHipster', 'aafms_framework', 'WeaFQAs', 'busybox-1.18.0']
+INPUT_MODELS_FOLDER = 'models/'
+EXTENSION = '.xml'
+SEED = 2022
+NOF_STEPS = 300
+NOF_TRIED_FEATURES = 10
+
+
+def get_model(model_name: str) -> FM:
+    feature_model, sat_model = StreamingFeatureIDEReader(INPUT_MODELS_FOLDER + model_name + EXTENSION).transform()
+    return FM(feature_model, sat_model=sat_model, backends=(FM.SAT,))
+
+
+def get_random_bitmask(fm: FM, bitmask: int) -> int:
+    """The next partial configuration of a random sequence: an extension of the given one (as in a rollout),
+    a prefix of it (backtracking), the given one with some features replaced (it is not an extension of the trail),
+    or a configuration unrelated to it. Most of them are valid because the features come from random completions."""
+    step = random.choice(['extend', 'backtrack', 'replace', 'jump'])
+    selected = fm.get_indexes(bitmask)
+    if step == 'backtrack' or (step == 'replace' and selected):
+        bitmask = fm.index.get_bitmask([fm.index.names[i] for i in random.sample(selected, random.randint(0, len(selected)))])
+        if step == 'backtrack':
+            return bitmask
+    completion = fm.get_random_completion(FMConfiguration.from_bitmask(fm, bitmask))
+    if completion is None or step == 'jump':
+        completion = fm.get_random_completion(FMConfiguration(fm))
+        bitmask = 0
+    others = fm.get_indexes(completion.get_bitmask() & ~bitmask)
+    bitmask |= fm.index.get_bitmask([fm.index.names[i] for i in random.sample(others, random.randint(0, len(others)))])
+    if random.random() < 0.1:  # not valid
+        bitmask |= random.getrandbits(len(fm.features))
+    return bitmask
+
+
+@pytest.mark.parametrize("model_name", MODELS)
+def test_rollout_session(model_name: str):
+    """After any sequence of pushes and pops, the answers of the session are those of a new solver for its trail."""
+    random.seed(SEED)
+    fm = get_model(model_name)
+    variables = list(fm.variables)
+    with Glucose3(bootstrap_with=fm.sat_model.get_all_clauses()) as solver:
+        session = RolloutSession(fm.solver, random.sample(variables, 2))
+        for _ in range(NOF_STEPS):
+            if session and random.random() < 0.4:
+                session.pop()
+            else:
+                literal = random.choice(variables)
+                session.push(literal if random.random() < 0.8 else -literal)
+            trail = session.get_trail()
+            satisfiable = solver.solve(assumptions=trail)
+            assert session.is_satisfiable() == satisfiable
+            model = session.get_model()
+            assert (model is not None) == satisfiable
+            if model is not None:
+                assert all(model[abs(l) - 1] == l for l in trail)
+            literals = [v if random.getrandbits(1) else -v for v in random.sample(variables, NOF_TRIED_FEATURES)]
+            expected = [solver.solve(assumptions=trail + [l]) for l in literals]
+            assert session.try_literals(literals) == expected
+            assert [session.try_literal(l) for l in literals] == expected
+            assert len(session) == len(trail) and session.get_trail() == trail
+
+
+@pytest.mark.parametrize("model_name", MODELS)
+def test_fm_rollout_session(model_name: str):
+    """During a rollout session of the FM, the trail follows the partial configurations checked (also when they are not
+    extensions of the trail) and the FM answers as a new solver with the selected features as assumptions."""
+    random.seed(SEED)
+    fm = get_model(model_name)
+    bitmask = fm.get_random_completion(FMConfiguration(fm)).get_bitmask() & random.getrandbits(len(fm.features))
+    session = fm.start_rollout_session(FMConfiguration.from_bitmask(fm, bitmask))
+    with Glucose3(bootstrap_with=fm.sat_model.get_all_clauses()) as solver:
+        for _ in range(NOF_STEPS):
+            bitmask = get_random_bitmask(fm, bitmask)
+            configuration = FMConfiguration.from_bitmask(fm, bitmask)
+            assumptions = configuration.get_selected_variables()
+            satisfiable = solver.solve(assumptions=assumptions)
+            assert fm.is_valid_partial_configuration(configuration) == satisfiable
+            assert sorted(session.get_trail()) == sorted(assumptions)
+            candidates = fm.get_indexes(fm.full_bitmask & ~bitmask)
+            candidates = random.sample(candidates, min(NOF_TRIED_FEATURES, len(candidates)))
+            expected = [i for i in candidates if solver.solve(assumptions=assumptions + [fm.variables[i]])]
+            assert fm.get_valid_indexes(configuration, candidates) == expected
+            assert [i for i in candidates if fm.is_valid_partial_configuration_with_feature(configuration, fm.features[i])] == expected
+    fm.end_rollout_session()
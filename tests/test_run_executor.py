@@ -0,0 +1,57 @@
+import random
+import sys
+
+import pytest
+
+# setting path
+sys.path.append('.')
+
+from montecarlo_framework.algorithms import AlgorithmFactory
+from montecarlo_framework.algorithms.stopping_conditions import IterationsStoppingCondition, NoneStoppingCondition
+from montecarlo_framework.models.feature_model import FM, FMConfiguration, StreamingFeatureIDEReader
+from montecarlo_framework.problems.configuration_based_analyses import CompletionPartialConfigProblem, ValidConfigurationState
+from montecarlo_framework.utils import run_executor
+from montecarlo_framework.utils.algorithm_stats import AlgorithmStats
+
+
+MODELS = ['pizzas', 'GPL', 'wget']
+INPUT_MODELS_FOLDER = 'models/'
+EXTENSION = '.xml'
+SEED = 2022
+RUNS = 4
+NOF_SIMULATIONS = 20
+ALGORITHMS = {'FlatMonteCarlo': AlgorithmFactory.flat_montecarlo_maxchild,
+              'UCTMCTS': lambda stopping_condition, mc_stopping_condition: AlgorithmFactory.uct_mcts_maxchild(stopping_condition, mc_stopping_condition, exploration_weight=0.5)}
+MEASURES = [AlgorithmStats.RUN_STR, AlgorithmStats.ALGORITHM_STR, AlgorithmStats.STEPS_STR, AlgorithmStats.SIMULATIONS_STR,
+            AlgorithmStats.TOTAL_SIMULATIONS_STR, AlgorithmStats.EVALUATIONS_STR, AlgorithmStats.POSITIVE_EVALUATIONS_STR,
+            AlgorithmStats.TREESIZE_STR, AlgorithmStats.SOLUTION_STR]  # all except the time and memory
+
+
+def get_problem(model_name: str) -> CompletionPartialConfigProblem:
+    feature_model, sat_model = StreamingFeatureIDEReader(INPUT_MODELS_FOLDER + model_name + EXTENSION).transform()
+    fm = FM(feature_model, sat_model=sat_model, backends=(FM.SAT,))
+    return CompletionPartialConfigProblem(ValidConfigurationState(FMConfiguration(fm)))
+
+
+@pytest.mark.parametrize("model_name", MODELS)
+@pytest.mark.parametrize("algorithm_name", ALGORITHMS)
+def test_serial_and_parallel_runs(model_name: str, algorithm_name: str, tmp_path, monkeypatch):
+    """The runs executed serially and in a pool of workers with the same seed have the same solutions and stats rows,
+    stored in the given stats name (also when it is not that of the decorator of the algorithm)."""
+    algorithm = ALGORITHMS[algorithm_name](NoneStoppingCondition(), IterationsStoppingCondition(iterations=NOF_SIMULATIONS))
+    problem = get_problem(model_name)
+    # The heatmaps of UCTMCTS are written in the results folder
+    (tmp_path / 'results' / 'heatmaps').mkdir(parents=True)
+    monkeypatch.chdir(tmp_path)
+    results = []
+    for nof_workers, stats_name in [(1, algorithm_name), (3, algorithm_name), (1, 'serial_runs'), (3, 'parallel_runs')]:
+        random.seed(SEED)
+        solutions = run_executor.execute_runs(algorithm, problem, RUNS, stats_name, nof_workers)
+        stats = AlgorithmStats.get_stats(stats_name)
+        assert len(solutions) == len(stats) == RUNS
+        assert [s[AlgorithmStats.SOLUTION_STR] for s in stats] == [s.terminal_node.state for s in solutions]
+        results.append(([[(state.to_payload(), str(action)) for state, action in s.get_solution_path()] for s in solutions],
+                        [[str(s[m]) for m in MEASURES] for s in stats]))
+        AlgorithmStats.stats[stats_name.lower()].clear()
+    assert all(result == results[0] for result in results)
+    assert AlgorithmStats.last_run is None
@@ -0,0 +1,122 @@
+import math
+import random
+import sys
+
+import pytest
+
+# setting path
+sys.path.append('.')
+
+from montecarlo_framework.models import Node, Solution, SolutionRegistry
+from montecarlo_framework.models.feature_model import FM, FMConfiguration, StreamingFeatureIDEReader
+from montecarlo_framework.problems.configuration_based_analyses import (
+    CompletionPartialConfigProblem,
+    FindAllValidConfigurationState,
+    FindAllValidMinimumConfigurationState,
+    ValidMinConfigProblem
+)
+
+
+MODELS = ['pizzas', 'GPL', 'wget']  # small models, so the random walks find the same solutions several times
+INPUT_MODELS_FOLDER = 'models/'
+EXTENSION = '.xml'
+SEED = 2022
+NOF_SOLUTIONS = 100
+
+
+def get_model(model_name: str) -> FM:
+    feature_model, sat_model = StreamingFeatureIDEReader(INPUT_MODELS_FOLDER + model_name + EXTENSION).transform()
+    return FM(feature_model, sat_model=sat_model, backends=(FM.SAT,))
+
+
+def get_problem(model_name: str, minimum: bool = False) -> CompletionPartialConfigProblem:
+    fm = get_model(model_name)
+    if minimum:
+        initial_state = FindAllValidMinimumConfigurationState(FMConfiguration(fm))
+        problem = ValidMinConfigProblem(initial_state)
+    else:
+        initial_state = FindAllValidConfigurationState(FMConfiguration(fm))
+        problem = CompletionPartialConfigProblem(initial_state)
+    initial_state.set_problem(problem)
+    return problem
+
+
+def get_random_solution(problem: CompletionPartialConfigProblem) -> Solution:
+    """The path of a random walk from the initial state to a terminal state."""
+    node = Node(problem.get_initial_state())
+    while not node.state.is_terminal():
+        state, action = node.state.random_successor()
+        node = Node(state, node, action)
+    return Solution(node)
+
+
+def get_path(solution: Solution) -> list[tuple[int, str]]:
+    return [(state.configuration.get_bitmask(), None if action is None else action.feature.name)
+            for state, action in solution.get_solution_path()]
+
+
+@pytest.mark.parametrize("model_name", MODELS)
+@pytest.mark.parametrize("minimum", [False, True])
+@pytest.mark.parametrize("disk_backed", [False, True])
+def test_solution_registry(model_name: str, minimum: bool, disk_backed: bool, tmp_path):
+    """A state is a solution if and only if a solution with an equal terminal state has been registered,
+    and then its reward is -inf. Solutions with an already registered terminal state are not registered again,
+    and the registered solutions are iterated in the order they were registered."""
+    random.seed(SEED)
+    problem = get_problem(model_name, minimum)
+    if disk_backed:
+        problem.set_solutions_file(str(tmp_path / 'solutions'))
+    expected = {}
+    nof_duplicates = 0
+    for _ in range(NOF_SOLUTIONS):
+        solution = get_random_solution(problem)
+        state = solution.terminal_node.state
+        bitmask = state.configuration.get_bitmask()
+        assert problem.is_solution(state) == (bitmask in expected)
+        if bitmask in expected:
+            nof_duplicates += 1
+        else:
+            assert state.reward() != -math.inf
+            expected[bitmask] = get_path(solution)
+        problem.add_solution(solution)
+        assert problem.is_solution(state)
+        # Any state with the same configuration is a solution (not only the registered terminal state)
+        other_state = problem.get_initial_state().from_payload(bitmask)
+        assert other_state is not state and problem.is_solution(other_state)
+        assert state.reward() == other_state.reward() == -math.inf
+        assert problem.nof_solutions() == len(expected)
+    assert nof_duplicates > 0
+    assert not problem.is_solution(problem.get_initial_state())
+    assert [get_path(solution) for solution in problem.iter_solutions()] == list(expected.values())
+    assert [get_path(solution) for solution in problem.get_solutions()] == list(expected.values())
+
+
+@pytest.mark.parametrize("model_name", MODELS)
+def test_reopen(model_name: str, tmp_path):
+    """A disk-backed registry reopened on the same file keeps the solutions registered before it was closed,
+    and a registry that is not reopened starts empty."""
+    random.seed(SEED)
+    filepath = str(tmp_path / 'solutions')
+    problem = get_problem(model_name)
+    problem.set_solutions_file(filepath)
+    solutions = [get_random_solution(problem) for _ in range(NOF_SOLUTIONS)]
+    for solution in solutions[:NOF_SOLUTIONS // 2]:
+        problem.add_solution(solution)
+    expected = {path[-1][0]: path for path in map(get_path, problem.iter_solutions())}
+    problem.set_solutions_file(str(tmp_path / 'other_solutions'))  # closes the registry of the file
+
+    problem = get_problem(model_name)
+    problem.set_solutions_file(filepath, reopen=True)
+    assert problem.nof_solutions() == len(expected)
+    assert [get_path(solution) for solution in problem.iter_solutions()] == list(expected.values())
+    assert all(problem.is_solution(solution.terminal_node.state) for solution in solutions[:NOF_SOLUTIONS // 2])
+    for solution in solutions[NOF_SOLUTIONS // 2:]:
+        problem.add_solution(solution)
+        expected.setdefault(solution.terminal_node.state.configuration.get_bitmask(), get_path(solution))
+    assert problem.nof_solutions() == len(expected)
+    assert [get_path(solution) for solution in problem.iter_solutions()] == list(expected.values())
+
+    registry = SolutionRegistry(filepath)
+    assert len(registry) == 0 and not list(registry)
+    assert not any(solution.terminal_node.state in registry for solution in solutions)
+    registry.close()